@@ -0,0 +1,89 @@
+import csv
+import json
+import os
+import sys
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, Optional, Tuple
+
+FORMATS = ("jsonl", "csv", "json")
+FIELDS = ("name", "site", "category")
+EXTENSIONS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".json": "json"}
+
+Account = Tuple[str, str, str]
+
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXTENSIONS:
+        raise ValueError(
+            f"Cannot tell the format of '{path}'. Use one of {', '.join(FORMATS)}."
+        )
+    return EXTENSIONS[extension]
+
+
+def _account(record: dict, where: str, site: Optional[str]) -> Account:
+    name = (record.get("name") or "").strip().lstrip("@")
+    row_site = (record.get("site") or site or "").strip().lower()
+    category = (record.get("category") or "").strip().lower()
+    if not name or not row_site or not category:
+        raise ValueError(f"{where}: an account needs a name, site and category")
+    return name, row_site, category
+
+
+def _parse(f: IO[str], fmt: str, site: Optional[str]) -> Iterator[Account]:
+    if fmt == "jsonl":
+        for number, line in enumerate(f, start=1):
+            if line.strip():
+                yield _account(json.loads(line), f"line {number}", site)
+    elif fmt == "csv":
+        for number, record in enumerate(csv.DictReader(f), start=2):
+            yield _account(record, f"line {number}", site)
+    else:
+        # The original {"accounts": [...]} layout; it has to be read whole
+        for number, record in enumerate(json.load(f).get("accounts", []), start=1):
+            yield _account(record, f"account {number}", site)
+
+
+@contextmanager
+def _open(path: str, mode: str) -> Iterator[IO[str]]:
+    if path == "-":
+        yield sys.stdin if "r" in mode else sys.stdout
+        return
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        yield f
+
+
+@contextmanager
+def read_catalog(
+    path: str, fmt: Optional[str] = None, site: Optional[str] = None
+) -> Iterator[Iterator[Account]]:
+    # Yields a lazy iterator of (name, site, category); JSON Lines and CSV are
+    # parsed a line at a time. `site` fills in rows that do not name one.
+    fmt = fmt or ("jsonl" if path == "-" else detect_format(path))
+    with _open(path, "r") as f:
+        yield _parse(f, fmt, site)
+
+
+def write_catalog(path: str, rows: Iterable[Account], fmt: Optional[str] = None) -> int:
+    fmt = fmt or ("jsonl" if path == "-" else detect_format(path))
+    count = 0
+    with _open(path, "w") as f:
+        if fmt == "jsonl":
+            for row in rows:
+                f.write(json.dumps(dict(zip(FIELDS, row))))
+                f.write("\n")
+                count += 1
+        elif fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            f.write('{"accounts": [')
+            for row in rows:
+                f.write(",\n  " if count else "\n  ")
+                f.write(json.dumps(dict(zip(FIELDS, row))))
+                count += 1
+            f.write("\n]}\n")
+    return count
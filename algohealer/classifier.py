@@ -0,0 +1,159 @@
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from algohealer.db.enums import Category
+
+KEYWORDS_PATH = os.path.join(os.path.dirname(__file__), "category_keywords.json")
+
+TOKEN = re.compile(r"#?[a-z0-9]+")
+# Hashtag compounds ("#travelgram") are matched on keyword prefixes this long
+MIN_PREFIX = 3
+
+
+def load_keywords(path: str = KEYWORDS_PATH) -> Dict[Category, List[str]]:
+    with open(path, encoding="utf-8") as f:
+        return {Category(name): words for name, words in json.load(f).items()}
+
+
+class FeedPost(NamedTuple):
+    post_id: Optional[str]
+    url: str
+    caption: str
+    alt_text: str
+
+    @property
+    def text(self) -> str:
+        return f"{self.caption} {self.alt_text}"
+
+
+class Classification(NamedTuple):
+    post: FeedPost
+    category: Optional[Category]
+    score: float
+    engage: bool
+
+
+class ContentClassifier:
+    # A bag-of-words TF-IDF model over hand-picked category keywords. Keyword
+    # IDF is taken across categories, so terms shared by several categories
+    # count for less. Scoring a batch of posts is a single matrix product.
+    def __init__(
+        self,
+        keywords: Optional[Dict[Category, Sequence[str]]] = None,
+        threshold: float = 0.2,
+    ):
+        keywords = keywords or load_keywords()
+        self.categories = list(keywords)
+        self.threshold = threshold
+        vocabulary = sorted({word for words in keywords.values() for word in words})
+        self._index = {word: i for i, word in enumerate(vocabulary)}
+        self._prefixes = sorted(
+            (word for word in vocabulary if len(word) >= MIN_PREFIX),
+            key=len,
+            reverse=True,
+        )
+
+        matrix = np.zeros((len(self.categories), len(vocabulary)), dtype=np.float32)
+        for row, category in enumerate(self.categories):
+            for word in keywords[category]:
+                matrix[row, self._index[word]] = 1.0
+        document_frequency = matrix.sum(axis=0)
+        self._idf = (
+            np.log((1 + len(self.categories)) / (1 + document_frequency)) + 1
+        ).astype(np.float32)
+        matrix *= self._idf
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._category_matrix = matrix.T
+        self._token_indices = lru_cache(maxsize=65536)(self._lookup)
+
+    def _lookup(self, token: str) -> tuple:
+        hashtag = token.startswith("#")
+        token = token.lstrip("#")
+        if token in self._index:
+            return (self._index[token],)
+        if not hashtag:
+            return ()
+        # Split hashtag compounds such as #foodporn or #travelgram on known prefixes
+        for word in self._prefixes:
+            if token.startswith(word):
+                rest = token[len(word) :]
+                return (self._index[word],) + (
+                    self._token_indices(f"#{rest}") if rest else ()
+                )
+        return ()
+
+    def vectorize(self, texts: Iterable[str]) -> np.ndarray:
+        rows, columns = [], []
+        count = 0
+        for row, text in enumerate(texts):
+            count += 1
+            for token in TOKEN.findall(text.lower()):
+                for column in self._token_indices(token):
+                    rows.append(row)
+                    columns.append(column)
+        counts = np.zeros((count, len(self._index)), dtype=np.float32)
+        np.add.at(counts, (rows, columns), 1.0)
+        return counts
+
+    def score(self, texts: Iterable[str]) -> np.ndarray:
+        counts = self.vectorize(texts)
+        weights = np.log1p(counts, out=counts) * self._idf
+        norms = np.linalg.norm(weights, axis=1, keepdims=True)
+        np.divide(weights, norms, out=weights, where=norms > 0)
+        return weights @ self._category_matrix
+
+    def classify(
+        self, posts: Sequence[FeedPost], interests: Iterable[Category]
+    ) -> List[Classification]:
+        if not posts:
+            return []
+        interests = {Category(interest) for interest in interests}
+        scores = self.score(post.text for post in posts)
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(posts)), best]
+        results = []
+        for post, index, score in zip(posts, best.tolist(), best_scores.tolist()):
+            category = self.categories[index] if score >= self.threshold else None
+            results.append(
+                Classification(
+                    post=post,
+                    category=category,
+                    score=score,
+                    engage=category in interests,
+                )
+            )
+        return results
+
+
+class FeedHealth(NamedTuple):
+    surface: str
+    posts: int
+    aligned: int
+    categories: Dict[str, int]
+
+    @property
+    def health(self) -> float:
+        return self.aligned / self.posts if self.posts else 0.0
+
+
+def feed_health(surface: str, classifications: List[Classification]) -> FeedHealth:
+    categories: Dict[str, int] = {}
+    for result in classifications:
+        key = result.category.value if result.category else "other"
+        categories[key] = categories.get(key, 0) + 1
+    return FeedHealth(
+        surface=surface,
+        posts=len(classifications),
+        aligned=sum(result.engage for result in classifications),
+        categories=categories,
+    )
+
+
+@lru_cache(maxsize=1)
+def default_classifier() -> ContentClassifier:
+    return ContentClassifier()
@@ -1,21 +1,406 @@
 import click
 
-from algohealer.db.conn import SQLiteManager
-from algohealer.manager import DataManager
+# Only lightweight modules are imported here; the database, browser and menu
+# stacks are imported inside the commands that need them.
+from algohealer.navigators.registry import NAVIGATORS
 
 
-@click.command()
+def check_site(site: str) -> bool:
+    if site not in NAVIGATORS:
+        click.secho(
+            f"{site} not yet supported. Please choose from the following: {', '.join(NAVIGATORS)}.",
+            fg="red",
+        )
+        return False
+    return True
+
+
+class SiteGroup(click.Group):
+    # `algohealer <site> ...` predates the subcommands, so anything that is not a
+    # known command is handed to the site command as its SITE argument.
+    def resolve_command(self, ctx, args):
+        if args and args[0] not in self.commands:
+            return "site", self.commands["site"], args
+        return super().resolve_command(ctx, args)
+
+
+@click.group(cls=SiteGroup)
+def cli() -> None:
+    """Heal social media algorithms. Run `algohealer <site>` for the menu."""
+
+
+@cli.command("site", hidden=True)
 @click.argument("site", required=True, type=str)
-def cli(site: str) -> None:
-    db_conn = SQLiteManager()
+@click.argument("action", required=False, type=click.Choice(["heal"]))
+@click.option(
+    "--profiles",
+    "-p",
+    multiple=True,
+    help="Browser profile directories to heal (repeat or comma-separate).",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    default=None,
+    help="Number of profiles healed in parallel (defaults to CPU count).",
+)
+def site_command(site: str, action: str, profiles: tuple, workers: int) -> None:
+    if not check_site(site):
+        return
 
+    from algohealer.db.cache import CachedSQLiteManager
+    from algohealer.manager import DataManager
+
+    db_conn = CachedSQLiteManager()
     manager = DataManager(site=site, db_conn=db_conn)
-    if not manager.check_site():
+
+    if action == "heal":
+        profiles = [p for value in profiles for p in value.split(",") if p]
+        ok = manager.heal_profiles(profiles, workers=workers)
+        db_conn.close()
+        if not ok:
+            raise SystemExit(1)
         return
 
     manager.interact()
     db_conn.close()
 
 
+@cli.command()
+@click.option(
+    "--site",
+    "-s",
+    "sites",
+    multiple=True,
+    help="Site to schedule (repeatable). Jobs persist across restarts.",
+)
+@click.option(
+    "--profile",
+    "-p",
+    "profiles",
+    multiple=True,
+    help="Browser profile directory to heal (repeatable, defaults to settings).",
+)
+@click.option(
+    "--every",
+    default="6h",
+    show_default=True,
+    help="Interval between rounds, e.g. 30m, 6h, 1d, @daily.",
+)
+@click.option(
+    "--poll", default=5.0, show_default=True, help="Seconds between queue checks."
+)
+def daemon(sites: tuple, profiles: tuple, every: str, poll: float) -> None:
+    """Run healing rounds continuously without the interactive menu."""
+    if not all(check_site(site) for site in sites):
+        raise SystemExit(1)
+
+    from algohealer.daemon import HealingDaemon
+    from algohealer.db.cache import CachedSQLiteManager
+    from algohealer.intervals import parse_interval
+
+    try:
+        interval = parse_interval(every)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--every")
+
+    db_conn = CachedSQLiteManager()
+    for site in sites:
+        for profile in profiles or [""]:
+            db_conn.upsert_job(site, profile, interval)
+
+    if not db_conn.check_settings_exist():
+        click.echo("No settings found. Run 'algohealer <site>' once to set them up.")
+        raise SystemExit(1)
+    if not db_conn.get_jobs():
+        click.echo("No jobs scheduled. Add one with --site.")
+        raise SystemExit(1)
+
+    healing_daemon = HealingDaemon(db_conn, poll_interval=poll)
+    healing_daemon.install_signal_handlers()
+    healing_daemon.run()
+    db_conn.close()
+
+
+@cli.command("all")
+@click.option(
+    "--site",
+    "-s",
+    "sites",
+    multiple=True,
+    help="Site to heal (repeatable, defaults to every site with accounts).",
+)
+@click.option(
+    "--profile",
+    "-p",
+    default=None,
+    help="Browser profile directory (defaults to settings).",
+)
+def heal_all(sites: tuple, profile: str) -> None:
+    """Heal several sites at once in one shared browser."""
+    if not all(check_site(site) for site in sites):
+        raise SystemExit(1)
+
+    from playwright._impl._errors import TargetClosedError
+    from rich.console import Console
+    from rich.live import Live
+    from rich.table import Table
+
+    from algohealer.db.cache import CachedSQLiteManager
+    from algohealer.healer import ASYNC_NAVIGATORS, heal_sites
+    from algohealer.progress import ProgressView, SessionMetrics
+
+    console = Console()
+    db_conn = CachedSQLiteManager()
+    if not db_conn.check_settings_exist():
+        click.echo("No settings found. Run 'algohealer <site>' once to set them up.")
+        raise SystemExit(1)
+    settings = db_conn.get_settings()
+    if profile:
+        settings = settings.model_copy(update={"user_data_dir": profile})
+
+    candidates = sites or list(ASYNC_NAVIGATORS)
+    unsupported = [site for site in candidates if site not in ASYNC_NAVIGATORS]
+    if unsupported:
+        click.secho(
+            f"{', '.join(unsupported)} cannot share a browser yet and will be skipped.",
+            fg="yellow",
+        )
+    sites = [
+        site
+        for site in candidates
+        if site in ASYNC_NAVIGATORS and db_conn.get_all_accounts_for_site(site)
+    ]
+    if not sites:
+        click.echo("No accounts found for any site. Please add an account first.")
+        raise SystemExit(1)
+
+    console.print(f"[blue]Healing {', '.join(sites)} in one browser...[/blue]")
+    metrics = SessionMetrics()
+    try:
+        with Live(ProgressView(metrics), console=console, refresh_per_second=4):
+            results = heal_sites(sites, settings, db_conn, metrics=metrics)
+    except TargetClosedError:
+        console.print("[red]Please close all browser windows and try again.[/red]")
+        raise SystemExit(1)
+    finally:
+        db_conn.close()
+
+    table = Table()
+    table.add_column("Site", justify="left", style="cyan")
+    table.add_column("Status", justify="left")
+    table.add_column("Duration", justify="right")
+    table.add_column("Blocked", justify="right")
+    table.add_column("Saved (est.)", justify="right")
+    table.add_column("Error", justify="left", style="red")
+    for result in results:
+        color = "green" if result.status == "healed" else "red"
+        table.add_row(
+            result.site,
+            f"[{color}]{result.status}[/{color}]",
+            f"{result.seconds:.1f}s",
+            str(result.requests_blocked + result.requests_stubbed),
+            f"{result.estimated_bytes_saved / 1_000_000:.1f} MB",
+            result.error or "",
+        )
+    console.print(table)
+    peak = max(result.peak_rss_mb for result in results)
+    if peak:
+        console.print(f"[cyan]Peak browser memory {peak:.0f} MB.[/cyan]")
+    if not all(result.status == "healed" for result in results):
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.argument("site", required=True, type=str)
+@click.option(
+    "--since",
+    default=None,
+    help="Only include actions from this far back, e.g. 6h, 7d (default: all).",
+)
+@click.option(
+    "--bucket",
+    default="1h",
+    show_default=True,
+    help="Width of the throughput buckets, e.g. 15m, 1h, 1d.",
+)
+@click.option(
+    "--top", default=20, show_default=True, help="Number of accounts to list."
+)
+def report(site: str, since: str, bucket: str, top: int) -> None:
+    """Show success rates and throughput of recorded actions."""
+    import time
+
+    from rich.console import Console
+
+    from algohealer.db.conn import SQLiteManager
+    from algohealer.intervals import parse_interval
+    from algohealer.report import print_action_report
+
+    try:
+        since_at = time.time() - parse_interval(since) if since else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--since")
+    try:
+        bucket_seconds = parse_interval(bucket)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--bucket")
+
+    db_conn = SQLiteManager()
+    print_action_report(
+        Console(), db_conn, site, since=since_at, bucket_seconds=bucket_seconds, top=top
+    )
+    db_conn.close()
+
+
+@cli.command()
+@click.argument("site", required=True, type=str)
+@click.argument("har", type=click.Path(dir_okay=False))
+@click.option("--profile", "-p", default=None, help="Browser profile directory.")
+@click.option("--search", default=None, help="Also record a search for this query.")
+@click.option(
+    "--comment",
+    default=None,
+    help="Also record posting this comment on the first account's first post.",
+)
+def record(site: str, har: str, profile: str, search: str, comment: str) -> None:
+    """Heal SITE once and save its network traffic to HAR for replay."""
+    if not check_site(site):
+        raise SystemExit(1)
+
+    from algohealer.db.cache import CachedSQLiteManager
+    from algohealer.replay import record_session, state_path
+
+    db_conn = CachedSQLiteManager()
+    if not db_conn.check_settings_exist():
+        click.echo("No settings found. Run 'algohealer <site>' once to set them up.")
+        raise SystemExit(1)
+    settings = db_conn.get_settings()
+    if profile:
+        settings = settings.model_copy(update={"user_data_dir": profile})
+    try:
+        navigator = record_session(
+            site, har, settings, db_conn, search=search, comment=comment
+        )
+    finally:
+        db_conn.close()
+    spans = sum(span.name == "account" for span in navigator.tracer.spans)
+    click.echo(f"Recorded {spans} account(s) to {har} and {state_path(har)}")
+
+
+@cli.command()
+@click.argument("har", type=click.Path(exists=True, dir_okay=False))
+@click.option("--runs", default=1, show_default=True, help="Number of replays.")
+@click.option("--headed", is_flag=True, help="Show the browser.")
+def replay(har: str, runs: int, headed: bool) -> None:
+    """Replay a recorded session offline, as fast as possible."""
+    from rich.console import Console
+    from rich.table import Table
+
+    from algohealer.replay import replay_session
+
+    console = Console()
+    results = [replay_session(har, headless=not headed) for _ in range(runs)]
+
+    table = Table(title=f"Replay of {har}")
+    table.add_column("Run", justify="right", style="cyan")
+    table.add_column("Duration", justify="right")
+    table.add_column("Posts", justify="right")
+    table.add_column("Posts/s", justify="right", style="green")
+    for index, result in enumerate(results, start=1):
+        table.add_row(
+            str(index),
+            f"{result.seconds:.2f}s",
+            f"{result.posts}/{result.recorded_posts}",
+            f"{result.posts / result.seconds:.2f}" if result.seconds else "-",
+        )
+    console.print(table)
+
+    steps = Table(title="Slowest steps (last run)")
+    steps.add_column("Step", justify="left", style="cyan")
+    steps.add_column("Calls", justify="right")
+    steps.add_column("Timeouts", justify="right", style="yellow")
+    steps.add_column("p50", justify="right")
+    steps.add_column("p95", justify="right")
+    steps.add_column("Total", justify="right", style="green")
+    for row in results[-1].navigator.tracer.summary()[:10]:
+        steps.add_row(
+            row["name"],
+            str(row["count"]),
+            str(row["timeouts"]),
+            f"{row['p50'] * 1000:.0f} ms",
+            f"{row['p95'] * 1000:.0f} ms",
+            f"{row['total']:.2f} s",
+        )
+    console.print(steps)
+
+    # Fewer posts than recorded means a selector or flow no longer works
+    # against the recorded pages
+    if any(result.posts != result.recorded_posts for result in results):
+        console.print("[red]The replay did not visit the recorded posts.[/red]")
+        raise SystemExit(1)
+
+
+@cli.group()
+def accounts() -> None:
+    """Import and export account catalogs (JSON Lines, CSV or JSON)."""
+
+
+@accounts.command("import")
+@click.argument("path", type=click.Path(allow_dash=True, dir_okay=False))
+@click.option("--site", "-s", default=None, help="Site for rows that do not name one.")
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["jsonl", "csv", "json"]),
+    default=None,
+    help="File format (defaults to the file extension, JSON Lines for stdin).",
+)
+def import_accounts(path: str, site: str, fmt: str) -> None:
+    """Add or update the accounts in PATH. Known accounts are not duplicated."""
+    from algohealer.catalog import read_catalog
+    from algohealer.db.conn import SQLiteManager
+
+    db_conn = SQLiteManager()
+    try:
+        with read_catalog(path, fmt=fmt, site=site) as rows:
+            result = db_conn.import_accounts(rows)
+    except (OSError, ValueError) as e:
+        raise click.ClickException(str(e))
+    finally:
+        db_conn.close()
+    click.echo(
+        f"Read {result['rows']} accounts: {result['added']} added, "
+        f"{result['updated']} moved to another category."
+    )
+
+
+@accounts.command("export")
+@click.argument("path", type=click.Path(allow_dash=True, dir_okay=False))
+@click.option("--site", "-s", default=None, help="Only export this site's accounts.")
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["jsonl", "csv", "json"]),
+    default=None,
+    help="File format (defaults to the file extension, JSON Lines for stdout).",
+)
+def export_accounts(path: str, site: str, fmt: str) -> None:
+    """Write all accounts to PATH."""
+    from algohealer.catalog import write_catalog
+    from algohealer.db.conn import SQLiteManager
+
+    db_conn = SQLiteManager()
+    try:
+        count = write_catalog(path, db_conn.iter_accounts(site), fmt=fmt)
+    except (OSError, ValueError) as e:
+        raise click.ClickException(str(e))
+    finally:
+        db_conn.close()
+    if path != "-":
+        click.echo(f"Exported {count} accounts to {path}.")
+
+
 if __name__ == "__main__":
     cli()
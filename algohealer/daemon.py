@@ -0,0 +1,137 @@
+import signal
+import threading
+import time
+from typing import List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from algohealer.db.conn import SQLiteManager
+from algohealer.healer import run_navigator
+from algohealer.navigators.base.browser_pool import get_browser_pool
+
+
+class HealingDaemon:
+    def __init__(
+        self,
+        db_conn: SQLiteManager,
+        console: Optional[Console] = None,
+        poll_interval: float = 5.0,
+        backoff_base: float = 60.0,
+    ):
+        self._db_conn = db_conn
+        self._console = console or Console()
+        self._poll_interval = poll_interval
+        self._backoff_base = backoff_base
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def install_signal_handlers(self):
+        def handle(signum, _frame):
+            self._console.print(
+                "[yellow]Stopping after the current account... (press Ctrl+C again to force)[/yellow]"
+            )
+            self.stop()
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+        signal.signal(signal.SIGINT, handle)
+        signal.signal(signal.SIGTERM, handle)
+
+    def _backoff(self, job: dict, failures: int) -> float:
+        return min(job["interval_seconds"], self._backoff_base * 2 ** (failures - 1))
+
+    def run_job(self, job: dict) -> bool:
+        settings = self._db_conn.get_settings()
+        keep_warm = job["interval_seconds"] + self._poll_interval
+        if keep_warm > settings.browser_max_lifetime_seconds:
+            # The browser would be too old to reuse by the next round, so it
+            # is closed with the round instead of idling until then
+            update = {"reuse_browser": False}
+        else:
+            # Keep the browser warm until the job comes round again
+            update = {
+                "browser_idle_seconds": max(settings.browser_idle_seconds, keep_warm)
+            }
+        if job["profile"]:
+            update["user_data_dir"] = job["profile"]
+        settings = settings.model_copy(update=update)
+
+        started = time.time()
+        self._db_conn.update_job(job["id"], last_status="running", last_run_at=started)
+        self._console.print(
+            f"[blue]Healing {job['site']} ({settings.user_data_dir})...[/blue]"
+        )
+        try:
+            run_navigator(job["site"], settings, self._db_conn, self._stop_event)
+        except Exception as e:
+            failures = job["failures"] + 1
+            delay = self._backoff(job, failures)
+            self._db_conn.update_job(
+                job["id"],
+                failures=failures,
+                last_status="failed",
+                last_error=str(e),
+                next_run_at=time.time() + delay,
+            )
+            self._console.print(
+                f"[red]{job['site']} failed ({e}); retrying in {delay:.0f}s.[/red]"
+            )
+            return False
+
+        if self._stop_event.is_set():
+            # Interrupted rounds are picked up again on the next start
+            self._db_conn.update_job(job["id"], last_status="interrupted")
+            return False
+        self._db_conn.update_job(
+            job["id"],
+            failures=0,
+            last_status="healed",
+            last_error=None,
+            next_run_at=started + job["interval_seconds"],
+        )
+        self._console.print(
+            f"[green]Healed {job['site']} in {time.time() - started:.0f}s.[/green]"
+        )
+        return True
+
+    def _seconds_until_next_job(self) -> float:
+        jobs = self._db_conn.get_jobs()
+        if not jobs:
+            return self._poll_interval
+        return max(0.0, min(job["next_run_at"] for job in jobs) - time.time())
+
+    def run(self):
+        self.print_jobs()
+        try:
+            while not self._stop_event.is_set():
+                for job in self._db_conn.get_jobs(due_before=time.time()):
+                    if self._stop_event.is_set():
+                        break
+                    self.run_job(job)
+                self._stop_event.wait(
+                    min(self._poll_interval, self._seconds_until_next_job())
+                )
+        finally:
+            get_browser_pool().close()
+            self._console.print("[blue]Daemon stopped.[/blue]")
+
+    def print_jobs(self, jobs: Optional[List[dict]] = None):
+        jobs = jobs if jobs is not None else self._db_conn.get_jobs()
+        table = Table(title="Scheduled healing jobs")
+        table.add_column("Site", style="cyan")
+        table.add_column("Profile")
+        table.add_column("Every", justify="right")
+        table.add_column("Next run", justify="right")
+        table.add_column("Last status")
+        for job in jobs:
+            table.add_row(
+                job["site"],
+                job["profile"] or "(settings)",
+                f"{job['interval_seconds'] / 60:.0f} min",
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(job["next_run_at"])),
+                job["last_status"] or "-",
+            )
+        self._console.print(table)
@@ -0,0 +1,81 @@
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from algohealer.db.conn import SQLiteManager
+from algohealer.db.enums import Settings
+
+
+class CachedSQLiteManager(SQLiteManager):
+    def __init__(self, *args, check_interval: float = 0.5, **kwargs):
+        self._cache: Dict[Any, Any] = {}
+        self._data_version: Optional[int] = None
+        self._checked_at = 0.0
+        self._check_interval = check_interval
+        super().__init__(*args, **kwargs)
+
+    def invalidate(self):
+        self._cache.clear()
+
+    def _refresh(self):
+        # PRAGMA data_version only changes when another connection commits, so
+        # our own writes invalidate explicitly and this catches everyone else's.
+        now = time.monotonic()
+        if now - self._checked_at < self._check_interval:
+            return
+        self._checked_at = now
+        version = self.cursor.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._cache.clear()
+            self._data_version = version
+
+    def _cached(self, key: Any, loader: Callable[[], Any]) -> Any:
+        self._refresh()
+        if key not in self._cache:
+            self._cache[key] = loader()
+        return self._cache[key]
+
+    def initialize_tables(self):
+        super().initialize_tables()
+        self.invalidate()
+
+    def drop_tables(self):
+        super().drop_tables()
+        self.invalidate()
+
+    def check_settings_exist(self) -> bool:
+        return self._cached("settings_exist", super().check_settings_exist)
+
+    def get_settings(self) -> Settings:
+        # Callers edit the returned settings before upserting them
+        return self._cached("settings", super().get_settings).model_copy(deep=True)
+
+    def upsert_settings(self, settings: Settings):
+        super().upsert_settings(settings)
+        self.invalidate()
+
+    def add_account(self, name: str, site: str, category: str) -> int:
+        account_id = super().add_account(name, site, category)
+        self.invalidate()
+        return account_id
+
+    def add_accounts(self, accounts: Iterable[dict]) -> int:
+        count = super().add_accounts(accounts)
+        self.invalidate()
+        return count
+
+    def import_accounts(self, rows: Iterable[tuple]) -> Dict[str, int]:
+        try:
+            return super().import_accounts(rows)
+        finally:
+            self.invalidate()
+
+    def delete_accounts(self, account_ids: List[int]):
+        super().delete_accounts(account_ids)
+        self.invalidate()
+
+    def get_all_accounts_for_site(self, site: str) -> List[dict]:
+        accounts = self._cached(
+            ("accounts", site),
+            lambda: super(CachedSQLiteManager, self).get_all_accounts_for_site(site),
+        )
+        return list(accounts)
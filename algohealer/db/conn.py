@@ -1,24 +1,149 @@
 import json
 import os
 import sqlite3
-from typing import List
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+from algohealer.catalog import read_catalog
 from algohealer.db.enums import CATEGORIES, Settings
+from algohealer.sampler import AccountCandidate
+
+# Each entry upgrades the schema by one version (tracked in PRAGMA user_version).
+# Append new migrations; never edit or reorder existing ones.
+MIGRATIONS: List[List[str]] = [
+    [
+        "CREATE INDEX IF NOT EXISTS idx_accounts_site_category ON accounts (site, category)",
+    ],
+    [
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            site TEXT NOT NULL,
+            profile TEXT NOT NULL,
+            interval_seconds REAL NOT NULL,
+            next_run_at REAL NOT NULL,
+            failures INTEGER NOT NULL DEFAULT 0,
+            last_status TEXT,
+            last_error TEXT,
+            last_run_at REAL,
+            UNIQUE (site, profile)
+        )
+        """,
+    ],
+    [
+        """
+        CREATE TABLE IF NOT EXISTS feed_health (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            site TEXT NOT NULL,
+            session TEXT NOT NULL,
+            surface TEXT NOT NULL,
+            posts INTEGER NOT NULL,
+            aligned INTEGER NOT NULL,
+            health REAL NOT NULL,
+            categories TEXT NOT NULL,
+            measured_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_feed_health_site_time ON feed_health (site, measured_at)",
+    ],
+    [
+        """
+        CREATE TABLE IF NOT EXISTS actions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            site TEXT NOT NULL,
+            session TEXT NOT NULL,
+            account TEXT,
+            post_id TEXT,
+            action TEXT NOT NULL,
+            outcome INTEGER NOT NULL,
+            latency_ms REAL NOT NULL,
+            created_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_actions_site_time ON actions (site, created_at)",
+    ],
+    [
+        # Repeated imports used to duplicate accounts; keep the oldest copy
+        "DELETE FROM accounts WHERE id NOT IN (SELECT MIN(id) FROM accounts GROUP BY site, name)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_accounts_site_name ON accounts (site, name)",
+    ],
+]
+
+# Settings stored as JSON rather than plain strings
+JSON_SETTINGS = {"interests", "interest_weights"}
+
+# Interests are filtered inside SQLite so the setting is never decoded in Python
+ACCOUNTS_OF_INTEREST = """site = ? AND category IN (
+    SELECT value FROM json_each((SELECT value FROM settings WHERE name = 'interests'))
+)"""
+
+# Re-adding a known account only moves it to the new category
+ACCOUNT_UPSERT = """INSERT INTO accounts (name, site, category) {source}
+ON CONFLICT (site, name) DO UPDATE SET category = excluded.category
+WHERE category != excluded.category"""
+
+ACTION_GROUPS = {
+    "account": "COALESCE(actions.account, '-')",
+    "category": "COALESCE(known.category, 'unknown')",
+    "action": "actions.action",
+    "session": "actions.session",
+}
+
+JOB_UPDATABLE_COLUMNS = {
+    "interval_seconds",
+    "next_run_at",
+    "failures",
+    "last_status",
+    "last_error",
+    "last_run_at",
+}
 
 
 class SQLiteManager:
-    def __init__(self, drop: bool = False):
-        self.db_path = os.getenv("ALGOHEALER_DB_PATH", f"{os.getcwd()}/algohealer.db")
+    def __init__(
+        self,
+        drop: bool = False,
+        busy_timeout: float = 30.0,
+        db_path: Optional[str] = None,
+    ):
+        self.db_path = db_path or os.getenv(
+            "ALGOHEALER_DB_PATH", f"{os.getcwd()}/algohealer.db"
+        )
         self.connection = None
         self.cursor = None
+        self._busy_timeout = busy_timeout
+        self._transaction_depth = 0
         self._connect()
         if drop:
             self.drop_tables()
         self.initialize_tables()
 
     def _connect(self):
-        self.connection = sqlite3.connect(self.db_path)
+        self.connection = sqlite3.connect(self.db_path, timeout=self._busy_timeout)
         self.cursor = self.connection.cursor()
+        # WAL lets parallel healers read while one of them writes
+        self.cursor.execute("PRAGMA journal_mode=WAL")
+        self.cursor.execute("PRAGMA synchronous=NORMAL")
+        self.cursor.execute(f"PRAGMA busy_timeout={int(self._busy_timeout * 1000)}")
+
+    @contextmanager
+    def transaction(self):
+        self._transaction_depth += 1
+        try:
+            yield self.cursor
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.connection.rollback()
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self.connection.commit()
+
+    def _commit(self):
+        if self._transaction_depth == 0:
+            self.connection.commit()
 
     def close(self):
         if self.connection:
@@ -44,7 +169,30 @@ class SQLiteManager:
         )
         """
         )
+        self.cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS crawl_state (
+            site TEXT NOT NULL,
+            account TEXT NOT NULL,
+            seen_posts TEXT NOT NULL,
+            last_visited_at REAL NOT NULL,
+            PRIMARY KEY (site, account)
+        )
+        """
+        )
         self.connection.commit()
+        self._migrate()
+
+    def schema_version(self) -> int:
+        return self.cursor.execute("PRAGMA user_version").fetchone()[0]
+
+    def _migrate(self):
+        version = self.schema_version()
+        for target, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+            with self.transaction():
+                for statement in statements:
+                    self.cursor.execute(statement)
+                self.cursor.execute(f"PRAGMA user_version = {target}")
 
     def add_default_accounts(self):
         path = os.getenv(
@@ -52,15 +200,18 @@ class SQLiteManager:
             f"{os.getcwd()}/default_accounts.json",
         )
         if os.path.exists(path):
-            with open(path, "r") as f:
-                default_accounts = json.load(f)
-            for account in default_accounts.get("accounts", []):
-                self.add_account(**account)
+            with read_catalog(path) as rows:
+                self.import_accounts(rows)
 
     def drop_tables(self):
         self.cursor.execute("DROP TABLE IF EXISTS accounts")
         self.cursor.execute("DROP TABLE IF EXISTS settings")
-        self.connection.commit()
+        self.cursor.execute("DROP TABLE IF EXISTS crawl_state")
+        self.cursor.execute("DROP TABLE IF EXISTS jobs")
+        self.cursor.execute("DROP TABLE IF EXISTS feed_health")
+        self.cursor.execute("DROP TABLE IF EXISTS actions")
+        self.cursor.execute("PRAGMA user_version = 0")
+        self._commit()
 
     def check_settings_exist(self) -> bool:
         self.cursor.execute("SELECT name FROM settings")
@@ -74,48 +225,128 @@ class SQLiteManager:
             # Convert to boolean
             if result[1] in ["0", "1"]:
                 settings[result[0]] = result[1] == "1"
-            if result[0] == "interests":
+            if result[0] in JSON_SETTINGS:
                 settings[result[0]] = json.loads(result[1])
             else:
                 settings[result[0]] = result[1]
         return Settings(**settings)
 
     def upsert_settings(self, settings: Settings):
-        for key, value in settings.dict().items():
-            if key == "interests":
-                value = json.dumps(value)
-
-            self.cursor.execute(
+        rows = [
+            (key, json.dumps(value) if key in JSON_SETTINGS else value)
+            for key, value in settings.model_dump().items()
+        ]
+        with self.transaction():
+            self.cursor.executemany(
                 "INSERT OR REPLACE INTO settings (name, value) VALUES (?, ?)",
-                (key, value),
+                rows,
             )
-        self.connection.commit()
 
     def add_account(self, name: str, site: str, category: str) -> int:
         if category not in CATEGORIES:
             raise ValueError(f"Category must be one of {CATEGORIES}")
         self.cursor.execute(
-            "INSERT INTO accounts (name, site, category) VALUES (?, ?, ?)",
-            (name, site, category),
+            ACCOUNT_UPSERT.format(source="VALUES (?, ?, ?)"), (name, site, category)
         )
-        self.connection.commit()
-        return self.cursor.lastrowid
+        self._commit()
+        return self.cursor.execute(
+            "SELECT id FROM accounts WHERE site = ? AND name = ?", (site, name)
+        ).fetchone()[0]
 
-    def delete_accounts(self, account_ids: List[int]):
-        for account_id in account_ids:
-            self.cursor.execute("DELETE FROM accounts WHERE id = ?", (account_id,))
-        self.connection.commit()
+    def add_accounts(self, accounts: Iterable[dict]) -> int:
+        rows = [
+            (account["name"], account["site"], account["category"])
+            for account in accounts
+        ]
+        invalid = {row[2] for row in rows} - set(CATEGORIES)
+        if invalid:
+            raise ValueError(
+                f"Unknown categories {sorted(invalid)}. Category must be one of {CATEGORIES}"
+            )
+        with self.transaction():
+            self.cursor.executemany(
+                ACCOUNT_UPSERT.format(source="VALUES (?, ?, ?)"), rows
+            )
+        return len(rows)
 
-    def get_all_accounts_for_site(self, site: str) -> List[dict]:
-        eligible_interests = json.loads(
+    def import_accounts(self, rows: Iterable[Tuple[str, str, str]]) -> Dict[str, int]:
+        # rows are (name, site, category) and are consumed lazily: they stream
+        # into a staging table, get validated there in bulk and are merged
+        # into accounts in the same transaction, so a bad row changes nothing.
+        categories = ", ".join("?" for _ in CATEGORIES)
+        with self.transaction():
             self.cursor.execute(
-                "SELECT value FROM settings WHERE name = 'interests'"
+                """CREATE TEMP TABLE IF NOT EXISTS accounts_staging (
+                    name TEXT NOT NULL,
+                    site TEXT NOT NULL,
+                    category TEXT NOT NULL
+                )"""
+            )
+            self.cursor.execute("DELETE FROM accounts_staging")
+            self.cursor.executemany(
+                "INSERT INTO accounts_staging (name, site, category) VALUES (?, ?, ?)",
+                rows,
+            )
+            invalid = [
+                row[0]
+                for row in self.cursor.execute(
+                    f"SELECT DISTINCT category FROM accounts_staging WHERE category NOT IN ({categories})",
+                    CATEGORIES,
+                )
+            ]
+            if invalid:
+                raise ValueError(
+                    f"Unknown categories {sorted(invalid)}. Category must be one of {CATEGORIES}"
+                )
+            staged = self.cursor.execute(
+                "SELECT COUNT(*) FROM accounts_staging"
             ).fetchone()[0]
-        )
-        interests = ", ".join([f"'{interest}'" for interest in eligible_interests])
+            before = self.cursor.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+            # An account listed twice takes its last category. The WHERE also
+            # keeps SQLite from reading ON CONFLICT as a join clause.
+            self.cursor.execute(
+                ACCOUNT_UPSERT.format(
+                    source="""SELECT name, site, category FROM accounts_staging
+                    WHERE rowid IN (
+                        SELECT MAX(rowid) FROM accounts_staging GROUP BY site, name
+                    )"""
+                )
+            )
+            changed = self.cursor.rowcount
+            added = (
+                self.cursor.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+                - before
+            )
+            self.cursor.execute("DELETE FROM accounts_staging")
+        return {"rows": staged, "added": added, "updated": changed - added}
+
+    def iter_accounts(
+        self, site: Optional[str] = None, batch_size: int = 1000
+    ) -> Iterator[Tuple[str, str, str]]:
+        cursor = self.connection.cursor()
+        try:
+            if site is None:
+                cursor.execute("SELECT name, site, category FROM accounts ORDER BY id")
+            else:
+                cursor.execute(
+                    "SELECT name, site, category FROM accounts WHERE site = ? ORDER BY id",
+                    (site,),
+                )
+            while rows := cursor.fetchmany(batch_size):
+                yield from rows
+        finally:
+            cursor.close()
+
+    def delete_accounts(self, account_ids: List[int]):
+        with self.transaction():
+            self.cursor.executemany(
+                "DELETE FROM accounts WHERE id = ?",
+                [(account_id,) for account_id in account_ids],
+            )
+
+    def get_all_accounts_for_site(self, site: str) -> List[dict]:
         self.cursor.execute(
-            f"""SELECT * FROM accounts WHERE
-            site = ? AND category IN ({interests})""",
+            f"SELECT id, name, site, category FROM accounts WHERE {ACCOUNTS_OF_INTEREST}",
             (site,),
         )
 
@@ -129,3 +360,224 @@ class SQLiteManager:
             }
             for result in results
         ]
+
+    def iter_account_names(self, site: str, batch_size: int = 500) -> Iterator[str]:
+        # A private cursor keeps the read open while crawl results are written
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                f"SELECT name FROM accounts WHERE {ACCOUNTS_OF_INTEREST} ORDER BY id",
+                (site,),
+            )
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield row[0]
+        finally:
+            cursor.close()
+
+    def get_category_counts(self, site: str) -> Dict[str, int]:
+        self.cursor.execute(
+            f"SELECT category, COUNT(*) FROM accounts WHERE {ACCOUNTS_OF_INTEREST} GROUP BY category",
+            (site,),
+        )
+        return dict(self.cursor.fetchall())
+
+    def iter_account_candidates(
+        self,
+        site: str,
+        engagement_actions: Sequence[str] = (),
+        since: Optional[float] = None,
+        batch_size: int = 500,
+    ) -> Iterator[AccountCandidate]:
+        # Accounts of interest with their last visit and engagement yield: the
+        # sessions that engaged with each account and the posts engaged with.
+        # Only `engagement_actions` count, not walking from post to post.
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                f"""SELECT accounts.name, accounts.category, crawl_state.last_visited_at,
+                    COALESCE(engaged.visits, 0), COALESCE(engaged.posts, 0)
+                FROM (
+                    SELECT name, site, category FROM accounts WHERE {ACCOUNTS_OF_INTEREST}
+                ) AS accounts
+                LEFT JOIN crawl_state
+                    ON crawl_state.site = accounts.site AND crawl_state.account = accounts.name
+                LEFT JOIN (
+                    SELECT account, COUNT(DISTINCT session) AS visits,
+                        COUNT(DISTINCT post_id) AS posts
+                    FROM actions
+                    WHERE site = ? AND outcome = 1 AND post_id IS NOT NULL AND created_at >= ?
+                        AND action IN (SELECT value FROM json_each(?))
+                    GROUP BY account
+                ) AS engaged ON engaged.account = accounts.name""",
+                (site, site, since or 0, json.dumps(list(engagement_actions))),
+            )
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield AccountCandidate(*row)
+        finally:
+            cursor.close()
+
+    def get_crawl_states(self, site: str) -> Dict[str, dict]:
+        self.cursor.execute(
+            "SELECT account, seen_posts, last_visited_at FROM crawl_state WHERE site = ?",
+            (site,),
+        )
+        return {
+            result[0]: {
+                "seen_posts": json.loads(result[1]),
+                "last_visited_at": result[2],
+            }
+            for result in self.cursor.fetchall()
+        }
+
+    def record_crawl(
+        self,
+        site: str,
+        account: str,
+        post_ids: List[str],
+        visited_at: Optional[float] = None,
+        keep: int = 200,
+    ):
+        self.cursor.execute(
+            "SELECT seen_posts FROM crawl_state WHERE site = ? AND account = ?",
+            (site, account),
+        )
+        result = self.cursor.fetchone()
+        seen = json.loads(result[0]) if result else []
+        # Newest first, so the walk can stop at the most recent known post
+        merged = list(dict.fromkeys(post_ids + seen))[:keep]
+        self.cursor.execute(
+            "INSERT OR REPLACE INTO crawl_state (site, account, seen_posts, last_visited_at) VALUES (?, ?, ?, ?)",
+            (site, account, json.dumps(merged), visited_at or time.time()),
+        )
+        self._commit()
+
+    def upsert_job(self, site: str, profile: str, interval_seconds: float) -> int:
+        self.cursor.execute(
+            """INSERT INTO jobs (site, profile, interval_seconds, next_run_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (site, profile) DO UPDATE SET interval_seconds = excluded.interval_seconds""",
+            (site, profile, interval_seconds, time.time()),
+        )
+        self._commit()
+        return self.cursor.execute(
+            "SELECT id FROM jobs WHERE site = ? AND profile = ?", (site, profile)
+        ).fetchone()[0]
+
+    def get_jobs(self, due_before: Optional[float] = None) -> List[dict]:
+        query = "SELECT id, site, profile, interval_seconds, next_run_at, failures, last_status, last_error, last_run_at FROM jobs"
+        params = ()
+        if due_before is not None:
+            query += " WHERE next_run_at <= ?"
+            params = (due_before,)
+        self.cursor.execute(query + " ORDER BY next_run_at", params)
+        return [
+            {
+                "id": result[0],
+                "site": result[1],
+                "profile": result[2],
+                "interval_seconds": result[3],
+                "next_run_at": result[4],
+                "failures": result[5],
+                "last_status": result[6],
+                "last_error": result[7],
+                "last_run_at": result[8],
+            }
+            for result in self.cursor.fetchall()
+        ]
+
+    def update_job(self, job_id: int, **fields):
+        unknown = set(fields) - JOB_UPDATABLE_COLUMNS
+        if unknown:
+            raise ValueError(f"Cannot update job columns {sorted(unknown)}")
+        columns = ", ".join(f"{column} = ?" for column in fields)
+        self.cursor.execute(
+            f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id)
+        )
+        self._commit()
+
+    def record_feed_health(
+        self,
+        site: str,
+        session: str,
+        surface: str,
+        posts: int,
+        aligned: int,
+        categories: Dict[str, int],
+        measured_at: Optional[float] = None,
+    ):
+        self.cursor.execute(
+            """INSERT INTO feed_health
+            (site, session, surface, posts, aligned, health, categories, measured_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                site,
+                session,
+                surface,
+                posts,
+                aligned,
+                aligned / posts if posts else 0.0,
+                json.dumps(categories),
+                measured_at or time.time(),
+            ),
+        )
+        self._commit()
+
+    def record_actions(self, rows: Iterable[tuple]) -> int:
+        # rows are (site, session, account, post_id, action, outcome, latency_ms, created_at)
+        rows = list(rows)
+        with self.transaction():
+            self.cursor.executemany(
+                """INSERT INTO actions
+                (site, session, account, post_id, action, outcome, latency_ms, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+        return len(rows)
+
+    def get_action_stats(
+        self, site: str, group_by: str = "account", since: Optional[float] = None
+    ) -> List[dict]:
+        if group_by not in ACTION_GROUPS:
+            raise ValueError(f"Cannot group actions by {group_by!r}")
+        self.cursor.execute(
+            f"""SELECT {ACTION_GROUPS[group_by]} AS key, COUNT(*), SUM(actions.outcome),
+            AVG(actions.latency_ms), MIN(actions.created_at), MAX(actions.created_at)
+            FROM actions
+            LEFT JOIN (SELECT DISTINCT site, name, category FROM accounts) AS known
+                ON known.site = actions.site AND known.name = actions.account
+            WHERE actions.site = ? AND actions.created_at >= ?
+            GROUP BY key ORDER BY COUNT(*) DESC""",
+            (site, since or 0),
+        )
+        return [
+            {
+                "key": result[0],
+                "actions": result[1],
+                "succeeded": result[2],
+                "success_rate": result[2] / result[1],
+                "avg_latency_ms": result[3],
+                "first_at": result[4],
+                "last_at": result[5],
+            }
+            for result in self.cursor.fetchall()
+        ]
+
+    def get_action_throughput(
+        self, site: str, bucket_seconds: float = 3600, since: Optional[float] = None
+    ) -> List[dict]:
+        self.cursor.execute(
+            """SELECT CAST(created_at / ? AS INTEGER) AS bucket, COUNT(*), SUM(outcome)
+            FROM actions WHERE site = ? AND created_at >= ?
+            GROUP BY bucket ORDER BY bucket""",
+            (bucket_seconds, site, since or 0),
+        )
+        return [
+            {
+                "started_at": result[0] * bucket_seconds,
+                "actions": result[1],
+                "succeeded": result[2],
+            }
+            for result in self.cursor.fetchall()
+        ]
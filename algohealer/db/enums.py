@@ -1,6 +1,6 @@
 import os
 from enum import Enum
-from typing import List
+from typing import Dict, List
 
 from pydantic import BaseModel
 
@@ -22,3 +22,29 @@ class Settings(BaseModel):
     channel: str = "chrome"
     user_data_dir: str = f"C:/Users/{os.getenv('USERNAME', 'TEMP')}/AppData/Local/Google/Chrome/User Data"
     interests: List[Category] = [CATEGORIES]
+    concurrency: int = 1
+    actions_per_minute: float = 40
+    jitter: float = 0.5
+    block_resources: bool = True
+    batch_actions: bool = True
+    trace_dir: str = ""
+    # Serves live counters on 127.0.0.1:<port>/metrics while healing (0 disables)
+    metrics_port: int = 0
+    revisit_ttl_hours: float = 0
+    assess_feed: bool = False
+    feed_likes: int = 0
+    reuse_browser: bool = True
+    prefetch: bool = False
+    selector_miss_limit: int = 5
+    navigation_retries: int = 2
+    # Tabs and contexts are only recycled past these limits (0 disables)
+    memory_limit_mb: float = 0
+    js_heap_limit_mb: float = 0
+    # Per-session budgets; with any of them set, accounts are sampled by
+    # interest weight, staleness and engagement instead of all being walked
+    session_accounts: int = 0
+    session_minutes: float = 0
+    session_actions: int = 0
+    interest_weights: Dict[str, float] = {}
+    browser_idle_seconds: float = 300
+    browser_max_lifetime_seconds: float = 3600
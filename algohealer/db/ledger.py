@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from algohealer.db.conn import SQLiteManager
+
+
+class ActionRecord(NamedTuple):
+    site: str
+    session: str
+    account: Optional[str]
+    post_id: Optional[str]
+    action: str
+    outcome: bool
+    latency_ms: float
+    created_at: float
+
+
+class ActionLedger:
+    # Buffers action outcomes in memory and writes them from a background
+    # thread, one transaction per batch, so recording an action never waits
+    # on SQLite. The writer has its own connection (sqlite3 connections stay
+    # on the thread that opened them). A batch is written every
+    # `flush_interval` seconds, or sooner once `max_pending` records queue up.
+    # Pass the session's `db_path` so the ledger lands in the same database.
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        flush_interval: float = 2.0,
+        max_pending: int = 200,
+        connect: Callable[..., SQLiteManager] = SQLiteManager,
+    ):
+        self._db_path = db_path
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._connect = connect
+        self._pending: List[ActionRecord] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+        self._thread = threading.Thread(
+            target=self._run, name="action-ledger", daemon=True
+        )
+        self._thread.start()
+
+    def record(
+        self,
+        site: str,
+        session: str,
+        action: str,
+        outcome: bool,
+        latency_ms: float,
+        account: Optional[str] = None,
+        post_id: Optional[str] = None,
+    ):
+        record = ActionRecord(
+            site=site,
+            session=session,
+            account=account,
+            post_id=post_id,
+            action=action,
+            outcome=bool(outcome),
+            latency_ms=latency_ms,
+            created_at=time.time(),
+        )
+        with self._lock:
+            self._pending.append(record)
+            full = len(self._pending) >= self._max_pending
+        if full:
+            self._wake.set()
+
+    def _take(self) -> List[ActionRecord]:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def _run(self):
+        db_conn = self._connect(db_path=self._db_path)
+        try:
+            while not self._closed:
+                self._wake.wait(self._flush_interval)
+                self._wake.clear()
+                self._write(db_conn, self._take())
+            self._write(db_conn, self._take())
+        finally:
+            db_conn.close()
+
+    def _write(self, db_conn: SQLiteManager, records: List[ActionRecord]):
+        if not records:
+            return
+        try:
+            self.written += db_conn.record_actions(records)
+        except Exception:
+            # Losing a batch of analytics must not take the session down
+            self.dropped += len(records)
+
+    def flush(self):
+        self._wake.set()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+
+    def __enter__(self) -> "ActionLedger":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,228 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from multiprocessing import get_context
+from typing import List, Optional
+
+from playwright._impl._errors import TargetClosedError
+from pydantic import BaseModel
+
+from algohealer.db.cache import CachedSQLiteManager
+from algohealer.db.conn import SQLiteManager
+from algohealer.db.enums import Settings
+from algohealer.db.ledger import ActionLedger
+from algohealer.navigators.base.browser_pool import get_browser_pool
+from algohealer.navigators.base.multisite import MultiSiteSession
+from algohealer.navigators.base.pacing import PacingScheduler
+from algohealer.navigators.registry import ASYNC_NAVIGATORS, NAVIGATORS
+from algohealer.progress import SessionMetrics, metrics_server
+
+
+class HealResult(BaseModel):
+    profile: str
+    site: Optional[str] = None
+    status: str
+    seconds: float
+    error: Optional[str] = None
+    requests_blocked: int = 0
+    requests_stubbed: int = 0
+    estimated_bytes_saved: int = 0
+    peak_rss_mb: float = 0
+    peak_js_heap_mb: float = 0
+    page_recycles: int = 0
+    context_recycles: int = 0
+
+
+def navigator_kwargs(
+    settings: Settings,
+    db_conn: SQLiteManager,
+    stop_event: Optional[threading.Event] = None,
+    ledger: Optional[ActionLedger] = None,
+) -> dict:
+    return {
+        "user_data_dir": settings.user_data_dir,
+        "channel": settings.channel,
+        "headless": settings.headless,
+        "db_conn": db_conn,
+        "actions_per_minute": settings.actions_per_minute,
+        "jitter": settings.jitter,
+        "block_resources": settings.block_resources,
+        "batch_actions": settings.batch_actions,
+        "revisit_ttl_hours": settings.revisit_ttl_hours,
+        "interests": settings.interests,
+        "assess_feed": settings.assess_feed,
+        "feed_likes": settings.feed_likes,
+        "prefetch": settings.prefetch,
+        "selector_miss_limit": settings.selector_miss_limit,
+        "navigation_retries": settings.navigation_retries,
+        "memory_limit_mb": settings.memory_limit_mb,
+        "js_heap_limit_mb": settings.js_heap_limit_mb,
+        "session_accounts": settings.session_accounts,
+        "session_minutes": settings.session_minutes,
+        "session_actions": settings.session_actions,
+        "interest_weights": settings.interest_weights,
+        "ledger": ledger,
+        "stop_event": stop_event,
+    }
+
+
+def run_navigator(
+    site: str,
+    settings: Settings,
+    db_conn: SQLiteManager,
+    stop_event: Optional[threading.Event] = None,
+    metrics: Optional[SessionMetrics] = None,
+):
+    if metrics is None and settings.metrics_port:
+        metrics = SessionMetrics()
+    with ActionLedger(db_conn.db_path) as ledger, ExitStack() as stack:
+        if settings.metrics_port:
+            stack.enter_context(metrics_server(metrics, settings.metrics_port))
+        if settings.concurrency > 1 and site in ASYNC_NAVIGATORS:
+            navigator = ASYNC_NAVIGATORS[site](
+                **navigator_kwargs(settings, db_conn, stop_event, ledger),
+                concurrency=settings.concurrency,
+            )
+            if metrics is not None:
+                metrics.watch(site, navigator)
+            navigator.run_until_complete()
+        else:
+            browser_pool = (
+                get_browser_pool(
+                    idle_timeout=settings.browser_idle_seconds,
+                    max_lifetime=settings.browser_max_lifetime_seconds,
+                )
+                if settings.reuse_browser
+                else None
+            )
+            navigator = NAVIGATORS[site](
+                **navigator_kwargs(settings, db_conn, stop_event, ledger),
+                browser_pool=browser_pool,
+            )
+            if metrics is not None:
+                metrics.watch(site, navigator)
+            try:
+                navigator.run()
+            finally:
+                navigator.stop()
+    if settings.trace_dir:
+        profile = os.path.basename(os.path.normpath(settings.user_data_dir))
+        navigator.tracer.export(settings.trace_dir, prefix=f"{site}-{profile}")
+    return navigator
+
+
+def heal_sites(
+    sites: List[str],
+    settings: Settings,
+    db_conn: SQLiteManager,
+    stop_event: Optional[threading.Event] = None,
+    metrics: Optional[SessionMetrics] = None,
+) -> List[HealResult]:
+    # All sites share one browser on the profile and one pacing budget
+    pacing = PacingScheduler(
+        actions_per_minute=settings.actions_per_minute, jitter=settings.jitter
+    )
+    if metrics is None and settings.metrics_port:
+        metrics = SessionMetrics()
+    with ActionLedger(db_conn.db_path) as ledger, ExitStack() as stack:
+        if settings.metrics_port:
+            stack.enter_context(metrics_server(metrics, settings.metrics_port))
+        session = MultiSiteSession(
+            {
+                site: ASYNC_NAVIGATORS[site](
+                    **navigator_kwargs(settings, db_conn, stop_event, ledger),
+                    concurrency=settings.concurrency,
+                    pacing=pacing,
+                )
+                for site in sites
+            },
+            user_data_dir=settings.user_data_dir,
+            channel=settings.channel,
+            headless=settings.headless,
+        )
+        if metrics is not None:
+            for site, navigator in session.navigators.items():
+                metrics.watch(site, navigator)
+        outcomes = session.run_until_complete()
+
+    results = []
+    profile = os.path.basename(os.path.normpath(settings.user_data_dir))
+    for site, navigator in session.navigators.items():
+        if settings.trace_dir:
+            navigator.tracer.export(settings.trace_dir, prefix=f"{site}-{profile}")
+        outcome = outcomes[site]
+        results.append(
+            HealResult(
+                profile=settings.user_data_dir,
+                site=site,
+                status="failed" if outcome.error else "healed",
+                seconds=outcome.seconds,
+                error=outcome.error,
+                **navigator.network_stats(),
+                **navigator.memory_stats(),
+            )
+        )
+    return results
+
+
+def heal_profile(site: str, profile: str, index: int = 0) -> HealResult:
+    start = time.perf_counter()
+    db_conn = CachedSQLiteManager()
+    try:
+        settings = db_conn.get_settings()
+        # Pool workers move on to other profiles, so a pooled browser kept
+        # warm for this one would only sit idle in the worker
+        update = {"user_data_dir": profile, "reuse_browser": False}
+        if settings.metrics_port:
+            # Each profile of a fleet serves its metrics on its own port
+            update["metrics_port"] = settings.metrics_port + index
+        settings = settings.model_copy(update=update)
+        navigator = run_navigator(site, settings, db_conn)
+    except TargetClosedError:
+        return HealResult(
+            profile=profile,
+            status="browser in use",
+            seconds=time.perf_counter() - start,
+            error="Profile is open in another browser window.",
+        )
+    except Exception as e:
+        return HealResult(
+            profile=profile,
+            status="failed",
+            seconds=time.perf_counter() - start,
+            error=str(e),
+        )
+    finally:
+        db_conn.close()
+    return HealResult(
+        profile=profile,
+        status="healed",
+        seconds=time.perf_counter() - start,
+        **navigator.network_stats(),
+        **navigator.memory_stats(),
+    )
+
+
+def heal_profiles(
+    site: str, profiles: List[str], workers: Optional[int] = None
+) -> List[HealResult]:
+    results = {}
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=get_context("spawn")
+    ) as executor:
+        futures = {
+            executor.submit(heal_profile, site, profile, index): profile
+            for index, profile in enumerate(profiles)
+        }
+        for future in as_completed(futures):
+            profile = futures[future]
+            try:
+                results[profile] = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. out of memory)
+                results[profile] = HealResult(
+                    profile=profile, status="crashed", seconds=0.0, error=str(e)
+                )
+    return [results[profile] for profile in profiles]
@@ -0,0 +1,20 @@
+import re
+
+INTERVAL_ALIASES = {
+    "@hourly": 3600,
+    "@daily": 86400,
+    "@weekly": 604800,
+}
+INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_interval(value: str) -> float:
+    value = value.strip().lower()
+    if value in INTERVAL_ALIASES:
+        return INTERVAL_ALIASES[value]
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([smhd]?)", value)
+    if not match:
+        raise ValueError(
+            f"Invalid interval '{value}'. Use e.g. 90s, 30m, 6h, 1d or {', '.join(INTERVAL_ALIASES)}."
+        )
+    return float(match.group(1)) * INTERVAL_UNITS[match.group(2) or "s"]
@@ -1,12 +1,18 @@
+from typing import List, Optional
+
 import questionary
 from playwright._impl._errors import TargetClosedError
 from questionary import Style
 from rich.console import Console
+from rich.live import Live
 from rich.table import Table
 
 from algohealer.db.conn import SQLiteManager
 from algohealer.db.enums import CATEGORIES, Category, Settings
-from algohealer.navigators.instagram.instagram_navigator import InstagramNavigator
+from algohealer.healer import ASYNC_NAVIGATORS, NAVIGATORS, heal_profiles, run_navigator
+from algohealer.progress import ProgressView, SessionMetrics
+from algohealer.report import print_action_report
+from algohealer.sampler import parse_weights
 
 custom_style = Style(
     [
@@ -19,10 +25,17 @@ custom_style = Style(
 )
 
 
+def _valid_weights(value: str):
+    try:
+        parse_weights(value)
+    except ValueError as e:
+        return str(e)
+    return True
+
+
 class DataManager:
-    NAVIGATORS = {
-        "instagram": InstagramNavigator,
-    }
+    NAVIGATORS = NAVIGATORS
+    ASYNC_NAVIGATORS = ASYNC_NAVIGATORS
 
     def __init__(self, site: str, db_conn: SQLiteManager):
         self.site = site
@@ -45,6 +58,7 @@ class DataManager:
             f"Delete {self.site} account",
             "Update AlgoHealer settings",
             "Reset AlgoHealer",
+            f"View {self.site} activity report",
             "Exit",
         ]
         while True:
@@ -86,6 +100,8 @@ class DataManager:
                         self._db_conn.add_default_accounts()
                 else:
                     self._console.print("[yellow]Reset cancelled.[/yellow]")
+            elif user_choice == choices[6]:
+                print_action_report(self._console, self._db_conn, self.site)
             elif user_choice == choices[-1]:
                 self._console.print("[blue]Exiting... Goodbye![/blue]")
                 break
@@ -107,15 +123,18 @@ class DataManager:
 
         self._console.print(f"[blue]Healing {self.site} algorithm...[/blue]")
         settings: Settings = self._db_conn.get_settings()
-        try:
-            navigator = DataManager.NAVIGATORS[self.site](
-                user_data_dir=settings.user_data_dir,
-                channel=settings.channel,
-                headless=settings.headless,
-                db_conn=self._db_conn,
+        if settings.metrics_port:
+            self._console.print(
+                f"[cyan]Metrics at http://127.0.0.1:{settings.metrics_port}/metrics[/cyan]"
             )
-            navigator.run()
-            navigator.stop()
+        metrics = SessionMetrics()
+        try:
+            with Live(
+                ProgressView(metrics), console=self._console, refresh_per_second=4
+            ):
+                navigator = run_navigator(
+                    self.site, settings, self._db_conn, metrics=metrics
+                )
         except TargetClosedError:
             self._console.print(
                 "[red]Please close all browser windows and try again.[/red]"
@@ -124,8 +143,122 @@ class DataManager:
         except Exception as e:
             self._console.print(f"[red]An error occurred: {e}[/red]")
             return False
+        self._print_trace_summary(navigator.tracer.summary())
+        self._print_feed_health(getattr(navigator, "feed_reports", []))
+        self._print_memory_stats(navigator.memory_stats())
+        broken = navigator.broken_selectors()
+        if broken:
+            self._console.print(
+                "[yellow]These selectors kept missing and were skipped for the "
+                f"rest of the session, the site may have changed: {', '.join(broken)}[/yellow]"
+            )
+        stats = navigator.network_stats()
+        if stats["requests_blocked"] or stats["requests_stubbed"]:
+            self._console.print(
+                f"[cyan]Blocked {stats['requests_blocked']} and stubbed "
+                f"{stats['requests_stubbed']} requests "
+                f"(an estimated {stats['estimated_bytes_saved'] / 1_000_000:.1f} MB saved).[/cyan]"
+            )
         return True
 
+    def _print_trace_summary(self, rows: List[dict]):
+        if not rows:
+            return
+        table = Table(title="Session timings")
+        table.add_column("Step", justify="left", style="cyan")
+        table.add_column("Calls", justify="right")
+        table.add_column("Timeouts", justify="right", style="yellow")
+        table.add_column("p50", justify="right")
+        table.add_column("p95", justify="right")
+        table.add_column("Total", justify="right", style="green")
+        for row in rows:
+            table.add_row(
+                row["name"],
+                str(row["count"]),
+                str(row["timeouts"]),
+                f"{row['p50'] * 1000:.0f} ms",
+                f"{row['p95'] * 1000:.0f} ms",
+                f"{row['total']:.1f} s",
+            )
+        self._console.print(table)
+
+    def _print_feed_health(self, reports: list):
+        if not reports:
+            return
+        table = Table(title="Feed health")
+        table.add_column("Feed", justify="left", style="cyan")
+        table.add_column("Posts", justify="right")
+        table.add_column("Matching interests", justify="right", style="green")
+        table.add_column("Categories", justify="left")
+        for report in reports:
+            table.add_row(
+                report.surface,
+                str(report.posts),
+                f"{report.health:.0%}",
+                ", ".join(
+                    f"{name} {count}"
+                    for name, count in sorted(
+                        report.categories.items(), key=lambda item: -item[1]
+                    )
+                ),
+            )
+        self._console.print(table)
+
+    def _print_memory_stats(self, stats: dict):
+        if not stats["peak_rss_mb"] and not stats["peak_js_heap_mb"]:
+            return
+        recycles = ""
+        if stats["page_recycles"] or stats["context_recycles"]:
+            recycles = (
+                f", recycled {stats['page_recycles']} tab(s) and "
+                f"{stats['context_recycles']} browser(s)"
+            )
+        self._console.print(
+            f"[cyan]Peak browser memory {stats['peak_rss_mb']:.0f} MB, "
+            f"JS heap {stats['peak_js_heap_mb']:.0f} MB{recycles}.[/cyan]"
+        )
+
+    def heal_profiles(self, profiles: List[str], workers: Optional[int] = None) -> bool:
+        if not self._db_conn.check_settings_exist():
+            self._console.print(
+                f"[red]No settings found. Run 'algohealer {self.site}' once to set them up.[/red]"
+            )
+            return False
+        if len(self._db_conn.get_all_accounts_for_site(self.site)) == 0:
+            self._console.print(
+                f"[red]No accounts found for {self.site}. Please add an account first.[/red]"
+            )
+            return False
+        if not profiles:
+            profiles = [self._db_conn.get_settings().user_data_dir]
+
+        self._console.print(
+            f"[blue]Healing {self.site} algorithm across {len(profiles)} profile(s)...[/blue]"
+        )
+        results = heal_profiles(self.site, profiles, workers=workers)
+
+        table = Table()
+        table.add_column("Profile", justify="left", style="cyan")
+        table.add_column("Status", justify="left")
+        table.add_column("Duration", justify="right")
+        table.add_column("Blocked", justify="right")
+        table.add_column("Saved (est.)", justify="right")
+        table.add_column("Peak memory", justify="right")
+        table.add_column("Error", justify="left", style="red")
+        for result in results:
+            color = "green" if result.status == "healed" else "red"
+            table.add_row(
+                result.profile,
+                f"[{color}]{result.status}[/{color}]",
+                f"{result.seconds:.1f}s",
+                str(result.requests_blocked + result.requests_stubbed),
+                f"{result.estimated_bytes_saved / 1_000_000:.1f} MB",
+                f"{result.peak_rss_mb:.0f} MB",
+                result.error or "",
+            )
+        self._console.print(table)
+        return all(result.status == "healed" for result in results)
+
     def _update_settings(self):
         settings: Settings = self._db_conn.get_settings()
 
@@ -165,6 +298,17 @@ class DataManager:
             == "yes"
         )
 
+        settings.block_resources = (
+            questionary.select(
+                "Block images, videos and trackers to save bandwidth (recommend yes):",
+                choices=["yes", "no"],
+                default="yes" if settings.block_resources else "no",
+                use_arrow_keys=True,
+                style=custom_style,
+            ).ask()
+            == "yes"
+        )
+
         settings.channel = questionary.select(
             "Select your default browser (recommend chrome):",
             choices=["chrome", "chromium"],
@@ -178,6 +322,108 @@ class DataManager:
             default=settings.user_data_dir,
             style=custom_style,
         ).ask()
+        settings.prefetch = (
+            questionary.select(
+                "Load the next account in a second tab while the current one is healed?",
+                choices=["yes", "no"],
+                default="yes" if settings.prefetch else "no",
+                use_arrow_keys=True,
+                style=custom_style,
+            ).ask()
+            == "yes"
+        )
+        settings.concurrency = int(
+            questionary.text(
+                "Number of accounts to heal in parallel (browser tabs):",
+                default=str(settings.concurrency),
+                validate=lambda value: value.isdigit() and int(value) > 0,
+                style=custom_style,
+            ).ask()
+        )
+        settings.actions_per_minute = float(
+            questionary.text(
+                "Maximum actions per minute (0 disables pacing):",
+                default=str(settings.actions_per_minute),
+                validate=lambda value: value.replace(".", "", 1).isdigit(),
+                style=custom_style,
+            ).ask()
+        )
+        settings.memory_limit_mb = float(
+            questionary.text(
+                "Recycle the browser when it uses more than this many MB (0 disables):",
+                default=str(settings.memory_limit_mb),
+                validate=lambda value: value.replace(".", "", 1).isdigit(),
+                style=custom_style,
+            ).ask()
+        )
+        settings.revisit_ttl_hours = float(
+            questionary.text(
+                "Hours before an account is revisited (0 revisits every run):",
+                default=str(settings.revisit_ttl_hours),
+                validate=lambda value: value.replace(".", "", 1).isdigit(),
+                style=custom_style,
+            ).ask()
+        )
+        settings.session_accounts = int(
+            questionary.text(
+                "Accounts to visit per session (0 visits every due account):",
+                default=str(settings.session_accounts),
+                validate=lambda value: value.isdigit(),
+                style=custom_style,
+            ).ask()
+        )
+        settings.session_minutes = float(
+            questionary.text(
+                "Stop a session after this many minutes (0 for no limit):",
+                default=str(settings.session_minutes),
+                validate=lambda value: value.replace(".", "", 1).isdigit(),
+                style=custom_style,
+            ).ask()
+        )
+        if settings.session_accounts or settings.session_minutes:
+            settings.interest_weights = parse_weights(
+                questionary.text(
+                    "Interest weights, e.g. travel=2, food=0.5 (unlisted interests weigh 1):",
+                    default=", ".join(
+                        f"{category}={weight:g}"
+                        for category, weight in settings.interest_weights.items()
+                    ),
+                    validate=_valid_weights,
+                    style=custom_style,
+                ).ask()
+            )
+        settings.assess_feed = (
+            questionary.select(
+                "Measure how well the home and explore feeds match your interests?",
+                choices=["yes", "no"],
+                default="yes" if settings.assess_feed else "no",
+                use_arrow_keys=True,
+                style=custom_style,
+            ).ask()
+            == "yes"
+        )
+        if settings.assess_feed:
+            settings.feed_likes = int(
+                questionary.text(
+                    "Matching feed posts to like per feed (0 only measures):",
+                    default=str(settings.feed_likes),
+                    validate=lambda value: value.isdigit(),
+                    style=custom_style,
+                ).ask()
+            )
+        settings.trace_dir = questionary.text(
+            "Directory for session traces (leave empty to disable):",
+            default=settings.trace_dir,
+            style=custom_style,
+        ).ask()
+        settings.metrics_port = int(
+            questionary.text(
+                "Port for a local metrics endpoint while healing (0 disables):",
+                default=str(settings.metrics_port),
+                validate=lambda value: value.isdigit() and int(value) < 65536,
+                style=custom_style,
+            ).ask()
+        )
         self._db_conn.upsert_settings(settings)
         self._console.print("[green]Settings updated successfully![/green]\n")
 
@@ -0,0 +1,343 @@
+import asyncio
+import os
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+
+from playwright._impl._errors import TargetClosedError
+from playwright.async_api import BrowserContext, CDPSession, Page, async_playwright
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from algohealer.db.conn import SQLiteManager
+from algohealer.navigators.base.batch import (
+    BATCH_SCRIPT,
+    BatchResult,
+    BatchStep,
+)
+from algohealer.navigators.base.core import NavigatorCore
+from algohealer.navigators.base.memory import (
+    MemorySample,
+    browser_rss,
+    heap_from_metrics,
+)
+from algohealer.navigators.base.readiness import (
+    ANY_VISIBLE_SCRIPT,
+    DOM_QUIET_MS_SCRIPT,
+    MUTATION_TRACKER_SCRIPT,
+)
+from algohealer.navigators.base.resilience import (
+    backoff_delay,
+    is_page_gone,
+    is_transient,
+)
+from algohealer.navigators.base.tracing import traced
+from algohealer.navigators.spec import Plan, PlanStep
+
+
+class AsyncSocialMediaNavigator(NavigatorCore):
+    def __init__(
+        self,
+        user_data_dir: str,
+        channel: str,
+        nav_name: str,
+        url_base: str,
+        db_conn: SQLiteManager,
+        headless: bool = True,
+        args: List[str] = [],
+        concurrency: int = 1,
+        **kwargs,
+    ):
+        super().__init__(nav_name, url_base, db_conn, **kwargs)
+        self._cdp_sessions: Dict[int, CDPSession] = {}
+        self._user_data_dir = user_data_dir
+        self._channel = channel
+        self._headless = headless
+        self._args = args
+        self._concurrency = max(1, concurrency)
+        self._playwright = None
+        self._browser = None
+        self._shared = False
+        self._pages: List[Page] = []
+
+    async def start(self):
+        self._playwright = await async_playwright().start()
+        try:
+            self._browser = await self._playwright.chromium.launch_persistent_context(
+                user_data_dir=self._user_data_dir,
+                channel=self._channel,
+                args=self._args,
+                headless=self._headless,
+                **(
+                    {"record_har_path": self._har_path}
+                    if self._har_mode == "record"
+                    else {}
+                ),
+            )
+        except TargetClosedError:
+            await self._playwright.stop()
+            raise TargetClosedError
+        try:
+            if self._har_mode == "replay":
+                # Anything the recording does not have fails instead of
+                # reaching the network
+                await self._browser.route_from_har(self._har_path, not_found="abort")
+            await self._blocker.install_async(self._browser)
+            await self._browser.add_init_script(MUTATION_TRACKER_SCRIPT)
+            await self._open_tabs(self._browser)
+        except BaseException:
+            # A browser left running would keep the profile locked
+            await self.stop()
+            raise
+
+    async def attach(self, context: BrowserContext):
+        # Joins a context owned by a MultiSiteSession. The other sites' tabs
+        # live in it too, so requests are blocked per tab and stop() leaves
+        # the browser running.
+        self._shared = True
+        await self._open_tabs(context)
+
+    async def _open_tabs(self, context: BrowserContext):
+        self._browser = context
+        # With prefetch, one extra tab loads the next account while every
+        # walking tab is busy
+        tabs = self._concurrency + (1 if self._prefetch else 0)
+        self._pages = [await self._new_page() for _ in range(tabs)]
+        await self.load(self._pages[0], self._url_base)
+
+    async def _new_page(self) -> Page:
+        page = await self._browser.new_page()
+        if self._shared:
+            await self._blocker.install_async(page)
+        self._network.attach(page)
+        return page
+
+    async def stop(self):
+        if self._shared:
+            for page in self._pages:
+                try:
+                    await page.close()
+                except PlaywrightError:
+                    pass
+            return
+        await self._browser.close()
+        await self._playwright.stop()
+
+    async def run(self):
+        raise NotImplementedError
+
+    async def _session(self):
+        await self.start()
+        try:
+            await self.run()
+        finally:
+            await self.stop()
+
+    def run_until_complete(self):
+        asyncio.run(self._session())
+
+    @traced()
+    async def load(self, page: Page, url: str):
+        for attempt in range(self._navigation_retries + 1):
+            try:
+                self._network.reset(page)
+                await page.goto(url, wait_until="domcontentloaded")
+                return
+            except PlaywrightError as e:
+                # A closed or crashed page is swapped by its owner, see reopen_page()
+                if (
+                    attempt == self._navigation_retries
+                    or is_page_gone(e)
+                    or not is_transient(e)
+                ):
+                    raise
+            await asyncio.sleep(backoff_delay(attempt))
+
+    async def reopen_page(self, page: Page) -> Page:
+        # Replaces a crashed or closed tab with a new one in the same context,
+        # so cookies and the login survive. Raises if the browser itself is gone.
+        replacement = await self._new_page()
+        self._network.detach(page)
+        self._pages[self._pages.index(page)] = replacement
+        self._cdp_sessions.pop(id(page), None)
+        return replacement
+
+    async def sample_memory(self, page: Page) -> MemorySample:
+        try:
+            session = self._cdp_sessions.get(id(page))
+            if session is None:
+                session = await self._browser.new_cdp_session(page)
+                await session.send("Performance.enable")
+                self._cdp_sessions[id(page)] = session
+            metrics = await session.send("Performance.getMetrics")
+            sample = heap_from_metrics(metrics["metrics"])
+        except PlaywrightError:
+            self._cdp_sessions.pop(id(page), None)
+            sample = MemorySample(None, None, None)
+        # Reading /proc is blocking file IO, keep it off the event loop
+        rss = await asyncio.to_thread(browser_rss, self._user_data_dir)
+        return sample._replace(rss_bytes=rss)
+
+    @traced()
+    async def check_memory(self, page: Page) -> Page:
+        # Called before a tab takes its next account. Tabs share one browser,
+        # so past a limit the tab is replaced by a fresh one (and its renderer
+        # with it); contexts are not restarted while other tabs are busy.
+        if not self._watchdog.observe(await self.sample_memory(page)):
+            return page
+        replacement = await self.reopen_page(page)
+        await page.close()
+        self._watchdog.page_recycles += 1
+        return replacement
+
+    async def load_subpage(self, page: Page, subpage: str):
+        await self.load(page, os.path.join(self._url_base, subpage))
+
+    @traced()
+    async def click(self, page: Page, selector: str, timeout: Optional[int] = None):
+        await page.click(selector, timeout=timeout)
+
+    @traced()
+    async def fill(
+        self, page: Page, selector: str, text: str, timeout: Optional[int] = None
+    ):
+        await page.fill(selector, text, timeout=timeout)
+
+    async def probe(self, page: Page, *selectors: str) -> List[bool]:
+        steps = self._probe_batch(selectors)
+        if steps is not None:
+            return [result.ok for result in await self.batch(page, steps)]
+        # Playwright-only selectors need its selector engine, one call each
+        return [
+            await page.eval_on_selector_all(selector, ANY_VISIBLE_SCRIPT)
+            for selector in selectors
+        ]
+
+    async def is_settled(self, page: Page) -> bool:
+        if self._network.in_flight(page) > 0:
+            return False
+        return await page.evaluate(DOM_QUIET_MS_SCRIPT) >= self._settle_ms
+
+    @traced()
+    async def wait(self, page: Page, selector: str, timeout: int = 1000) -> bool:
+        if (await self.probe(page, selector))[0]:
+            return True
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            remaining = int((deadline - time.monotonic()) * 1000)
+            if remaining <= 0:
+                return False
+            try:
+                await page.wait_for_selector(
+                    selector, timeout=min(self._settle_ms, remaining)
+                )
+                return True
+            except PlaywrightTimeoutError:
+                pass
+            # Nothing is loading or rendering anymore, so the element is not coming
+            if await self.is_settled(page):
+                return False
+
+    @traced()
+    async def wait_check_click(
+        self, page: Page, selector: str, timeout: int = 1000
+    ) -> bool:
+        if not await self.wait(page, selector=selector, timeout=timeout):
+            return False
+        try:
+            # Through Playwright, so the click is a trusted event on an element
+            # that is visible, stable and not covered
+            await self.click(page, selector=selector, timeout=timeout)
+        except PlaywrightTimeoutError:
+            return False
+        return True
+
+    @traced()
+    async def wait_then_fill(
+        self, page: Page, selector: str, text: str, timeout: int = 10000
+    ) -> bool:
+        if not await self.wait(page, selector=selector, timeout=timeout):
+            return False
+        try:
+            await self.fill(page, selector=selector, text=text, timeout=timeout)
+        except PlaywrightTimeoutError:
+            return False
+        return True
+
+    @traced()
+    async def batch(self, page: Page, steps: Sequence[BatchStep]) -> List[BatchResult]:
+        raw = await page.evaluate(BATCH_SCRIPT, [step._asdict() for step in steps])
+        results = [BatchResult(*result) for result in raw]
+        return results + [BatchResult(False)] * (len(steps) - len(results))
+
+    async def _run_step(
+        self, page: Page, step: PlanStep, params: Dict[str, str]
+    ) -> bool:
+        candidates = self._allowed_candidates(step)
+        visible = []
+        if len(candidates) > 1:
+            # One look for all of them, so a fallback that is already there
+            # does not wait out the primary's timeout
+            visible = await self.probe(
+                page, *(candidate.resolve(params)[0] for candidate in candidates)
+            )
+        for candidate in self._step_attempts(step, candidates, visible):
+            ok = await self._run_candidate(page, candidate, params)
+            self._candidate_finished(step, candidate, ok)
+            if ok:
+                return True
+        return False
+
+    async def _run_candidate(
+        self, page: Page, step: PlanStep, params: Dict[str, str]
+    ) -> bool:
+        selector, text = step.resolve(params)
+        if step.action == "click":
+            return await self.wait_check_click(page, selector, timeout=step.timeout)
+        if step.action == "fill":
+            return await self.wait_then_fill(page, selector, text, timeout=step.timeout)
+        return await self.wait(page, selector, timeout=step.timeout)
+
+    async def run_plan(self, page: Page, plan: Plan, **params: str) -> bool:
+        for step in plan.steps:
+            if not await self._run_step(page, step, params) and not step.optional:
+                return False
+        return True
+
+    @traced()
+    async def run_flow(self, page: Page, flow: str, **params: str) -> bool:
+        post_id = self.current_post_id(page)
+        start = time.perf_counter()
+        try:
+            ok = await self.run_plan(page, self.plans[flow], **params)
+        except PlaywrightError:
+            # Includes a closed tab, which the account loader replaces before
+            # the page is used again
+            ok = False
+        self.log_action(flow, ok, time.perf_counter() - start, post_id)
+        return ok
+
+    def current_post_id(self, page: Page) -> Optional[str]:
+        return None
+
+    @traced()
+    async def _scroll(self, page: Page, direction: str, pixels: int = 500):
+        await self.batch(page, [self._scroll_step(direction, pixels)])
+
+    async def scroll_up(self, page: Page, pixels: int = 500):
+        await self._scroll(page, direction="up", pixels=pixels)
+
+    async def scroll_down(self, page: Page, pixels: int = 500):
+        await self._scroll(page, direction="down", pixels=pixels)
+
+    @staticmethod
+    async def sleep(seconds: int):
+        await asyncio.sleep(seconds)
+
+    @staticmethod
+    async def random_sleep(min: int, max: int):
+        await asyncio.sleep(random.uniform(min, max))
+
+    @traced()
+    async def pace(self):
+        await self._pacing.athrottle()
@@ -0,0 +1,204 @@
+import asyncio
+import functools
+import time
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from algohealer.classifier import (
+    Classification,
+    FeedPost,
+)
+from algohealer.navigators.base.async_social_media_navigator import (
+    AsyncSocialMediaNavigator,
+)
+from algohealer.navigators.base.core import SpecNavigatorCore
+from algohealer.navigators.base.feed import EXTRACT_FEED_SCRIPT
+from algohealer.navigators.base.pipeline import (
+    AccountDone,
+    AccountTask,
+    CrawlSink,
+    LoadedAccount,
+    Pipeline,
+    PostResult,
+    PostVisit,
+)
+from algohealer.navigators.base.resilience import is_page_gone
+from algohealer.navigators.base.tracing import bind_account, traced
+from algohealer.navigators.spec import FeedSurface, SiteSpec, apply_spec
+
+
+class AsyncSpecNavigator(SpecNavigatorCore, AsyncSocialMediaNavigator):
+    async def next_content(self, page: Page) -> bool:
+        return await self.run_flow(page, "next_content")
+
+    async def open_first_post(self, page: Page) -> bool:
+        return await self.run_flow(page, "open_first_post")
+
+    def current_post_id(self, page: Page) -> Optional[str]:
+        return self.post_id_from_url(page.url)
+
+    async def wait_for_post(
+        self, page: Page, previous: Optional[str] = None, timeout: int = 1000
+    ) -> Optional[str]:
+        try:
+            await page.wait_for_url(
+                lambda url: self.post_id_from_url(url) not in (None, previous),
+                timeout=timeout,
+            )
+        except PlaywrightTimeoutError:
+            pass
+        return self.current_post_id(page)
+
+    async def next_post(
+        self, page: Page, previous: Optional[str]
+    ) -> Tuple[bool, Optional[str]]:
+        if not await self.next_content(page):
+            return False, None
+        if previous:
+            return True, await self.wait_for_post(page, previous=previous)
+        return True, self.current_post_id(page)
+
+    async def account_source(self) -> AsyncIterator[AccountTask]:
+        for task in self.budgeted_accounts():
+            yield task
+
+    async def load_account(self, task: AccountTask) -> AsyncIterator[LoadedAccount]:
+        page = await self._free_pages.get()
+        started = time.perf_counter()
+        if not page.is_closed():
+            page = await self.check_memory(page)
+        opened = False
+        with bind_account(task.account):
+            # A profile that keeps failing to load is skipped, not the whole run
+            for _ in range(2):
+                try:
+                    if page.is_closed():
+                        page = await self.reopen_page(page)
+                    await self.load_subpage(page, self.profile_subpage(task.account))
+                    opened = await self.open_first_post(page)
+                    break
+                except PlaywrightError as e:
+                    if not is_page_gone(e):
+                        break
+                    page = await self.reopen_page(page)
+        yield LoadedAccount(task, page, opened, started)
+
+    async def iterate_posts(
+        self, loaded: LoadedAccount, max_posts: int
+    ) -> AsyncIterator[Union[PostVisit, AccountDone]]:
+        account, page = loaded.task.account, loaded.page
+        visited = 0
+        outcome = "ok"
+        self.events.emit("account_started", site=self._nav_name, account=account)
+        with bind_account(account):
+            seen = self._seen_posts(loaded.task)
+            try:
+                post_id = await self.wait_for_post(page) if loaded.opened else None
+                for position in range(max_posts + 1) if loaded.opened else ():
+                    if self._walk_over(post_id, position, seen):
+                        break
+                    if post_id and post_id not in seen:
+                        done = asyncio.Event()
+                        yield PostVisit(account, post_id, position, page, done)
+                        # The page must stay on this post until its actions ran
+                        await done.wait()
+                        visited += 1
+                    if position == max_posts or self.stopping:
+                        break
+                    await self.pace()
+                    moved, post_id = await self.next_post(page, post_id)
+                    if not moved:
+                        break
+            except PlaywrightError:
+                # Keep what was visited so far and move on to the next account
+                outcome = "error"
+        self._free_pages.put_nowait(page)
+        self._account_finished(loaded, visited, outcome)
+        yield AccountDone(account, visited, loaded.started)
+
+    async def execute_post(
+        self, item: Union[PostVisit, AccountDone]
+    ) -> AsyncIterator[Union[PostResult, AccountDone]]:
+        if isinstance(item, AccountDone):
+            yield item
+            return
+        with bind_account(item.account):
+            actions = []
+            for flow in self.post_actions:
+                actions.append((flow, await self.run_flow(item.page, flow)))
+        self._post_visited(item)
+        yield PostResult(item.account, item.post_id, tuple(actions))
+        # Only after the result is queued, so it reaches the sink before the
+        # account's AccountDone does
+        item.done.set()
+
+    async def like_new_posts(self, max_posts: Optional[int] = None):
+        max_posts = self.spec.max_posts if max_posts is None else max_posts
+        self._free_pages = asyncio.Queue()
+        for page in self._pages:
+            self._free_pages.put_nowait(page)
+        workers = self._concurrency
+        sink = CrawlSink(self.record_crawl)
+
+        async def add(item):
+            sink.add(item)
+
+        try:
+            await (
+                Pipeline(self.account_source())
+                .pipe(self.load_account, len(self._pages))
+                .pipe(
+                    functools.partial(self.iterate_posts, max_posts=max_posts), workers
+                )
+                .pipe(self.execute_post, workers)
+                .run(add)
+            )
+        finally:
+            sink.flush()
+
+    async def extract_feed(self, page: Page, surface: FeedSurface) -> List[FeedPost]:
+        return self._feed_posts(
+            await page.evaluate(EXTRACT_FEED_SCRIPT, surface.model_dump())
+        )
+
+    @traced()
+    async def assess_feed(self, page: Page, surface_name: str) -> List[Classification]:
+        surface = self.spec.feeds[surface_name]
+        await self.load_subpage(page, surface.path)
+        posts = []
+        if await self.wait(page, surface.item, timeout=5000):
+            posts = await self.extract_feed(page, surface)
+        return self._record_feed(surface_name, posts)
+
+    async def engage_feed(self, page: Page, results: List[Classification]) -> int:
+        liked = 0
+        for result in self._engage_candidates(results):
+            if liked >= self._feed_likes or self.stopping:
+                break
+            await self.pace()
+            await self.load(page, result.post.url)
+            if await self.run_flow(page, "like_content"):
+                liked += 1
+        return liked
+
+    async def heal_feeds(self, page: Page):
+        for surface_name in self.spec.feeds:
+            if self.stopping:
+                break
+            results = await self.assess_feed(page, surface_name)
+            if self._feed_likes and "like_content" in self.plans:
+                await self.engage_feed(page, results)
+
+    async def run(self):
+        await self.like_new_posts()
+        self._watchdog.observe(await self.sample_memory(self._pages[0]))
+        if self._assess_feed and not self.stopping:
+            await self.heal_feeds(self._pages[0])
+
+
+def navigator_for_spec(spec: SiteSpec) -> type:
+    name = f"Async{spec.name.title().replace('-', '').replace('_', '')}Navigator"
+    return apply_spec(spec)(type(name, (AsyncSpecNavigator,), {}))
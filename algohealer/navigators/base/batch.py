@@ -0,0 +1,102 @@
+import re
+from typing import NamedTuple, Optional, Tuple
+
+# Selectors the in-page script can resolve on its own: plain CSS with at most
+# one trailing Playwright `:has-text("...")` filter.
+HAS_TEXT = re.compile(r'^(?P<css>.*?):has-text\("(?P<text>[^"]*)"\)$')
+PLAYWRIGHT_ONLY = re.compile(
+    r">>|^\w+=|:has-text|:text|:visible|:nth-match|:right-of|:left-of|:above|:below|:near"
+)
+
+
+def split_selector(selector: str) -> Optional[Tuple[str, Optional[str]]]:
+    match = HAS_TEXT.match(selector)
+    css, text = (match.group("css"), match.group("text")) if match else (selector, None)
+    if not css or PLAYWRIGHT_ONLY.search(css):
+        return None
+    return css, text
+
+
+def can_batch(selector: str) -> bool:
+    return split_selector(selector) is not None
+
+
+class BatchStep(NamedTuple):
+    # wait | scroll
+    action: str
+    css: Optional[str] = None
+    has_text: Optional[str] = None
+    pixels: int = 0
+    timeout: int = 0
+    optional: bool = False
+
+    @classmethod
+    def _on(cls, action: str, selector: str, **kwargs) -> "BatchStep":
+        parts = split_selector(selector)
+        if parts is None:
+            raise ValueError(f"Selector '{selector}' cannot run in a batch")
+        return cls(action, css=parts[0], has_text=parts[1], **kwargs)
+
+    @classmethod
+    def wait(cls, selector: str, timeout: int = 1000, optional: bool = False):
+        return cls._on("wait", selector, timeout=timeout, optional=optional)
+
+    @classmethod
+    def scroll(cls, pixels: int):
+        return cls("scroll", pixels=pixels)
+
+
+class BatchResult(NamedTuple):
+    ok: bool
+
+
+# Runs a list of BatchStep dicts in the page in a single round-trip. Element
+# steps wait (polling) up to their timeout for the first visible match. It only
+# looks elements up: clicks and fills go through Playwright, so they are
+# trusted input that passes its actionability checks.
+# Execution stops at the first required step that fails; the result list is
+# then shorter than the step list.
+BATCH_SCRIPT = """
+async (steps) => {
+  const visible = element => element.checkVisibility
+    ? element.checkVisibility()
+    : element.getClientRects().length > 0;
+  const find = ({css, has_text}) => {
+    const needle = has_text && has_text.toLowerCase();
+    for (const element of document.querySelectorAll(css)) {
+      if (needle && !(element.textContent || "").toLowerCase().includes(needle)) {
+        continue;
+      }
+      if (visible(element)) {
+        return element;
+      }
+    }
+    return null;
+  };
+  const poll = async (check, timeout) => {
+    const deadline = performance.now() + timeout;
+    let value = check();
+    while (!value && performance.now() < deadline) {
+      await new Promise(resolve => setTimeout(resolve, 50));
+      value = check();
+    }
+    return value;
+  };
+
+  const results = [];
+  for (const step of steps) {
+    let ok = true;
+    if (step.action === "scroll") {
+      window.scrollBy(0, step.pixels);
+    } else {
+      const element = await poll(() => find(step), step.timeout);
+      ok = element !== null;
+    }
+    results.push([ok]);
+    if (!ok && !step.optional) {
+      break;
+    }
+  }
+  return results;
+}
+"""
@@ -0,0 +1,148 @@
+import atexit
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from playwright._impl._errors import TargetClosedError
+from playwright.sync_api import BrowserContext, Page, sync_playwright
+
+
+class PooledContext:
+    def __init__(self, key: Tuple, context: BrowserContext):
+        self.key = key
+        self.context = context
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.users = 0
+        self.initialized = False
+        self.retired = False
+        self._idle_pages: List[Page] = []
+        self._closed = False
+        context.on("close", lambda _: setattr(self, "_closed", True))
+
+    def take_page(self) -> Page:
+        while self._idle_pages:
+            page = self._idle_pages.pop()
+            if not page.is_closed():
+                return page
+        return self.context.new_page()
+
+    def return_page(self, page: Page):
+        if not page.is_closed():
+            self._idle_pages.append(page)
+
+    def retire(self):
+        # Closed once its last user releases it, instead of going back to idle
+        self.retired = True
+
+    def healthy(self) -> bool:
+        if self._closed:
+            return False
+        try:
+            # Any round-trip fails fast once the browser process is gone
+            self.context.cookies()
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        try:
+            self.context.close()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    def __init__(self, idle_timeout: float = 300, max_lifetime: float = 3600):
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self._playwright = None
+        self._entries: Dict[Tuple, PooledContext] = {}
+
+    def _expired(self, entry: PooledContext, now: float) -> bool:
+        return (
+            entry.retired
+            or now - entry.last_used > self.idle_timeout
+            or now - entry.created_at > self.max_lifetime
+        )
+
+    def evict(self, force: bool = False):
+        now = time.monotonic()
+        for key, entry in list(self._entries.items()):
+            if entry.users == 0 and (force or self._expired(entry, now)):
+                entry.close()
+                del self._entries[key]
+        if not self._entries and self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def acquire(
+        self,
+        user_data_dir: str,
+        channel: str,
+        headless: bool = True,
+        args: List[str] = [],
+        **launch_options,
+    ) -> PooledContext:
+        self.evict()
+        key = (user_data_dir, channel, headless, tuple(args))
+        entry = self._entries.get(key)
+        if (
+            entry is not None
+            and entry.users == 0
+            and (entry.retired or not entry.healthy())
+        ):
+            entry.close()
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            try:
+                context = self._playwright.chromium.launch_persistent_context(
+                    user_data_dir=user_data_dir,
+                    channel=channel,
+                    args=args,
+                    headless=headless,
+                    **launch_options,
+                )
+            except TargetClosedError:
+                self.evict()
+                raise TargetClosedError
+            entry = PooledContext(key, context)
+            self._entries[key] = entry
+
+        entry.users += 1
+        entry.last_used = time.monotonic()
+        return entry
+
+    def release(self, entry: PooledContext, page: Optional[Page] = None):
+        entry.users = max(0, entry.users - 1)
+        entry.last_used = time.monotonic()
+        if page is not None:
+            entry.return_page(page)
+        self.evict()
+
+    def close(self):
+        for entry in self._entries.values():
+            entry.users = 0
+        self.evict(force=True)
+
+
+_local = threading.local()
+
+
+def get_browser_pool(
+    idle_timeout: Optional[float] = None, max_lifetime: Optional[float] = None
+) -> BrowserPool:
+    # Sync Playwright objects are bound to the thread that created them
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = BrowserPool()
+        atexit.register(pool.close)
+    if idle_timeout is not None:
+        pool.idle_timeout = idle_timeout
+    if max_lifetime is not None:
+        pool.max_lifetime = max_lifetime
+    return pool
@@ -0,0 +1,357 @@
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from algohealer.classifier import (
+    Classification,
+    FeedHealth,
+    FeedPost,
+    default_classifier,
+    feed_health,
+)
+from algohealer.db.conn import SQLiteManager
+from algohealer.db.enums import Category
+from algohealer.db.ledger import ActionLedger
+from algohealer.navigators.base.batch import BatchStep, can_batch
+from algohealer.navigators.base.events import EventHooks
+from algohealer.navigators.base.interceptor import ResourceBlocker
+from algohealer.navigators.base.memory import MemoryWatchdog
+from algohealer.navigators.base.pacing import PacingScheduler
+from algohealer.navigators.base.pipeline import AccountTask, LoadedAccount, PostVisit
+from algohealer.navigators.base.readiness import NetworkTracker
+from algohealer.navigators.base.resilience import SelectorBreaker
+from algohealer.navigators.base.tracing import SessionTracer, current_account
+from algohealer.navigators.spec import Plan, PlanStep, SpecSite
+from algohealer.sampler import WeightedSampler
+
+
+class NavigatorCore:
+    # Everything a navigator does besides driving the browser. The sync and
+    # async engines build on this and only add the Playwright calls.
+    blocked_resource_types: List[str] = []
+    blocked_url_patterns: List[str] = []
+    stubbed_url_patterns: List[str] = []
+    plans: Dict[str, Plan] = {}
+    # Flows run on every visited post; the engagement that sampling rewards
+    post_actions: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        nav_name: str,
+        url_base: str,
+        db_conn: SQLiteManager,
+        actions_per_minute: float = 40,
+        jitter: float = 0.5,
+        settle_ms: int = 250,
+        block_resources: bool = True,
+        revisit_ttl_hours: float = 0,
+        batch_actions: bool = True,
+        interests: Sequence[str] = (),
+        assess_feed: bool = False,
+        feed_likes: int = 0,
+        prefetch: bool = False,
+        ledger: Optional[ActionLedger] = None,
+        selector_miss_limit: int = 5,
+        navigation_retries: int = 2,
+        memory_limit_mb: float = 0,
+        js_heap_limit_mb: float = 0,
+        session_accounts: int = 0,
+        session_minutes: float = 0,
+        session_actions: int = 0,
+        interest_weights: Optional[Dict[str, float]] = None,
+        pacing: Optional[PacingScheduler] = None,
+        har_mode: str = "",
+        har_path: str = "",
+        stop_event: Optional[threading.Event] = None,
+    ):
+        self._nav_name = nav_name
+        self._url_base = self._clean_base_url(url_base)
+        self._db_conn = db_conn
+        self._revisit_ttl = revisit_ttl_hours * 3600
+        self._stop_event = stop_event or threading.Event()
+        self.tracer = SessionTracer()
+        self.events = EventHooks()
+        self._blocker = (
+            ResourceBlocker(
+                resource_types=self.blocked_resource_types,
+                url_patterns=self.blocked_url_patterns,
+                stub_patterns=self.stubbed_url_patterns,
+            )
+            if block_resources
+            else ResourceBlocker()
+        )
+        self._har_mode = har_mode
+        self._har_path = har_path
+        if har_mode == "replay":
+            # Replayed responses need no pacing; run as fast as the CPU allows
+            actions_per_minute, jitter = 0, 0
+        self._pacing = pacing or PacingScheduler(
+            actions_per_minute=actions_per_minute, jitter=jitter
+        )
+        self._settle_ms = settle_ms
+        self._batch_actions = batch_actions
+        self._interests = list(interests)
+        self._interest_weights = interest_weights or {}
+        self._session_accounts = session_accounts
+        self._session_seconds = session_minutes * 60
+        self._session_actions = session_actions
+        self._session_started = time.monotonic()
+        self._actions_taken = 0
+        self._assess_feed = assess_feed
+        self._feed_likes = feed_likes
+        self._prefetch = prefetch
+        self._ledger = ledger
+        self._breaker = SelectorBreaker(threshold=selector_miss_limit)
+        self._navigation_retries = navigation_retries
+        self._watchdog = MemoryWatchdog(
+            rss_limit_mb=memory_limit_mb, js_heap_limit_mb=js_heap_limit_mb
+        )
+        self._network = NetworkTracker()
+
+    @staticmethod
+    def _clean_base_url(url: str):
+        if url[-1] == "/":
+            url = url[:-1]
+        return url
+
+    def memory_stats(self) -> Dict[str, float]:
+        return self._watchdog.stats()
+
+    def _batching(self, *selectors: str) -> bool:
+        return self._batch_actions and all(map(can_batch, selectors))
+
+    def _allowed_candidates(self, step: PlanStep) -> List[PlanStep]:
+        return [
+            candidate
+            for candidate in step.candidates
+            if self._breaker.allow((step.key, candidate.selector))
+        ]
+
+    def _step_attempts(
+        self, step: PlanStep, candidates: List[PlanStep], visible: Sequence[bool]
+    ) -> Iterator[PlanStep]:
+        # Primary selector first, then the fallbacks. When a probe already saw
+        # one of them on the page, the ones ahead of it count as misses and are
+        # not waited for. Only the first one tried waits the full timeout: by
+        # the time it gives up the page has settled, so the others just need
+        # a quick look.
+        first = list(visible).index(True) if any(visible) else 0
+        for candidate in candidates[:first]:
+            self._candidate_finished(step, candidate, False)
+        timeout = step.timeout
+        for candidate in candidates[first:]:
+            yield candidate._replace(timeout=timeout)
+            timeout = min(step.timeout, self._settle_ms)
+
+    def _probe_batch(self, selectors: Sequence[str]) -> Optional[List[BatchStep]]:
+        # Plain CSS selectors are all looked up in one evaluate
+        if not self._batching(*selectors):
+            return None
+        return [
+            BatchStep.wait(selector, timeout=0, optional=True) for selector in selectors
+        ]
+
+    def _candidate_finished(self, step: PlanStep, candidate: PlanStep, ok: bool):
+        key = (step.key, candidate.selector)
+        if ok:
+            self._breaker.success(key)
+        elif not step.optional:
+            self._breaker.failure(key)
+
+    def broken_selectors(self) -> List[str]:
+        return [f"{step} {selector}" for step, selector in self._breaker.open_keys()]
+
+    def log_action(
+        self, action: str, ok: bool, duration: float, post_id: Optional[str] = None
+    ):
+        self._actions_taken += 1
+        self.events.emit(
+            "action",
+            site=self._nav_name,
+            account=current_account.get(),
+            action=action,
+            ok=ok,
+            duration=duration,
+            post_id=post_id,
+        )
+        if self._ledger is not None:
+            self._ledger.record(
+                site=self._nav_name,
+                session=self.tracer.session_id,
+                action=action,
+                outcome=ok,
+                latency_ms=duration * 1000,
+                account=current_account.get(),
+                post_id=post_id,
+            )
+
+    @staticmethod
+    def _scroll_step(direction: str, pixels: int) -> BatchStep:
+        if direction not in ["up", "down"]:
+            raise ValueError("Scroll direction must be either 'up' or 'down'")
+        return BatchStep.scroll(-pixels if direction == "up" else pixels)
+
+    def network_stats(self) -> Dict[str, int]:
+        return self._blocker.stats()
+
+    def request_stop(self):
+        self._stop_event.set()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop_event.is_set()
+
+    def get_crawl_states(self) -> Dict[str, dict]:
+        return self._db_conn.get_crawl_states(self._nav_name)
+
+    def is_due(self, state: Optional[dict]) -> bool:
+        if not state or self._revisit_ttl <= 0:
+            return True
+        return time.time() - state["last_visited_at"] >= self._revisit_ttl
+
+    @property
+    def sampling(self) -> bool:
+        return bool(
+            self._session_accounts or self._session_seconds or self._session_actions
+        )
+
+    def budget_spent(self) -> bool:
+        if (
+            self._session_seconds
+            and time.monotonic() - self._session_started >= self._session_seconds
+        ):
+            return True
+        return bool(
+            self._session_actions and self._actions_taken >= self._session_actions
+        )
+
+    def planned_accounts(self) -> int:
+        # How many accounts session_accounts() offers, for progress and ETAs
+        states = self.get_crawl_states()
+        due = sum(
+            self.is_due(states.get(account)) for account in self.iter_account_names()
+        )
+        return min(due, self._session_accounts) if self._session_accounts else due
+
+    def session_accounts(self) -> Iterator[AccountTask]:
+        # Every due account in catalog order, or with a session budget a
+        # weighted sample in priority order, so whatever the budget cuts off
+        # is what mattered least
+        states = self.get_crawl_states()
+        if not self.sampling:
+            for account in self.iter_account_names():
+                state = states.get(account)
+                if self.is_due(state):
+                    yield AccountTask(account, state)
+            return
+        sampler = WeightedSampler(
+            interest_weights={
+                Category(interest).value: self._interest_weights.get(
+                    Category(interest).value, 1.0
+                )
+                for interest in self._interests
+            },
+            category_counts=self._db_conn.get_category_counts(self._nav_name),
+        )
+        candidates = (
+            candidate
+            for candidate in self._db_conn.iter_account_candidates(
+                self._nav_name, self.post_actions
+            )
+            if self.is_due(states.get(candidate.name))
+        )
+        for candidate in sampler.sample(candidates, k=self._session_accounts or None):
+            yield AccountTask(candidate.name, states.get(candidate.name))
+
+    def budgeted_accounts(self) -> Iterator[AccountTask]:
+        for task in self.session_accounts():
+            if self.stopping or self.budget_spent():
+                return
+            yield task
+
+    def record_crawl(self, account: str, post_ids: List[str]):
+        self._db_conn.record_crawl(self._nav_name, account, post_ids)
+
+    def iter_account_names(self) -> Iterator[str]:
+        return self._db_conn.iter_account_names(self._nav_name)
+
+    def get_current_account_names(self) -> List[str]:
+        accounts = self._db_conn.get_all_accounts_for_site(self._nav_name)
+        return [account["name"] for account in accounts]
+
+
+class SpecNavigatorCore(SpecSite):
+    # The engine-independent half of a spec driven navigator; mixed in ahead
+    # of an engine's NavigatorCore subclass
+    def __init__(self, *args, url_base: Optional[str] = None, **kwargs):
+        super().__init__(
+            nav_name=self.name,
+            url_base=url_base or self.url_base,
+            *args,
+            **kwargs,
+        )
+        self.feed_reports: List[FeedHealth] = []
+
+    def profile_subpage(self, account: str) -> str:
+        return self.spec.profile_path.format(account=account)
+
+    @staticmethod
+    def _seen_posts(task: AccountTask) -> Set[str]:
+        return set(task.state["seen_posts"]) if task.state else set()
+
+    def _walk_over(self, post_id: Optional[str], position: int, seen: Set[str]) -> bool:
+        # Pinned posts come first and may have been seen, so they do not end
+        # the walk
+        return post_id in seen and position >= self.pinned_posts
+
+    def _account_finished(self, loaded: LoadedAccount, visited: int, outcome: str):
+        account = loaded.task.account
+        self.tracer.record(
+            "account",
+            loaded.started,
+            time.perf_counter() - loaded.started,
+            account,
+            outcome,
+        )
+        self.events.emit(
+            "account_finished",
+            site=self._nav_name,
+            account=account,
+            posts=visited,
+            outcome=outcome,
+        )
+
+    def _post_visited(self, item: PostVisit):
+        self.events.emit(
+            "post", site=self._nav_name, account=item.account, post_id=item.post_id
+        )
+
+    def _feed_posts(self, rows: List[list]) -> List[FeedPost]:
+        return [
+            FeedPost(self.post_id_from_url(url), url, caption, alt_text)
+            for url, caption, alt_text in rows
+        ]
+
+    def _record_feed(
+        self, surface_name: str, posts: List[FeedPost]
+    ) -> List[Classification]:
+        results = default_classifier().classify(posts, self._interests)
+        health = feed_health(surface_name, results)
+        self.feed_reports.append(health)
+        self._db_conn.record_feed_health(
+            self._nav_name,
+            self.tracer.session_id,
+            surface_name,
+            health.posts,
+            health.aligned,
+            health.categories,
+        )
+        return results
+
+    @staticmethod
+    def _engage_candidates(results: List[Classification]) -> List[Classification]:
+        return sorted(
+            (result for result in results if result.engage),
+            key=lambda result: result.score,
+            reverse=True,
+        )
@@ -0,0 +1,27 @@
+from typing import Callable, Dict, List
+
+# Events a navigator emits, with the keyword arguments handlers receive:
+#   account_started   site, account
+#   account_finished  site, account, posts, outcome
+#   post              site, account, post_id
+#   action            site, account, action, ok, duration, post_id
+EVENTS = ("account_started", "account_finished", "post", "action")
+
+
+class EventHooks:
+    # Fed from the bookkeeping the navigator does anyway (spans and the
+    # action ledger), so listening costs no extra calls into the page.
+    # Handlers run inline on the navigator's thread and must be quick.
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable[..., None]]] = {}
+
+    def on(self, event: str, handler: Callable[..., None]):
+        if event not in EVENTS:
+            raise ValueError(
+                f"Unknown event '{event}'. Use one of {', '.join(EVENTS)}."
+            )
+        self._handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event: str, **data):
+        for handler in self._handlers.get(event, ()):
+            handler(**data)
@@ -0,0 +1,29 @@
+# Pulls every post on a feed-like page out of the DOM in one evaluate call.
+# Returns [url, caption, alt text] per distinct post link.
+EXTRACT_FEED_SCRIPT = """
+({item, link, caption, image, limit}) => {
+  const text = (root, css) => css
+    ? Array.from(root.querySelectorAll(css), node => node.textContent.trim())
+        .filter(Boolean).join(" ")
+    : "";
+  const seen = new Set();
+  const posts = [];
+  for (const element of document.querySelectorAll(item)) {
+    const anchor = link
+      ? (element.matches(link) ? element : element.querySelector(link))
+      : element.closest("a");
+    if (!anchor || !anchor.href || seen.has(anchor.href)) {
+      continue;
+    }
+    seen.add(anchor.href);
+    const alts = image
+      ? Array.from(element.querySelectorAll(image), img => img.alt).filter(Boolean)
+      : [];
+    posts.push([anchor.href, text(element, caption), alts.join(" ")]);
+    if (posts.length >= limit) {
+      break;
+    }
+  }
+  return posts;
+}
+"""
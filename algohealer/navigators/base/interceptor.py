@@ -0,0 +1,105 @@
+from fnmatch import fnmatch
+from typing import Dict, List, Optional
+
+# Rough transfer sizes used to estimate what a blocked request would have cost
+ESTIMATED_BYTES = {
+    "image": 150_000,
+    "media": 1_500_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 80_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+STUB_BODIES = {
+    "script": ("application/javascript", ""),
+    "stylesheet": ("text/css", ""),
+    "xhr": ("application/json", "{}"),
+    "fetch": ("application/json", "{}"),
+}
+
+
+class ResourceBlocker:
+    def __init__(
+        self,
+        resource_types: List[str] = [],
+        url_patterns: List[str] = [],
+        stub_patterns: List[str] = [],
+    ):
+        self._resource_types = set(resource_types)
+        self._url_patterns = list(url_patterns)
+        self._stub_patterns = list(stub_patterns)
+        self.requests_blocked = 0
+        self.requests_stubbed = 0
+        self.estimated_bytes_saved = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._resource_types or self._url_patterns or self._stub_patterns)
+
+    def decide(self, request) -> Optional[str]:
+        url = request.url
+        if any(fnmatch(url, pattern) for pattern in self._stub_patterns):
+            return "stub"
+        if request.resource_type in self._resource_types:
+            return "abort"
+        if any(fnmatch(url, pattern) for pattern in self._url_patterns):
+            return "abort"
+        return None
+
+    def _record(self, request, action: str):
+        if action == "stub":
+            self.requests_stubbed += 1
+        else:
+            self.requests_blocked += 1
+        self.estimated_bytes_saved += ESTIMATED_BYTES.get(
+            request.resource_type, DEFAULT_ESTIMATED_BYTES
+        )
+
+    @staticmethod
+    def _stub_response(request) -> dict:
+        content_type, body = STUB_BODIES.get(request.resource_type, ("text/plain", ""))
+        return {"status": 200, "content_type": content_type, "body": body}
+
+    def handle(self, route):
+        action = self.decide(route.request)
+        if action is None:
+            route.fallback()
+            return
+        self._record(route.request, action)
+        if action == "stub":
+            route.fulfill(**self._stub_response(route.request))
+        else:
+            route.abort("blockedbyclient")
+
+    async def handle_async(self, route):
+        action = self.decide(route.request)
+        if action is None:
+            await route.fallback()
+            return
+        self._record(route.request, action)
+        if action == "stub":
+            await route.fulfill(**self._stub_response(route.request))
+        else:
+            await route.abort("blockedbyclient")
+
+    def install(self, context):
+        if self.enabled:
+            context.route("**/*", self.handle)
+
+    async def install_async(self, context):
+        if self.enabled:
+            await context.route("**/*", self.handle_async)
+
+    def uninstall(self, context):
+        if self.enabled:
+            context.unroute("**/*", self.handle)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requests_blocked": self.requests_blocked,
+            "requests_stubbed": self.requests_stubbed,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+        }
@@ -0,0 +1,125 @@
+import os
+from typing import Dict, List, NamedTuple, Optional
+
+MB = 1024 * 1024
+PROC = "/proc"
+
+
+class MemorySample(NamedTuple):
+    rss_bytes: Optional[int]
+    js_heap_bytes: Optional[int]
+    dom_nodes: Optional[int]
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return f.read().decode(errors="replace")
+    except OSError:
+        return None
+
+
+def _children() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir(PROC):
+        if not entry.isdigit():
+            continue
+        stat = _read(f"{PROC}/{entry}/stat")
+        if stat is None:
+            continue
+        # The command name may contain spaces; fields resume after its ")"
+        parent = int(stat[stat.rindex(")") + 2 :].split()[1])
+        children.setdefault(parent, []).append(int(entry))
+    return children
+
+
+def _rss(pid: int) -> int:
+    status = _read(f"{PROC}/{pid}/status") or ""
+    for line in status.splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) * 1024
+    return 0
+
+
+def browser_pids(user_data_dir: str) -> List[int]:
+    # Chromium is launched with --user-data-dir, which tells the browsers of
+    # parallel profiles apart. Its renderer and GPU processes are children.
+    flag = f"--user-data-dir={os.path.abspath(user_data_dir)}".encode()
+    pids = []
+    for entry in os.listdir(PROC):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"{PROC}/{entry}/cmdline", "rb") as f:
+                arguments = f.read().split(b"\0")
+        except OSError:
+            continue
+        if flag in arguments and not any(a.startswith(b"--type=") for a in arguments):
+            pids.append(int(entry))
+    return pids
+
+
+def browser_rss(user_data_dir: str) -> Optional[int]:
+    # Resident memory of a browser and all of its child processes, or None
+    # where /proc is not available
+    if not os.path.isdir(PROC):
+        return None
+    pending = browser_pids(user_data_dir)
+    if not pending:
+        return None
+    children = _children()
+    total = 0
+    while pending:
+        pid = pending.pop()
+        total += _rss(pid)
+        pending.extend(children.get(pid, []))
+    return total
+
+
+def heap_from_metrics(metrics: List[dict]) -> MemorySample:
+    # Parses a CDP Performance.getMetrics response
+    values = {metric["name"]: metric["value"] for metric in metrics}
+    heap = values.get("JSHeapUsedSize")
+    nodes = values.get("Nodes")
+    return MemorySample(
+        rss_bytes=None,
+        js_heap_bytes=int(heap) if heap is not None else None,
+        dom_nodes=int(nodes) if nodes is not None else None,
+    )
+
+
+class MemoryWatchdog:
+    # Keeps high-water marks of the samples it sees and tells whether the
+    # browser has grown past its limits. A limit of 0 disables that check.
+    def __init__(self, rss_limit_mb: float = 0, js_heap_limit_mb: float = 0):
+        self.rss_limit = rss_limit_mb * MB
+        self.js_heap_limit = js_heap_limit_mb * MB
+        self.peak_rss = 0
+        self.peak_js_heap = 0
+        self.peak_dom_nodes = 0
+        self.page_recycles = 0
+        self.context_recycles = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rss_limit or self.js_heap_limit)
+
+    def observe(self, sample: MemorySample) -> bool:
+        self.peak_rss = max(self.peak_rss, sample.rss_bytes or 0)
+        self.peak_js_heap = max(self.peak_js_heap, sample.js_heap_bytes or 0)
+        self.peak_dom_nodes = max(self.peak_dom_nodes, sample.dom_nodes or 0)
+        return self.over_rss(sample) or bool(
+            self.js_heap_limit and (sample.js_heap_bytes or 0) > self.js_heap_limit
+        )
+
+    def over_rss(self, sample: MemorySample) -> bool:
+        return bool(self.rss_limit and (sample.rss_bytes or 0) > self.rss_limit)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "peak_rss_mb": self.peak_rss / MB,
+            "peak_js_heap_mb": self.peak_js_heap / MB,
+            "peak_dom_nodes": self.peak_dom_nodes,
+            "page_recycles": self.page_recycles,
+            "context_recycles": self.context_recycles,
+        }
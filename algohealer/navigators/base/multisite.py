@@ -0,0 +1,80 @@
+import asyncio
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from playwright._impl._errors import TargetClosedError
+from playwright.async_api import BrowserContext, async_playwright
+
+from algohealer.navigators.base.async_social_media_navigator import (
+    AsyncSocialMediaNavigator,
+)
+from algohealer.navigators.base.readiness import MUTATION_TRACKER_SCRIPT
+
+
+class SiteOutcome(NamedTuple):
+    seconds: float
+    error: Optional[str] = None
+
+
+class MultiSiteSession:
+    # Heals several sites in one browser. A single persistent context on the
+    # profile hosts the tabs of every site's navigator, and the navigators
+    # are expected to share one PacingScheduler, which hands out action slots
+    # in request order so the sites' work interleaves. A persistent profile
+    # can only be open in one browser at a time, so this is also the only way
+    # to heal several sites on it at once.
+    def __init__(
+        self,
+        navigators: Dict[str, AsyncSocialMediaNavigator],
+        user_data_dir: str,
+        channel: str,
+        headless: bool = True,
+        args: List[str] = [],
+    ):
+        self.navigators = navigators
+        self._user_data_dir = user_data_dir
+        self._channel = channel
+        self._headless = headless
+        self._args = args
+
+    async def _run_site(
+        self, navigator: AsyncSocialMediaNavigator, context: BrowserContext
+    ) -> SiteOutcome:
+        # One site failing leaves the others running
+        start = time.perf_counter()
+        try:
+            await navigator.attach(context)
+            await navigator.run()
+        except Exception as e:
+            return SiteOutcome(time.perf_counter() - start, str(e) or type(e).__name__)
+        finally:
+            await navigator.stop()
+        return SiteOutcome(time.perf_counter() - start)
+
+    async def run(self) -> Dict[str, SiteOutcome]:
+        playwright = await async_playwright().start()
+        try:
+            context = await playwright.chromium.launch_persistent_context(
+                user_data_dir=self._user_data_dir,
+                channel=self._channel,
+                args=self._args,
+                headless=self._headless,
+            )
+        except TargetClosedError:
+            await playwright.stop()
+            raise
+        try:
+            await context.add_init_script(MUTATION_TRACKER_SCRIPT)
+            outcomes = await asyncio.gather(
+                *(
+                    self._run_site(navigator, context)
+                    for navigator in self.navigators.values()
+                )
+            )
+        finally:
+            await context.close()
+            await playwright.stop()
+        return dict(zip(self.navigators, outcomes))
+
+    def run_until_complete(self) -> Dict[str, SiteOutcome]:
+        return asyncio.run(self.run())
@@ -0,0 +1,35 @@
+import asyncio
+import random
+import threading
+import time
+
+
+class PacingScheduler:
+    def __init__(self, actions_per_minute: float = 40, jitter: float = 0.5):
+        self._interval = 60 / actions_per_minute if actions_per_minute > 0 else 0.0
+        self._jitter = max(0.0, jitter)
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._interval > 0 or self._jitter > 0
+
+    def reserve(self) -> float:
+        # Book the next free action slot and return how long to wait for it.
+        # Time already spent waiting on the page counts towards the budget.
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        return slot - now + random.uniform(0, self._jitter)
+
+    def throttle(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def athrottle(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
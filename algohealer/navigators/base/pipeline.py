@@ -0,0 +1,126 @@
+import asyncio
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+
+class AccountTask(NamedTuple):
+    account: str
+    state: Optional[dict]
+
+
+class LoadedAccount(NamedTuple):
+    task: AccountTask
+    page: Any
+    opened: bool
+    started: float
+
+
+class PostVisit(NamedTuple):
+    account: str
+    post_id: str
+    position: int
+    page: Any
+    # Set by the action executor; the post iterator waits for it before it
+    # moves the page on to the next post
+    done: Optional[asyncio.Event] = None
+
+
+class PostResult(NamedTuple):
+    account: str
+    post_id: str
+    actions: Tuple[Tuple[str, bool], ...] = ()
+
+
+class AccountDone(NamedTuple):
+    account: str
+    posts: int
+    started: float
+
+
+_END = object()
+
+
+class Pipeline:
+    # Source -> stage -> ... -> sink, with a bounded queue between each pair so
+    # a slow stage holds back the ones before it. Every stage is an async
+    # generator function taking one item and yielding any number of items;
+    # `workers` copies of a stage run concurrently. Cancelling run() (or an
+    # error in any stage) cancels every stage.
+    def __init__(self, source: AsyncIterable, maxsize: int = 1):
+        self._source = source
+        self._maxsize = maxsize
+        self._stages: List[Tuple[Callable[[Any], AsyncIterator], int]] = []
+
+    def pipe(
+        self, stage: Callable[[Any], AsyncIterator], workers: int = 1
+    ) -> "Pipeline":
+        self._stages.append((stage, max(1, workers)))
+        return self
+
+    async def run(self, sink: Callable[[Any], Awaitable[None]]):
+        queues = [asyncio.Queue(self._maxsize) for _ in range(len(self._stages) + 1)]
+        consumers = [workers for _, workers in self._stages] + [1]
+
+        async def feed():
+            async for item in self._source:
+                await queues[0].put(item)
+            for _ in range(consumers[0]):
+                await queues[0].put(_END)
+
+        async def work(stage, inbox: asyncio.Queue, outbox: asyncio.Queue):
+            while (item := await inbox.get()) is not _END:
+                async for result in stage(item):
+                    await outbox.put(result)
+
+        async def run_stage(index: int):
+            stage, workers = self._stages[index]
+            inbox, outbox = queues[index], queues[index + 1]
+            await asyncio.gather(*(work(stage, inbox, outbox) for _ in range(workers)))
+            for _ in range(consumers[index + 1]):
+                await outbox.put(_END)
+
+        async def drain():
+            while (item := await queues[-1].get()) is not _END:
+                await sink(item)
+
+        tasks = [asyncio.ensure_future(feed())]
+        tasks += [asyncio.ensure_future(run_stage(i)) for i in range(len(self._stages))]
+        tasks.append(asyncio.ensure_future(drain()))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class CrawlSink:
+    # Collects new post ids per account and writes them once the account is
+    # done. flush() writes whatever is still pending, e.g. after a cancel.
+    def __init__(self, record: Callable[[str, List[str]], None]):
+        self._record = record
+        self._pending: dict = {}
+        self.posts = 0
+        self.accounts = 0
+
+    def add(self, item):
+        if isinstance(item, PostResult):
+            self._pending.setdefault(item.account, []).append(item.post_id)
+            self.posts += 1
+        elif isinstance(item, AccountDone):
+            self._record(item.account, self._pending.pop(item.account, []))
+            self.accounts += 1
+
+    def flush(self):
+        while self._pending:
+            account, post_ids = self._pending.popitem()
+            self._record(account, post_ids)
@@ -0,0 +1,61 @@
+from typing import Callable, Dict, List, Tuple
+
+# Installed in every document so the navigator can ask how long the DOM has
+# been quiet without keeping an observer round-trip open per wait.
+MUTATION_TRACKER_SCRIPT = """
+(() => {
+  window.__algohealerLastMutation = performance.now();
+  const observe = () => new MutationObserver(() => {
+    window.__algohealerLastMutation = performance.now();
+  }).observe(document, {subtree: true, childList: true, attributes: true});
+  if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", observe);
+  } else {
+    observe();
+  }
+})();
+"""
+
+ANY_VISIBLE_SCRIPT = """
+elements => elements.some(element => element.checkVisibility
+  ? element.checkVisibility()
+  : element.getClientRects().length > 0)
+"""
+
+DOM_QUIET_MS_SCRIPT = "() => performance.now() - (window.__algohealerLastMutation || 0)"
+
+
+class NetworkTracker:
+    def __init__(self):
+        self._in_flight: Dict[int, int] = {}
+        self._listeners: Dict[int, List[Tuple[str, Callable]]] = {}
+
+    def attach(self, page):
+        key = id(page)
+        self._in_flight[key] = 0
+
+        def started(_):
+            self._in_flight[key] += 1
+
+        def finished(_):
+            self._in_flight[key] = max(0, self._in_flight[key] - 1)
+
+        listeners = [
+            ("request", started),
+            ("requestfinished", finished),
+            ("requestfailed", finished),
+        ]
+        for event, listener in listeners:
+            page.on(event, listener)
+        self._listeners[key] = listeners
+
+    def detach(self, page):
+        for event, listener in self._listeners.pop(id(page), []):
+            page.remove_listener(event, listener)
+        self._in_flight.pop(id(page), None)
+
+    def reset(self, page):
+        self._in_flight[id(page)] = 0
+
+    def in_flight(self, page) -> int:
+        return self._in_flight.get(id(page), 0)
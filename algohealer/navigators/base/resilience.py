@@ -0,0 +1,69 @@
+import random
+import re
+import time
+from typing import Dict, Hashable, List
+
+from playwright._impl._errors import TargetClosedError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+# Navigation errors worth another attempt: network hiccups, navigations cut
+# short by a redirect and slow responses
+TRANSIENT_ERROR = re.compile(
+    r"net::ERR_(?!ABORTED\b|BLOCKED_BY_CLIENT\b)|NS_ERROR_NET|interrupted by another navigation"
+)
+
+
+def is_transient(error: Exception) -> bool:
+    return isinstance(error, PlaywrightTimeoutError) or bool(
+        TRANSIENT_ERROR.search(str(error))
+    )
+
+
+def is_page_gone(error: Exception) -> bool:
+    # The tab was closed or crashed; only a new page helps
+    return isinstance(error, TargetClosedError) or "crashed" in str(error)
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    # Exponential with full jitter, so parallel tabs do not retry in lockstep
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class SelectorBreaker:
+    # Per-selector circuit breaker. After `threshold` consecutive misses a
+    # selector is skipped outright instead of waiting out its timeout. Once
+    # `cooldown` seconds have passed it gets one more try: a hit closes the
+    # breaker again, a miss keeps it open for another cooldown.
+    def __init__(self, threshold: int = 5, cooldown: float = 600.0):
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._misses: Dict[Hashable, int] = {}
+        self._opened_at: Dict[Hashable, float] = {}
+        self.skipped = 0
+
+    def is_open(self, key: Hashable) -> bool:
+        opened_at = self._opened_at.get(key)
+        return opened_at is not None and time.monotonic() - opened_at < self._cooldown
+
+    def allow(self, key: Hashable) -> bool:
+        if key not in self._opened_at:
+            return True
+        if not self.is_open(key):
+            self._opened_at[key] = time.monotonic()
+            return True
+        self.skipped += 1
+        return False
+
+    def success(self, key: Hashable):
+        self._misses.pop(key, None)
+        self._opened_at.pop(key, None)
+
+    def failure(self, key: Hashable):
+        if self._threshold <= 0:
+            return
+        self._misses[key] = self._misses.get(key, 0) + 1
+        if self._misses[key] >= self._threshold:
+            self._opened_at[key] = time.monotonic()
+
+    def open_keys(self) -> List[Hashable]:
+        return list(self._opened_at)
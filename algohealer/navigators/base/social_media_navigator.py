@@ -1,16 +1,41 @@
 import os
 import random
 import time
-from typing import List
+from typing import Dict, List, Optional, Sequence
 
 from playwright._impl._errors import TargetClosedError
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Page, sync_playwright
 
 from algohealer.db.conn import SQLiteManager
+from algohealer.navigators.base.batch import (
+    BATCH_SCRIPT,
+    BatchResult,
+    BatchStep,
+)
+from algohealer.navigators.base.browser_pool import BrowserPool
+from algohealer.navigators.base.core import NavigatorCore
+from algohealer.navigators.base.memory import (
+    MemorySample,
+    browser_rss,
+    heap_from_metrics,
+)
+from algohealer.navigators.base.readiness import (
+    ANY_VISIBLE_SCRIPT,
+    DOM_QUIET_MS_SCRIPT,
+    MUTATION_TRACKER_SCRIPT,
+)
+from algohealer.navigators.base.resilience import (
+    backoff_delay,
+    is_page_gone,
+    is_transient,
+)
+from algohealer.navigators.base.tracing import traced
+from algohealer.navigators.spec import Plan, PlanStep
 
 
-class SocialMediaNavigator:
+class SocialMediaNavigator(NavigatorCore):
     def __init__(
         self,
         user_data_dir: str,
@@ -20,79 +45,334 @@ class SocialMediaNavigator:
         db_conn: SQLiteManager,
         headless: bool = True,
         args: List[str] = [],
+        browser_pool: Optional[BrowserPool] = None,
+        **kwargs,
     ):
-        self._db_conn = db_conn
-        self._playwright = sync_playwright().start()
+        super().__init__(nav_name, url_base, db_conn, **kwargs)
+        self._cdp = None
+        self._page_recycled = False
+        self._spare_page = None
+        # A HAR is written when its context closes, so it needs its own context
+        self._pool = None if self._har_mode else browser_pool
+        self._pooled = None
+        self._playwright = None
+        self._launch_options = {
+            "user_data_dir": user_data_dir,
+            "channel": channel,
+            "headless": headless,
+            "args": args,
+        }
+        if self._har_mode == "record":
+            self._launch_options["record_har_path"] = self._har_path
+        self._open_context()
         try:
-            self._browser = self._playwright.chromium.launch_persistent_context(
-                user_data_dir=user_data_dir,
-                channel=channel,
-                args=args,
-                headless=headless,
-            )
-        except TargetClosedError:
-            self._playwright.stop()
-            raise TargetClosedError
-        self._page = self._browser.new_page()
-        self._url_base = self._clean_base_url(url_base)
-        self._nav_name = nav_name
-        self.load(self._url_base)
+            self.load(self._url_base)
+        except Exception:
+            self.stop()
+            raise
 
-    @staticmethod
-    def _clean_base_url(url: str):
-        if url[-1] == "/":
-            url = url[:-1]
-        return url
+    def _open_context(self):
+        if self._pool is not None:
+            self._pooled = self._pool.acquire(**self._launch_options)
+            self._browser = self._pooled.context
+            if not self._pooled.initialized:
+                self._browser.add_init_script(MUTATION_TRACKER_SCRIPT)
+                self._pooled.initialized = True
+            self._page = self._pooled.take_page()
+        else:
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            try:
+                self._browser = self._playwright.chromium.launch_persistent_context(
+                    **self._launch_options
+                )
+            except TargetClosedError:
+                self._playwright.stop()
+                raise TargetClosedError
+            if self._har_mode == "replay":
+                # Anything the recording does not have fails instead of
+                # reaching the network
+                self._browser.route_from_har(self._har_path, not_found="abort")
+            self._browser.add_init_script(MUTATION_TRACKER_SCRIPT)
+            self._page = self._browser.new_page()
+        self._blocker.install(self._browser)
+        self._network.attach(self._page)
 
-    def stop(self):
+    def _close_context(self):
+        if self._pooled is not None:
+            # Hand the warm context and pages back for the next session
+            self._blocker.uninstall(self._browser)
+            self._network.detach(self._page)
+            if self._spare_page is not None:
+                self._network.detach(self._spare_page)
+                self._pooled.return_page(self._spare_page)
+                self._spare_page = None
+            self._pool.release(self._pooled, self._page)
+            self._pooled = None
+            return
+        self._network.detach(self._page)
+        if self._spare_page is not None:
+            self._network.detach(self._spare_page)
+            self._spare_page = None
         self._browser.close()
-        self._playwright.stop()
+
+    def stop(self):
+        pooled = self._pooled is not None
+        self._close_context()
+        if not pooled:
+            self._playwright.stop()
 
     def run(self):
         raise NotImplementedError
 
+    @traced()
     def load(self, url: str):
-        self._page.goto(url)
+        for attempt in range(self._navigation_retries + 1):
+            try:
+                if self._page.is_closed():
+                    self.reopen_page()
+                self._network.reset(self._page)
+                self._page.goto(url, wait_until="domcontentloaded")
+                return
+            except PlaywrightError as e:
+                gone = is_page_gone(e)
+                if attempt == self._navigation_retries or not (gone or is_transient(e)):
+                    raise
+                if gone:
+                    self.reopen_page()
+            time.sleep(backoff_delay(attempt))
+
+    def sample_memory(self) -> MemorySample:
+        try:
+            if self._cdp is None:
+                self._cdp = self._browser.new_cdp_session(self._page)
+                self._cdp.send("Performance.enable")
+            sample = heap_from_metrics(
+                self._cdp.send("Performance.getMetrics")["metrics"]
+            )
+        except PlaywrightError:
+            self._cdp = None
+            sample = MemorySample(None, None, None)
+        return sample._replace(
+            rss_bytes=browser_rss(self._launch_options["user_data_dir"])
+        )
+
+    @traced()
+    def check_memory(self) -> Optional[str]:
+        # Called between accounts. Past a limit the walked tab is swapped for a
+        # fresh one; if the browser is still too big after that, the whole
+        # context is restarted. Returns what was recycled.
+        sample = self.sample_memory()
+        if not self._watchdog.observe(sample):
+            self._page_recycled = False
+            return None
+        # Closing the context would cut a HAR recording short
+        if (
+            self._page_recycled
+            and self._watchdog.over_rss(sample)
+            and self._har_mode != "record"
+        ):
+            self.recycle_context()
+            return "context"
+        self.recycle_page()
+        return "page"
+
+    def recycle_page(self):
+        old = self._page
+        self._network.detach(old)
+        self._page = self._browser.new_page()
+        self._network.attach(self._page)
+        self._cdp = None
+        old.close()
+        self._page_recycled = True
+        self._watchdog.page_recycles += 1
+
+    def recycle_context(self):
+        if self._pooled is not None:
+            self._pooled.retire()
+        self._close_context()
+        self._open_context()
+        self._cdp = None
+        self._page_recycled = False
+        self._watchdog.context_recycles += 1
+
+    def reopen_page(self):
+        # Replaces a crashed or closed tab with a new one in the same context,
+        # so cookies and the login survive. Raises if the browser itself is gone.
+        self._network.detach(self._page)
+        self._page = (
+            self._pooled.take_page()
+            if self._pooled is not None
+            else self._browser.new_page()
+        )
+        self._network.attach(self._page)
+        self._cdp = None
 
     def load_subpage(self, subpage: str):
         self.load(os.path.join(self._url_base, subpage))
 
-    def click(self, selector: str):
-        self._page.click(selector)
+    def spare_page(self) -> Page:
+        if self._spare_page is None:
+            self._spare_page = (
+                self._pooled.take_page()
+                if self._pooled is not None
+                else self._browser.new_page()
+            )
+            self._network.attach(self._spare_page)
+        return self._spare_page
+
+    @traced()
+    def prefetch(self, url: str):
+        # Only waits for the response to commit; the spare tab keeps loading
+        # in the background until swap_pages() brings it to the front
+        page = self.spare_page()
+        self._network.reset(page)
+        page.goto(url, wait_until="commit")
+
+    def prefetch_subpage(self, subpage: str):
+        self.prefetch(os.path.join(self._url_base, subpage))
+
+    def swap_pages(self):
+        self._page, self._spare_page = self.spare_page(), self._page
+        # Memory is sampled from the walked tab, so follow it to the new one
+        self._cdp = None
+        # Headed browsers throttle background tabs
+        self._page.bring_to_front()
+
+    @traced()
+    def click(self, selector: str, timeout: Optional[int] = None):
+        self._page.click(selector, timeout=timeout)
 
-    def fill(self, selector: str, text: str):
-        self._page.fill(selector, text)
+    @traced()
+    def fill(self, selector: str, text: str, timeout: Optional[int] = None):
+        self._page.fill(selector, text, timeout=timeout)
 
+    def probe(self, *selectors: str) -> List[bool]:
+        steps = self._probe_batch(selectors)
+        if steps is not None:
+            return [result.ok for result in self.batch(steps)]
+        # Playwright-only selectors need its selector engine, one call each
+        return [
+            self._page.eval_on_selector_all(selector, ANY_VISIBLE_SCRIPT)
+            for selector in selectors
+        ]
+
+    def is_settled(self) -> bool:
+        if self._network.in_flight(self._page) > 0:
+            return False
+        return self._page.evaluate(DOM_QUIET_MS_SCRIPT) >= self._settle_ms
+
+    @traced()
     def wait(self, selector: str, timeout: int = 1000) -> bool:
-        try:
-            self._page.wait_for_selector(selector, timeout=timeout)
+        if self.probe(selector)[0]:
             return True
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            remaining = int((deadline - time.monotonic()) * 1000)
+            if remaining <= 0:
+                return False
+            try:
+                self._page.wait_for_selector(
+                    selector, timeout=min(self._settle_ms, remaining)
+                )
+                return True
+            except PlaywrightTimeoutError:
+                pass
+            # Nothing is loading or rendering anymore, so the element is not coming
+            if self.is_settled():
+                return False
+
+    @traced()
+    def wait_check_click(self, selector: str, timeout: int = 1000) -> bool:
+        if not self.wait(selector=selector, timeout=timeout):
+            return False
+        try:
+            # Through Playwright, so the click is a trusted event on an element
+            # that is visible, stable and not covered
+            self.click(selector=selector, timeout=timeout)
         except PlaywrightTimeoutError:
             return False
+        return True
 
-    def wait_check_click(self, selector: str, timeout: int = 1000) -> bool:
-        if self.wait(selector=selector, timeout=timeout):
-            self.click(selector=selector)
-            return True
+    @traced()
+    def wait_then_fill(self, selector: str, text: str, timeout: int = 10000) -> bool:
+        if not self.wait(selector=selector, timeout=timeout):
+            return False
+        try:
+            self.fill(selector=selector, text=text, timeout=timeout)
+        except PlaywrightTimeoutError:
+            return False
+        return True
+
+    @traced()
+    def batch(self, steps: Sequence[BatchStep]) -> List[BatchResult]:
+        raw = self._page.evaluate(BATCH_SCRIPT, [step._asdict() for step in steps])
+        results = [BatchResult(*result) for result in raw]
+        return results + [BatchResult(False)] * (len(steps) - len(results))
+
+    def _run_step(self, step: PlanStep, params: Dict[str, str]) -> bool:
+        candidates = self._allowed_candidates(step)
+        visible = []
+        if len(candidates) > 1:
+            # One look for all of them, so a fallback that is already there
+            # does not wait out the primary's timeout
+            visible = self.probe(
+                *(candidate.resolve(params)[0] for candidate in candidates)
+            )
+        for candidate in self._step_attempts(step, candidates, visible):
+            ok = self._run_candidate(candidate, params)
+            self._candidate_finished(step, candidate, ok)
+            if ok:
+                return True
         return False
 
-    def wait_then_fill(self, selector: str, text: str, timeout: int = 10000):
-        self.wait(selector=selector, timeout=timeout)
-        self.fill(selector=selector, text=text)
+    def _run_candidate(self, step: PlanStep, params: Dict[str, str]) -> bool:
+        selector, text = step.resolve(params)
+        if step.action == "click":
+            return self.wait_check_click(selector, timeout=step.timeout)
+        if step.action == "fill":
+            return self.wait_then_fill(selector, text, timeout=step.timeout)
+        return self.wait(selector, timeout=step.timeout)
+
+    def run_plan(self, plan: Plan, **params: str) -> bool:
+        for step in plan.steps:
+            if not self._run_step(step, params) and not step.optional:
+                return False
+        return True
+
+    @traced()
+    def run_flow(self, flow: str, **params: str) -> bool:
+        post_id = self.current_post_id()
+        start = time.perf_counter()
+        try:
+            ok = self.run_plan(self.plans[flow], **params)
+        except PlaywrightError as e:
+            if not is_page_gone(e):
+                # e.g. the page navigated away mid-step; the flow just did not happen
+                ok = False
+            else:
+                # The tab crashed or was closed: reopen it where it was, try once more
+                url = self._page.url
+                self.reopen_page()
+                self.load(url)
+                ok = self.run_plan(self.plans[flow], **params)
+        self.log_action(flow, ok, time.perf_counter() - start, post_id)
+        return ok
+
+    def current_post_id(self) -> Optional[str]:
+        return None
 
+    @traced()
     def press_down(self):
         self._page.keyboard.press("ArrowDown")
 
+    @traced()
     def press_up(self):
         self._page.keyboard.press("ArrowUp")
 
+    @traced()
     def _scroll(self, direction: str, pixels: int = 500):
-        if direction not in ["up", "down"]:
-            raise ValueError("Scroll direction must be either 'up' or 'down'")
-        if direction == "up":
-            self._page.evaluate(f"window.scrollBy(0, -{pixels})")
-        elif direction == "down":
-            self._page.evaluate(f"window.scrollBy(0, {pixels})")
+        self.batch([self._scroll_step(direction, pixels)])
 
     def scroll_up(self, pixels: int = 500):
         self._scroll(direction="up", pixels=pixels)
@@ -108,6 +388,6 @@ class SocialMediaNavigator:
     def random_sleep(min: int, max: int):
         time.sleep(random.uniform(min, max))
 
-    def get_current_account_names(self) -> List[str]:
-        accounts = self._db_conn.get_all_accounts_for_site(self._nav_name)
-        return [account["name"] for account in accounts]
+    @traced()
+    def pace(self):
+        self._pacing.throttle()
@@ -0,0 +1,202 @@
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from algohealer.classifier import (
+    Classification,
+    FeedPost,
+)
+from algohealer.navigators.base.core import SpecNavigatorCore
+from algohealer.navigators.base.feed import EXTRACT_FEED_SCRIPT
+from algohealer.navigators.base.pipeline import (
+    AccountDone,
+    AccountTask,
+    CrawlSink,
+    LoadedAccount,
+    PostResult,
+    PostVisit,
+)
+from algohealer.navigators.base.social_media_navigator import SocialMediaNavigator
+from algohealer.navigators.base.tracing import bind_account, traced
+from algohealer.navigators.spec import FeedSurface, SiteSpec, apply_spec
+
+
+class SpecNavigator(SpecNavigatorCore, SocialMediaNavigator):
+    def next_content(self) -> bool:
+        return self.run_flow("next_content")
+
+    def open_first_post(self) -> bool:
+        return self.run_flow("open_first_post")
+
+    def current_post_id(self) -> Optional[str]:
+        return self.post_id_from_url(self._page.url)
+
+    def wait_for_post(
+        self, previous: Optional[str] = None, timeout: int = 1000
+    ) -> Optional[str]:
+        try:
+            self._page.wait_for_url(
+                lambda url: self.post_id_from_url(url) not in (None, previous),
+                timeout=timeout,
+            )
+        except PlaywrightTimeoutError:
+            pass
+        return self.current_post_id()
+
+    def next_post(self, previous: Optional[str]) -> Tuple[bool, Optional[str]]:
+        if not self.next_content():
+            return False, None
+        if previous:
+            return True, self.wait_for_post(previous=previous)
+        return True, self.current_post_id()
+
+    def account_source(self) -> Iterator[AccountTask]:
+        return self.budgeted_accounts()
+
+    def load_accounts(self, tasks: Iterable[AccountTask]) -> Iterator[LoadedAccount]:
+        tasks = iter(tasks)
+        task = next(tasks, None)
+        started = time.perf_counter()
+        loaded = task is not None and self._load_profile(task.account)
+        while task is not None:
+            upcoming = next(tasks, None)
+            prefetched = False
+            if upcoming is not None and self._prefetch:
+                # The next profile loads in the spare tab while this one is walked
+                with bind_account(upcoming.account):
+                    try:
+                        self.prefetch_subpage(self.profile_subpage(upcoming.account))
+                        prefetched = True
+                    except PlaywrightError:
+                        pass
+            with bind_account(task.account):
+                opened = loaded and self.open_first_post()
+            yield LoadedAccount(task, self._page, opened, started)
+
+            started = time.perf_counter()
+            if upcoming is not None:
+                # Between accounts nothing depends on the walked tab anymore, so
+                # this is where it can be recycled
+                if self.check_memory() == "context":
+                    prefetched = False
+                if prefetched:
+                    with bind_account(upcoming.account):
+                        self.swap_pages()
+                    loaded = True
+                else:
+                    loaded = self._load_profile(upcoming.account)
+            task = upcoming
+
+    def _load_profile(self, account: str) -> bool:
+        # A profile that keeps failing to load is skipped, not the whole run
+        with bind_account(account):
+            try:
+                self.load_subpage(self.profile_subpage(account))
+            except PlaywrightError:
+                return False
+        return True
+
+    def iterate_posts(
+        self, loaded_accounts: Iterable[LoadedAccount], max_posts: int
+    ) -> Iterator[Union[PostVisit, AccountDone]]:
+        for loaded in loaded_accounts:
+            account = loaded.task.account
+            visited = 0
+            outcome = "ok"
+            self.events.emit("account_started", site=self._nav_name, account=account)
+            with bind_account(account):
+                seen = self._seen_posts(loaded.task)
+                try:
+                    post_id = self.wait_for_post() if loaded.opened else None
+                    for position in range(max_posts + 1) if loaded.opened else ():
+                        if self._walk_over(post_id, position, seen):
+                            break
+                        if post_id and post_id not in seen:
+                            yield PostVisit(account, post_id, position, self._page)
+                            visited += 1
+                        if position == max_posts or self.stopping:
+                            break
+                        self.pace()
+                        moved, post_id = self.next_post(post_id)
+                        if not moved:
+                            break
+                except PlaywrightError:
+                    # Keep what was visited so far and move on to the next account
+                    outcome = "error"
+            self._account_finished(loaded, visited, outcome)
+            yield AccountDone(account, visited, loaded.started)
+
+    def execute_posts(
+        self, items: Iterable[Union[PostVisit, AccountDone]]
+    ) -> Iterator[Union[PostResult, AccountDone]]:
+        for item in items:
+            if isinstance(item, AccountDone):
+                yield item
+                continue
+            with bind_account(item.account):
+                actions = tuple(
+                    (flow, self.run_flow(flow)) for flow in self.post_actions
+                )
+            self._post_visited(item)
+            yield PostResult(item.account, item.post_id, actions)
+
+    def like_new_posts(self, max_posts: Optional[int] = None):
+        max_posts = self.spec.max_posts if max_posts is None else max_posts
+        sink = CrawlSink(self.record_crawl)
+        # Generators pull one item at a time, so each stage only runs when the
+        # next one asks for work
+        stream = self.execute_posts(
+            self.iterate_posts(self.load_accounts(self.account_source()), max_posts)
+        )
+        try:
+            for item in stream:
+                sink.add(item)
+        finally:
+            stream.close()
+            sink.flush()
+
+    def extract_feed(self, surface: FeedSurface) -> List[FeedPost]:
+        return self._feed_posts(
+            self._page.evaluate(EXTRACT_FEED_SCRIPT, surface.model_dump())
+        )
+
+    @traced()
+    def assess_feed(self, surface_name: str) -> List[Classification]:
+        surface = self.spec.feeds[surface_name]
+        self.load_subpage(surface.path)
+        posts = []
+        if self.wait(surface.item, timeout=5000):
+            posts = self.extract_feed(surface)
+        return self._record_feed(surface_name, posts)
+
+    def engage_feed(self, results: List[Classification]) -> int:
+        liked = 0
+        for result in self._engage_candidates(results):
+            if liked >= self._feed_likes or self.stopping:
+                break
+            self.pace()
+            self.load(result.post.url)
+            if self.run_flow("like_content"):
+                liked += 1
+        return liked
+
+    def heal_feeds(self):
+        for surface_name in self.spec.feeds:
+            if self.stopping:
+                break
+            results = self.assess_feed(surface_name)
+            if self._feed_likes and "like_content" in self.plans:
+                self.engage_feed(results)
+
+    def run(self):
+        self.like_new_posts()
+        self._watchdog.observe(self.sample_memory())
+        if self._assess_feed and not self.stopping:
+            self.heal_feeds()
+
+
+def navigator_for_spec(spec: SiteSpec) -> type:
+    name = f"{spec.name.title().replace('-', '').replace('_', '')}Navigator"
+    return apply_spec(spec)(type(name, (SpecNavigator,), {}))
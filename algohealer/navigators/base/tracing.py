@@ -0,0 +1,177 @@
+import functools
+import inspect
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, NamedTuple, Optional
+
+current_account: ContextVar[Optional[str]] = ContextVar("current_account", default=None)
+
+
+@contextmanager
+def bind_account(name: str):
+    # Attributes spans to an account without recording an account span
+    token = current_account.set(name)
+    try:
+        yield
+    finally:
+        current_account.reset(token)
+
+
+class Span(NamedTuple):
+    name: str
+    start: float
+    duration: float
+    target: Optional[str]
+    outcome: str
+    account: Optional[str]
+
+
+def _outcome(result) -> str:
+    if result is True:
+        return "hit"
+    if result is False:
+        return "timeout"
+    return "ok"
+
+
+def _target(args: tuple, kwargs: dict) -> Optional[str]:
+    for key in ("selector", "url", "subpage", "direction"):
+        if key in kwargs:
+            return str(kwargs[key])
+    for arg in args:
+        if isinstance(arg, str):
+            return arg
+    return None
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percentile * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class SessionTracer:
+    def __init__(self, session_id: Optional[str] = None):
+        self.session_id = session_id or uuid.uuid4().hex[:12]
+        self.spans: List[Span] = []
+        self._origin = time.perf_counter()
+
+    def record(
+        self,
+        name: str,
+        start: float,
+        duration: float,
+        target: Optional[str] = None,
+        outcome: str = "ok",
+    ):
+        self.spans.append(
+            Span(
+                name=name,
+                start=start - self._origin,
+                duration=duration,
+                target=target,
+                outcome=outcome,
+                account=current_account.get(),
+            )
+        )
+
+    def summary(self) -> List[Dict]:
+        grouped: Dict[str, List[Span]] = {}
+        for span in self.spans:
+            grouped.setdefault(span.name, []).append(span)
+        rows = []
+        for name, spans in grouped.items():
+            durations = [span.duration for span in spans]
+            rows.append(
+                {
+                    "name": name,
+                    "count": len(spans),
+                    "timeouts": sum(span.outcome == "timeout" for span in spans),
+                    "errors": sum(span.outcome == "error" for span in spans),
+                    "total": sum(durations),
+                    "p50": _percentile(durations, 0.50),
+                    "p95": _percentile(durations, 0.95),
+                }
+            )
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def export_jsonl(self, path: str):
+        with open(path, "w") as f:
+            for span in self.spans:
+                f.write(json.dumps({"session": self.session_id, **span._asdict()}))
+                f.write("\n")
+
+    def export_chrome_trace(self, path: str):
+        events = [
+            {
+                "name": span.name,
+                "cat": span.outcome,
+                "ph": "X",
+                "ts": span.start * 1_000_000,
+                "dur": span.duration * 1_000_000,
+                "pid": 1,
+                "tid": span.account or "session",
+                "args": {"target": span.target, "account": span.account},
+            }
+            for span in self.spans
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export(self, directory: str, prefix: str) -> List[str]:
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{prefix}-{self.session_id}")
+        self.export_jsonl(f"{base}.jsonl")
+        self.export_chrome_trace(f"{base}.trace.json")
+        return [f"{base}.jsonl", f"{base}.trace.json"]
+
+
+def traced(name: Optional[str] = None):
+    def decorator(func):
+        span_name = name or func.__name__.lstrip("_")
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                start = time.perf_counter()
+                outcome = "error"
+                try:
+                    result = await func(self, *args, **kwargs)
+                    outcome = _outcome(result)
+                    return result
+                finally:
+                    self.tracer.record(
+                        span_name,
+                        start,
+                        time.perf_counter() - start,
+                        _target(args, kwargs),
+                        outcome,
+                    )
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = func(self, *args, **kwargs)
+                outcome = _outcome(result)
+                return result
+            finally:
+                self.tracer.record(
+                    span_name,
+                    start,
+                    time.perf_counter() - start,
+                    _target(args, kwargs),
+                    outcome,
+                )
+
+        return wrapper
+
+    return decorator
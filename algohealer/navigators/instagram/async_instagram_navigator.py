@@ -0,0 +1,31 @@
+from typing import Optional
+
+from playwright.async_api import Page
+
+from algohealer.navigators.base.async_spec_navigator import AsyncSpecNavigator
+from algohealer.navigators.instagram.selectors import InstagramSelectors
+
+
+class AsyncInstagramNavigator(InstagramSelectors, AsyncSpecNavigator):
+    async def previous_content(self, page: Page) -> bool:
+        return await self.run_flow(page, "previous_content")
+
+    async def like_content(self, page: Page) -> bool:
+        return await self.run_flow(page, "like_content")
+
+    async def unlike_content(self, page: Page) -> bool:
+        return await self.run_flow(page, "unlike_content")
+
+    async def follow_account(self, page: Page) -> bool:
+        return await self.run_flow(page, "follow_account")
+
+    async def unfollow_account(self, page: Page) -> bool:
+        return await self.run_flow(page, "unfollow_account")
+
+    async def comment(self, page: Page, text: str) -> bool:
+        return await self.run_flow(page, "comment", text=text)
+
+    async def search(
+        self, page: Page, query: str, result: Optional[str] = None
+    ) -> bool:
+        return await self.run_flow(page, "search", query=query, result=result or query)
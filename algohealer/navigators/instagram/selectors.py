@@ -0,0 +1,12 @@
+import os
+
+from algohealer.navigators.spec import SpecSite, apply_spec
+
+SPEC_PATH = os.path.join(os.path.dirname(__file__), "instagram.json")
+
+
+# Selectors, blocking lists and flows live in instagram.json; they are exposed
+# here as class attributes so the navigators can keep using `self.like_button`.
+@apply_spec(SPEC_PATH)
+class InstagramSelectors(SpecSite):
+    pass
@@ -0,0 +1,112 @@
+import os
+from collections.abc import Mapping
+from importlib import import_module
+from typing import Any, Dict, Iterator
+
+SPEC_EXTENSIONS = (".json", ".yaml", ".yml")
+# os.pathsep-separated spec files, each registered under its file name
+SPEC_PATHS_ENV = "ALGOHEALER_SITE_SPECS"
+
+
+def _import(target: str) -> Any:
+    module_name, _, attr = target.partition(":")
+    obj = import_module(module_name)
+    for part in attr.split(".") if attr else []:
+        obj = getattr(obj, part)
+    return obj
+
+
+class NavigatorRegistry(Mapping):
+    # Maps site names to navigators and only imports one (and with it
+    # Playwright) the first time that site is actually used. A target is a
+    # "module:Class" path, a site spec file, or an already loaded class, spec
+    # or spec dict. Plugins add sites through the `entry_point_group` entry
+    # points or ALGOHEALER_SITE_SPECS; both are only scanned for unknown sites.
+    def __init__(
+        self, targets: Dict[str, Any], entry_point_group: str, spec_factory: str
+    ):
+        self._targets = dict(targets)
+        self._loaded: Dict[str, type] = {}
+        self._entry_point_group = entry_point_group
+        self._spec_factory = spec_factory
+        self._discovered = False
+
+    def register(self, site: str, target: Any):
+        self._targets[site] = target
+        self._loaded.pop(site, None)
+
+    def discover(self):
+        self._discovered = True
+        for path in filter(None, os.environ.get(SPEC_PATHS_ENV, "").split(os.pathsep)):
+            site = os.path.splitext(os.path.basename(path))[0]
+            self._targets.setdefault(site, path)
+
+        from importlib.metadata import entry_points
+
+        eps = entry_points()
+        if hasattr(eps, "select"):
+            eps = eps.select(group=self._entry_point_group)
+        else:
+            eps = eps.get(self._entry_point_group, [])
+        for ep in eps:
+            self._targets.setdefault(ep.name, ep)
+
+    def _ensure_discovered(self):
+        if not self._discovered:
+            self.discover()
+
+    def _resolve(self, target: Any) -> type:
+        if isinstance(target, type):
+            return target
+        if isinstance(target, str):
+            if target.lower().endswith(SPEC_EXTENSIONS):
+                from algohealer.navigators.spec import load_spec
+
+                return _import(self._spec_factory)(load_spec(target))
+            return self._resolve(_import(target))
+        if hasattr(target, "load") and hasattr(target, "group"):
+            return self._resolve(target.load())
+
+        from algohealer.navigators.spec import SiteSpec
+
+        if isinstance(target, dict):
+            target = SiteSpec.model_validate(target)
+        if isinstance(target, SiteSpec):
+            return _import(self._spec_factory)(target)
+        raise TypeError(f"Cannot build a navigator from {target!r}")
+
+    def __getitem__(self, site: str) -> type:
+        if site not in self._loaded:
+            if site not in self:
+                raise KeyError(site)
+            self._loaded[site] = self._resolve(self._targets[site])
+        return self._loaded[site]
+
+    def __contains__(self, site: object) -> bool:
+        if site not in self._targets:
+            self._ensure_discovered()
+        return site in self._targets
+
+    def __iter__(self) -> Iterator[str]:
+        self._ensure_discovered()
+        return iter(list(self._targets))
+
+    def __len__(self) -> int:
+        self._ensure_discovered()
+        return len(self._targets)
+
+
+NAVIGATORS = NavigatorRegistry(
+    {
+        "instagram": "algohealer.navigators.instagram.instagram_navigator:InstagramNavigator",
+    },
+    entry_point_group="algohealer.navigators",
+    spec_factory="algohealer.navigators.base.spec_navigator:navigator_for_spec",
+)
+ASYNC_NAVIGATORS = NavigatorRegistry(
+    {
+        "instagram": "algohealer.navigators.instagram.async_instagram_navigator:AsyncInstagramNavigator",
+    },
+    entry_point_group="algohealer.async_navigators",
+    spec_factory="algohealer.navigators.base.async_spec_navigator:navigator_for_spec",
+)
@@ -0,0 +1,180 @@
+import json
+import os
+import re
+from typing import Dict, List, Literal, NamedTuple, Optional, Tuple, Union
+
+from pydantic import BaseModel, model_validator
+
+DEFAULT_TIMEOUTS = {"click": 1000, "fill": 10000, "wait": 1000}
+
+
+class FlowStep(BaseModel):
+    action: Literal["click", "fill", "wait"]
+    selector: str
+    text: Optional[str] = None
+    args: List[str] = []
+    timeout: Optional[int] = None
+    optional: bool = False
+
+
+class BlockingSpec(BaseModel):
+    resource_types: List[str] = []
+    url_patterns: List[str] = []
+    stub_patterns: List[str] = []
+
+
+class FeedSurface(BaseModel):
+    path: str = ""
+    item: str
+    link: str = ""
+    caption: str = ""
+    image: str = "img[alt]"
+    limit: int = 50
+
+
+class SiteSpec(BaseModel):
+    name: str
+    url_base: str
+    profile_path: str = "{account}"
+    post_url_pattern: str = r"/p/([^/?#]+)"
+    pinned_posts: int = 0
+    max_posts: int = 10
+    blocking: BlockingSpec = BlockingSpec()
+    selectors: Dict[str, str]
+    # Alternatives tried in order when a selector finds nothing
+    fallbacks: Dict[str, List[str]] = {}
+    flows: Dict[str, List[FlowStep]] = {}
+    feeds: Dict[str, FeedSurface] = {}
+    # Flows run on every newly seen post while walking an account
+    post_actions: List[str] = []
+
+    @model_validator(mode="after")
+    def check_flow_selectors(self):
+        for flow in self.post_actions:
+            if flow not in self.flows:
+                raise ValueError(f"Post action '{flow}' is not a flow")
+        for key in self.fallbacks:
+            if key not in self.selectors:
+                raise ValueError(f"Fallbacks given for unknown selector '{key}'")
+        for flow, steps in self.flows.items():
+            for step in steps:
+                if step.selector not in self.selectors:
+                    raise ValueError(
+                        f"Flow '{flow}' uses unknown selector '{step.selector}'"
+                    )
+        return self
+
+
+def load_spec(path: str) -> SiteSpec:
+    with open(path, encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(
+                    f"PyYAML is required to load {path}. Install it or use a JSON spec."
+                )
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    return SiteSpec.model_validate(data)
+
+
+class PlanStep(NamedTuple):
+    action: str
+    selector: str
+    text: Optional[str]
+    args: Tuple[str, ...]
+    timeout: int
+    optional: bool
+    # "<flow>#<index>", identifies the step for the selector circuit breaker
+    key: str = ""
+    fallbacks: Tuple["PlanStep", ...] = ()
+
+    @property
+    def candidates(self) -> Tuple["PlanStep", ...]:
+        return (self,) + self.fallbacks
+
+    def resolve(self, params: Dict[str, str]) -> Tuple[str, Optional[str]]:
+        args = [arg.format(**params) for arg in self.args]
+        text = self.text.format(**params) if self.text is not None else None
+        return self.selector.format(*args), text
+
+
+class Plan(NamedTuple):
+    name: str
+    steps: Tuple[PlanStep, ...]
+
+
+def compile_flow(
+    name: str,
+    steps: List[FlowStep],
+    selectors: Dict[str, str],
+    fallbacks: Optional[Dict[str, List[str]]] = None,
+) -> Plan:
+    fallbacks = fallbacks or {}
+    plan_steps: List[PlanStep] = []
+    for index, flow_step in enumerate(steps):
+        step = PlanStep(
+            action=flow_step.action,
+            selector=selectors[flow_step.selector],
+            text=flow_step.text,
+            args=tuple(flow_step.args),
+            timeout=flow_step.timeout or DEFAULT_TIMEOUTS[flow_step.action],
+            optional=flow_step.optional,
+            key=f"{name}#{index}",
+        )
+        plan_steps.append(
+            step._replace(
+                fallbacks=tuple(
+                    step._replace(selector=selector)
+                    for selector in fallbacks.get(flow_step.selector, [])
+                )
+            )
+        )
+    return Plan(name, tuple(plan_steps))
+
+
+def compile_spec(spec: SiteSpec) -> Dict[str, Plan]:
+    return {
+        name: compile_flow(name, steps, spec.selectors, spec.fallbacks)
+        for name, steps in spec.flows.items()
+    }
+
+
+class SpecSite:
+    name: str
+    url_base: str
+    spec: SiteSpec
+    plans: Dict[str, Plan] = {}
+    post_actions: Tuple[str, ...] = ()
+    post_url_pattern = re.compile(r"/p/([^/?#]+)")
+    pinned_posts = 0
+
+    def post_id_from_url(self, url: str) -> Optional[str]:
+        match = self.post_url_pattern.search(url)
+        return match.group(1) if match else None
+
+
+def apply_spec(spec: Union[SiteSpec, dict, str]):
+    if isinstance(spec, str):
+        spec = load_spec(spec)
+    elif isinstance(spec, dict):
+        spec = SiteSpec.model_validate(spec)
+
+    def decorator(cls):
+        cls.spec = spec
+        cls.plans = compile_spec(spec)
+        cls.name = spec.name
+        cls.url_base = spec.url_base
+        cls.post_url_pattern = re.compile(spec.post_url_pattern)
+        cls.pinned_posts = spec.pinned_posts
+        cls.post_actions = tuple(spec.post_actions)
+        cls.blocked_resource_types = spec.blocking.resource_types
+        cls.blocked_url_patterns = spec.blocking.url_patterns
+        cls.stubbed_url_patterns = spec.blocking.stub_patterns
+        for key, selector in spec.selectors.items():
+            setattr(cls, key, selector)
+        return cls
+
+    return decorator
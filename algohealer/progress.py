@@ -0,0 +1,247 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from rich.table import Table
+
+# Upper bounds in seconds, as in a Prometheus histogram
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}" if hours else f"{minutes}:{seconds:02}"
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        rows = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            rows.append(("+Inf" if bound == float("inf") else f"{bound:g}", total))
+        return rows
+
+
+class SiteMetrics:
+    def __init__(self):
+        self.accounts_planned = 0
+        self.accounts_done = 0
+        self.accounts_failed = 0
+        self.posts = 0
+        self.actions: Dict[Tuple[str, bool], int] = {}
+        self.latency: Dict[str, Histogram] = {}
+        self.current: List[str] = []
+
+    @property
+    def action_count(self) -> int:
+        return sum(self.actions.values())
+
+
+class SessionMetrics:
+    # Counters for a healing session, updated from navigator event hooks.
+    # Hooks fire on the navigator's thread while the live display and the
+    # metrics endpoint read from theirs, hence the lock.
+    def __init__(self):
+        self.started = time.monotonic()
+        self.sites: Dict[str, SiteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def watch(self, site: str, navigator):
+        metrics = self.sites.setdefault(site, SiteMetrics())
+        metrics.accounts_planned = navigator.planned_accounts()
+        navigator.events.on("account_started", self._account_started)
+        navigator.events.on("account_finished", self._account_finished)
+        navigator.events.on("post", self._post)
+        navigator.events.on("action", self._action)
+
+    def _account_started(self, site: str, account: str):
+        with self._lock:
+            self.sites[site].current.append(account)
+
+    def _account_finished(self, site: str, account: str, posts: int, outcome: str):
+        with self._lock:
+            metrics = self.sites[site]
+            if account in metrics.current:
+                metrics.current.remove(account)
+            metrics.accounts_done += 1
+            metrics.accounts_failed += outcome != "ok"
+
+    def _post(self, site: str, account: str, post_id: str):
+        with self._lock:
+            self.sites[site].posts += 1
+
+    def _action(
+        self,
+        site: str,
+        account: Optional[str],
+        action: str,
+        ok: bool,
+        duration: float,
+        post_id: Optional[str],
+    ):
+        with self._lock:
+            metrics = self.sites[site]
+            key = (action, bool(ok))
+            metrics.actions[key] = metrics.actions.get(key, 0) + 1
+            metrics.latency.setdefault(action, Histogram()).observe(duration)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            sites = {}
+            for name, metrics in self.sites.items():
+                eta = None
+                if metrics.accounts_done and metrics.accounts_planned:
+                    remaining = max(0, metrics.accounts_planned - metrics.accounts_done)
+                    eta = elapsed / metrics.accounts_done * remaining
+                sites[name] = {
+                    "current_accounts": list(metrics.current),
+                    "accounts_planned": metrics.accounts_planned,
+                    "accounts_done": metrics.accounts_done,
+                    "accounts_failed": metrics.accounts_failed,
+                    "posts": metrics.posts,
+                    "actions": metrics.action_count,
+                    "actions_failed": sum(
+                        count for (_, ok), count in metrics.actions.items() if not ok
+                    ),
+                    "actions_per_second": metrics.action_count / elapsed
+                    if elapsed
+                    else 0.0,
+                    "eta_seconds": eta,
+                }
+        return {"elapsed_seconds": elapsed, "sites": sites}
+
+    def prometheus(self) -> str:
+        lines = [
+            "# TYPE algohealer_uptime_seconds gauge",
+            f"algohealer_uptime_seconds {time.monotonic() - self.started:.3f}",
+        ]
+        gauges = [
+            ("accounts_planned", "gauge", "accounts_planned"),
+            ("accounts_done_total", "counter", "accounts_done"),
+            ("accounts_failed_total", "counter", "accounts_failed"),
+            ("posts_total", "counter", "posts"),
+        ]
+        with self._lock:
+            for metric, kind, attribute in gauges:
+                lines.append(f"# TYPE algohealer_{metric} {kind}")
+                for site, metrics in self.sites.items():
+                    lines.append(
+                        f"algohealer_{metric}{{{_labels(site=site)}}} "
+                        f"{getattr(metrics, attribute)}"
+                    )
+            lines.append("# TYPE algohealer_actions_total counter")
+            for site, metrics in self.sites.items():
+                for (action, ok), count in sorted(metrics.actions.items()):
+                    outcome = "ok" if ok else "failed"
+                    labels = _labels(site=site, action=action, outcome=outcome)
+                    lines.append(f"algohealer_actions_total{{{labels}}} {count}")
+            lines.append("# TYPE algohealer_action_latency_seconds histogram")
+            for site, metrics in self.sites.items():
+                for action, histogram in sorted(metrics.latency.items()):
+                    labels = _labels(site=site, action=action)
+                    for bound, count in histogram.cumulative():
+                        lines.append(
+                            f'algohealer_action_latency_seconds_bucket{{{labels},le="{bound}"}} {count}'
+                        )
+                    lines.append(
+                        f"algohealer_action_latency_seconds_sum{{{labels}}} {histogram.sum:.6f}"
+                    )
+                    lines.append(
+                        f"algohealer_action_latency_seconds_count{{{labels}}} {histogram.count}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+class ProgressView:
+    # Renderable for rich.live.Live; re-read on every refresh
+    def __init__(self, metrics: SessionMetrics):
+        self._metrics = metrics
+
+    def __rich__(self) -> Table:
+        snapshot = self._metrics.snapshot()
+        table = Table(
+            title=f"Healing for {_format_seconds(snapshot['elapsed_seconds'])}"
+        )
+        table.add_column("Site", justify="left", style="cyan")
+        table.add_column("Current account", justify="left", style="green")
+        table.add_column("Accounts", justify="right")
+        table.add_column("Posts", justify="right")
+        table.add_column("Actions", justify="right")
+        table.add_column("Actions/s", justify="right")
+        table.add_column("ETA", justify="right")
+        for site, row in snapshot["sites"].items():
+            failed = f" [red]({row['actions_failed']} failed)[/red]"
+            table.add_row(
+                site,
+                ", ".join(row["current_accounts"]) or "-",
+                f"{row['accounts_done']}/{row['accounts_planned']}",
+                str(row["posts"]),
+                f"{row['actions']}{failed if row['actions_failed'] else ''}",
+                f"{row['actions_per_second']:.2f}",
+                _format_seconds(row["eta_seconds"]),
+            )
+        return table
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    metrics: SessionMetrics
+
+    def do_GET(self):
+        path = self.path.split("?")[0].rstrip("/")
+        if path == "/metrics":
+            body = self.metrics.prometheus().encode()
+            content_type = "text/plain; version=0.0.4"
+        elif path in ("", "/metrics.json"):
+            body = json.dumps(self.metrics.snapshot()).encode()
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def metrics_server(
+    metrics: SessionMetrics, port: int, host: str = "127.0.0.1"
+) -> Iterator[ThreadingHTTPServer]:
+    # Serves /metrics (Prometheus text) and /metrics.json while the block runs
+    handler = type("MetricsHandler", (_MetricsHandler,), {"metrics": metrics})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
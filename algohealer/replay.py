@@ -0,0 +1,142 @@
+import json
+import os
+import tempfile
+import time
+from typing import List, NamedTuple, Optional
+
+from algohealer.db.conn import SQLiteManager
+from algohealer.db.enums import Settings
+from algohealer.db.ledger import ActionLedger
+from algohealer.healer import navigator_kwargs
+from algohealer.navigators.registry import NAVIGATORS
+
+
+class ReplayResult(NamedTuple):
+    seconds: float
+    posts: int
+    recorded_posts: int
+    navigator: object
+
+
+def state_path(har_path: str) -> str:
+    # Everything besides the traffic that a replay needs to take the same
+    # path through the site: settings, accounts and what was already seen
+    return f"{har_path}.state.json"
+
+
+def _run_flows(
+    navigator, visited: List[str], search: Optional[str], comment: Optional[str]
+):
+    if search:
+        navigator.load_subpage("")
+        navigator.search(search)
+    if comment and visited:
+        navigator.load_subpage(navigator.profile_subpage(visited[0]))
+        if navigator.open_first_post():
+            navigator.comment(comment)
+
+
+def _collect(events, name: str, into: list):
+    events.on(name, lambda **data: into.append(data["account"]))
+
+
+def record_session(
+    site: str,
+    har_path: str,
+    settings: Settings,
+    db_conn: SQLiteManager,
+    search: Optional[str] = None,
+    comment: Optional[str] = None,
+):
+    # A normal healing session on the sync engine, with its traffic saved to
+    # `har_path` (a .zip keeps response bodies as separate entries)
+    accounts = {name: category for name, _, category in db_conn.iter_accounts(site)}
+    state = {
+        "site": site,
+        "settings": settings.model_dump(mode="json"),
+        "crawl_states": db_conn.get_crawl_states(site),
+        "search": search,
+        "comment": comment,
+    }
+    visited: List[str] = []
+    posts: List[str] = []
+    with ActionLedger(db_conn.db_path) as ledger:
+        navigator = NAVIGATORS[site](
+            **navigator_kwargs(settings, db_conn, ledger=ledger),
+            har_mode="record",
+            har_path=har_path,
+        )
+        _collect(navigator.events, "account_started", visited)
+        _collect(navigator.events, "post", posts)
+        try:
+            navigator.run()
+            _run_flows(navigator, visited, search, comment)
+        finally:
+            # The HAR is written when the browser closes
+            navigator.stop()
+    state["accounts"] = [[name, accounts.get(name)] for name in visited]
+    state["posts"] = len(posts)
+    with open(state_path(har_path), "w") as f:
+        json.dump(state, f)
+    return navigator
+
+
+def replay_session(har_path: str, headless: bool = True) -> ReplayResult:
+    # Replays a recording offline: requests are answered from the HAR and
+    # anything missing from it is aborted. The session runs against a
+    # throwaway database and browser profile seeded from the recording.
+    with open(state_path(har_path)) as f:
+        state = json.load(f)
+    site = state["site"]
+    with tempfile.TemporaryDirectory() as directory:
+        db_conn = SQLiteManager(db_path=os.path.join(directory, "replay.db"))
+        try:
+            settings = Settings.model_validate(state["settings"]).model_copy(
+                update={
+                    "user_data_dir": os.path.join(directory, "profile"),
+                    "headless": headless,
+                    "concurrency": 1,
+                    "reuse_browser": False,
+                    # Walk exactly the recorded accounts, in the recorded order
+                    "revisit_ttl_hours": 0,
+                    "session_accounts": 0,
+                    "session_minutes": 0,
+                    "session_actions": 0,
+                    "metrics_port": 0,
+                    "trace_dir": "",
+                }
+            )
+            db_conn.upsert_settings(settings)
+            db_conn.import_accounts(
+                (name, site, category) for name, category in state["accounts"]
+            )
+            for account, crawl in state["crawl_states"].items():
+                db_conn.record_crawl(
+                    site,
+                    account,
+                    crawl["seen_posts"],
+                    visited_at=crawl["last_visited_at"],
+                )
+
+            posts: List[str] = []
+            start = time.perf_counter()
+            navigator = NAVIGATORS[site](
+                **navigator_kwargs(settings, db_conn),
+                har_mode="replay",
+                har_path=har_path,
+            )
+            _collect(navigator.events, "post", posts)
+            try:
+                navigator.run()
+                _run_flows(
+                    navigator,
+                    [name for name, _ in state["accounts"]],
+                    state["search"],
+                    state["comment"],
+                )
+            finally:
+                navigator.stop()
+            seconds = time.perf_counter() - start
+        finally:
+            db_conn.close()
+    return ReplayResult(seconds, len(posts), state["posts"], navigator)
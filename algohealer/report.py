@@ -0,0 +1,77 @@
+import time
+from typing import List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from algohealer.db.conn import SQLiteManager
+
+
+def _stats_table(title: str, label: str, rows: List[dict]) -> Table:
+    table = Table(title=title)
+    table.add_column(label, justify="left", style="cyan")
+    table.add_column("Actions", justify="right")
+    table.add_column("Succeeded", justify="right", style="green")
+    table.add_column("Success rate", justify="right", style="green")
+    table.add_column("Avg latency", justify="right")
+    for row in rows:
+        table.add_row(
+            str(row["key"]),
+            str(row["actions"]),
+            str(row["succeeded"]),
+            f"{row['success_rate']:.0%}",
+            f"{row['avg_latency_ms']:.0f} ms",
+        )
+    return table
+
+
+def _throughput_table(rows: List[dict], bucket_seconds: float) -> Table:
+    time_format = "%Y-%m-%d" if bucket_seconds >= 86400 else "%Y-%m-%d %H:%M"
+    table = Table(title="Throughput")
+    table.add_column("From", justify="left", style="cyan")
+    table.add_column("Actions", justify="right")
+    table.add_column("Succeeded", justify="right", style="green")
+    table.add_column("Actions/min", justify="right")
+    for row in rows:
+        table.add_row(
+            time.strftime(time_format, time.localtime(row["started_at"])),
+            str(row["actions"]),
+            str(row["succeeded"]),
+            f"{row['actions'] / (bucket_seconds / 60):.2f}",
+        )
+    return table
+
+
+def print_action_report(
+    console: Console,
+    db_conn: SQLiteManager,
+    site: str,
+    since: Optional[float] = None,
+    bucket_seconds: float = 3600,
+    top: int = 20,
+) -> bool:
+    by_account = db_conn.get_action_stats(site, group_by="account", since=since)
+    if not by_account:
+        console.print(f"[yellow]No recorded actions for {site} yet.[/yellow]")
+        return False
+    console.print(
+        _stats_table(
+            "By action", "Action", db_conn.get_action_stats(site, "action", since)
+        )
+    )
+    console.print(
+        _stats_table(
+            "By category",
+            "Category",
+            db_conn.get_action_stats(site, "category", since),
+        )
+    )
+    console.print(_stats_table("By account", "Account", by_account[:top]))
+    if len(by_account) > top:
+        console.print(f"[dim]... and {len(by_account) - top} more accounts[/dim]")
+    console.print(
+        _throughput_table(
+            db_conn.get_action_throughput(site, bucket_seconds, since), bucket_seconds
+        )
+    )
+    return True
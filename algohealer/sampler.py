@@ -0,0 +1,101 @@
+import heapq
+import math
+import random
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from algohealer.db.enums import CATEGORIES
+
+
+def parse_weights(value: str) -> Dict[str, float]:
+    # "travel=2, food=0.5" -> {"travel": 2.0, "food": 0.5}
+    weights = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        category, _, weight = item.partition("=")
+        category = category.strip().lower()
+        if category not in CATEGORIES:
+            raise ValueError(
+                f"Unknown category '{category}'. Use one of {', '.join(CATEGORIES)}."
+            )
+        try:
+            weights[category] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight for '{category}': '{weight.strip()}'")
+        if weights[category] < 0:
+            raise ValueError(f"The weight for '{category}' cannot be negative")
+    return weights
+
+
+class AccountCandidate(NamedTuple):
+    name: str
+    category: str
+    last_visited_at: Optional[float]
+    # Sessions that engaged with the account and posts engaged with in them
+    visits: int = 0
+    posts: int = 0
+
+
+class WeightedSampler:
+    # Draws a weighted sample without replacement in one pass with the
+    # Efraimidis-Spirakis reservoir: every account gets the key u ** (1 / w)
+    # and the k largest keys win, so with a k memory is O(k) however big the
+    # catalog. A time or action budget gives no k up front (how many accounts
+    # fit depends on how the session goes), so then every due account is
+    # ranked and memory is O(n) in the candidates.
+    #
+    # An account's weight is the product of
+    # - its category's interest weight, split over the category's accounts so
+    #   a large category does not crowd out a small one,
+    # - staleness, rising from `min_staleness` right after a visit towards 1
+    #   with a time constant of `staleness_hours` (never visited counts as 1),
+    # - engagement yield, posts engaged with per visit (smoothed, clamped).
+    def __init__(
+        self,
+        interest_weights: Dict[str, float],
+        category_counts: Optional[Dict[str, int]] = None,
+        staleness_hours: float = 24.0,
+        min_staleness: float = 0.05,
+        yield_bounds: tuple = (0.25, 4.0),
+        rng: Optional[random.Random] = None,
+    ):
+        counts = category_counts or {}
+        self._category_weights = {
+            category: weight / max(1, counts.get(category, 1))
+            for category, weight in interest_weights.items()
+        }
+        self._staleness_seconds = staleness_hours * 3600
+        self._min_staleness = min_staleness
+        self._yield_bounds = yield_bounds
+        self._rng = rng or random.Random()
+
+    def weight(self, candidate: AccountCandidate, now: float) -> float:
+        weight = self._category_weights.get(candidate.category, 0.0)
+        if candidate.last_visited_at is not None and self._staleness_seconds > 0:
+            age = max(0.0, now - candidate.last_visited_at)
+            staleness = 1 - math.exp(-age / self._staleness_seconds)
+            weight *= max(self._min_staleness, staleness)
+        low, high = self._yield_bounds
+        engagement = (candidate.posts + 1) / (candidate.visits + 1)
+        return weight * min(high, max(low, engagement))
+
+    def sample(
+        self,
+        candidates: Iterable[AccountCandidate],
+        k: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> List[AccountCandidate]:
+        # Highest priority first; without k every candidate is ranked
+        now = time.time() if now is None else now
+        heap: list = []
+        for index, candidate in enumerate(candidates):
+            weight = self.weight(candidate, now)
+            if weight <= 0:
+                continue
+            # log(u) / w orders like u ** (1 / w) without underflowing
+            key = math.log(1.0 - self._rng.random()) / weight
+            entry = (key, index, candidate)
+            if k is None or len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif key > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+        return [candidate for _, _, candidate in sorted(heap, reverse=True)]
@@ -0,0 +1,73 @@
+import random
+import time
+
+import click
+
+from algohealer.classifier import (
+    FeedPost,
+    default_classifier,
+    feed_health,
+    load_keywords,
+)
+from algohealer.db.enums import CATEGORIES
+
+FILLER = "the a and with my today love new best day time life good so happy".split()
+
+
+def synthetic_posts(count: int, words: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    keywords = [word for words in load_keywords().values() for word in words]
+    posts = []
+    for index in range(count):
+        caption = " ".join(
+            rng.choice(keywords) if rng.random() < 0.2 else rng.choice(FILLER)
+            for _ in range(words)
+        )
+        tag = rng.choice(keywords)
+        posts.append(
+            FeedPost(
+                post_id=str(index),
+                url=f"https://example.com/p/{index}/",
+                caption=f"{caption} #{tag}gram #{rng.choice(FILLER)}",
+                alt_text=f"May be an image of {rng.choice(keywords)}",
+            )
+        )
+    return posts
+
+
+@click.command()
+@click.option("--posts", default=20000, help="Number of synthetic posts to score.")
+@click.option("--words", default=30, help="Caption length in words.")
+@click.option("--runs", default=5, help="Timed runs (the best one is reported).")
+@click.option(
+    "--min-posts-per-min",
+    type=float,
+    default=None,
+    help="Fail if scoring is slower than this.",
+)
+def main(posts: int, words: int, runs: int, min_posts_per_min: float):
+    batch = synthetic_posts(posts, words)
+    classifier = default_classifier()
+    interests = CATEGORIES[:3]
+
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        results = classifier.classify(batch, interests)
+        best = min(best, time.perf_counter() - start)
+
+    rate = posts / best * 60
+    health = feed_health("synthetic", results)
+    click.echo(
+        f"Classified {posts} posts in {best * 1000:.0f} ms "
+        f"({rate:,.0f} posts/min), feed health {health.health:.0%}"
+    )
+    if min_posts_per_min is not None and rate < min_posts_per_min:
+        click.secho(
+            f"{rate:,.0f} posts/min is below {min_posts_per_min:,.0f}", fg="red"
+        )
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import click
+
+from algohealer.catalog import read_catalog, write_catalog
+from algohealer.db.enums import CATEGORIES
+
+
+def synthetic_catalog(path: str, count: int, seed: int = 0) -> int:
+    rng = random.Random(seed)
+    rows = (
+        (f"account_{index}", "instagram", rng.choice(CATEGORIES))
+        for index in range(count)
+    )
+    return write_catalog(path, rows)
+
+
+def timed_import(db_conn, path: str) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    with read_catalog(path) as rows:
+        result = db_conn.import_accounts(rows)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+@click.command()
+@click.option("--accounts", default=200000, help="Number of synthetic accounts.")
+@click.option("--format", "fmt", type=click.Choice(["jsonl", "csv"]), default="jsonl")
+@click.option(
+    "--max-peak-mb",
+    type=float,
+    default=None,
+    help="Fail if an import allocates more than this at its peak.",
+)
+def main(accounts: int, fmt: str, max_peak_mb: float):
+    directory = tempfile.mkdtemp()
+    os.environ["ALGOHEALER_DB_PATH"] = os.path.join(directory, "bench.db")
+    from algohealer.db.conn import SQLiteManager
+
+    path = os.path.join(directory, f"catalog.{fmt}")
+    synthetic_catalog(path, accounts)
+    db_conn = SQLiteManager()
+
+    peaks = []
+    for label in ("first import", "re-import"):
+        result, seconds, peak = timed_import(db_conn, path)
+        peaks.append(peak)
+        click.echo(
+            f"{label}: {result['rows']} rows in {seconds:.2f}s "
+            f"({result['rows'] / seconds:,.0f} rows/s), {result['added']} added, "
+            f"peak {peak / 1_000_000:.1f} MB"
+        )
+    total = db_conn.cursor.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+    db_conn.close()
+    click.echo(f"{total} accounts stored")
+
+    if total != accounts:
+        click.secho("Re-importing duplicated accounts", fg="red")
+        raise SystemExit(1)
+    if max_peak_mb is not None and max(peaks) / 1_000_000 > max_peak_mb:
+        click.secho(f"Peak allocation is above {max_peak_mb} MB", fg="red")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
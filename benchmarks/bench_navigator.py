@@ -0,0 +1,331 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from algohealer.db.conn import SQLiteManager
+from algohealer.db.enums import CATEGORIES, Settings
+from algohealer.navigators.base.tracing import Span
+from algohealer.navigators.instagram.async_instagram_navigator import (
+    AsyncInstagramNavigator,
+)
+from algohealer.navigators.instagram.instagram_navigator import InstagramNavigator
+from benchmarks.fake_instagram.server import FakeInstagramServer
+
+
+class BenchConfig(NamedTuple):
+    engine: str
+    headless: bool
+    block_resources: bool
+    concurrency: int = 1
+    batch_actions: bool = True
+    prefetch: bool = False
+
+    @property
+    def label(self) -> str:
+        parts = [
+            self.engine if self.engine == "sync" else f"async x{self.concurrency}",
+            "headless" if self.headless else "headed",
+            "blocking" if self.block_resources else "no blocking",
+        ]
+        if not self.batch_actions:
+            parts.append("unbatched")
+        if self.prefetch:
+            parts.append("prefetch")
+        return ", ".join(parts)
+
+
+class BenchResult(NamedTuple):
+    config: BenchConfig
+    posts: int
+    page_loads: int
+    like_seconds: float
+    flows: Dict[str, float]
+    steps: List[dict]
+    bytes_served: int
+
+    @property
+    def posts_per_second(self) -> float:
+        return self.posts / self.like_seconds if self.like_seconds else 0.0
+
+    @property
+    def loads_per_second(self) -> float:
+        return self.page_loads / self.like_seconds if self.like_seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "config": self.config._asdict(),
+            "posts": self.posts,
+            "page_loads": self.page_loads,
+            "like_seconds": self.like_seconds,
+            "posts_per_second": self.posts_per_second,
+            "loads_per_second": self.loads_per_second,
+            "flows": self.flows,
+            "steps": self.steps,
+            "bytes_served": self.bytes_served,
+        }
+
+
+def _prepare_db(accounts: List[str]) -> SQLiteManager:
+    # Never point the benchmark at the user's real database
+    os.environ["ALGOHEALER_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+    db_conn = SQLiteManager(drop=True)
+    db_conn.upsert_settings(Settings(interests=CATEGORIES))
+    for index, name in enumerate(accounts):
+        db_conn.add_account(name, "instagram", CATEGORIES[index % len(CATEGORIES)])
+    return db_conn
+
+
+def _count_posts(db_conn: SQLiteManager) -> int:
+    states = db_conn.get_crawl_states(InstagramNavigator.name)
+    return sum(len(state["seen_posts"]) for state in states.values())
+
+
+def _reset_crawl_states(db_conn: SQLiteManager):
+    # Every configuration walks the same posts from scratch
+    with db_conn.transaction() as cursor:
+        cursor.execute("DELETE FROM crawl_state")
+
+
+def _count_loads(spans: List[Span]) -> int:
+    return sum(span.name == "load" for span in spans)
+
+
+def _navigator_kwargs(config: BenchConfig, server, db_conn, user_data_dir) -> dict:
+    return {
+        "user_data_dir": user_data_dir,
+        "channel": "chromium",
+        "headless": config.headless,
+        "db_conn": db_conn,
+        "url_base": server.url,
+        "actions_per_minute": 0,
+        "jitter": 0,
+        "block_resources": config.block_resources,
+        "batch_actions": config.batch_actions,
+        "prefetch": config.prefetch,
+    }
+
+
+def _timed(flows: Dict[str, float], name: str, func):
+    start = time.perf_counter()
+    func()
+    flows[name] = time.perf_counter() - start
+
+
+async def _atimed(flows: Dict[str, float], name: str, coroutine):
+    start = time.perf_counter()
+    await coroutine
+    flows[name] = time.perf_counter() - start
+
+
+def run_sync(config, server, db_conn, accounts, max_posts) -> tuple:
+    navigator = InstagramNavigator(
+        **_navigator_kwargs(config, server, db_conn, tempfile.mkdtemp())
+    )
+    flows: Dict[str, float] = {}
+    try:
+        start = time.perf_counter()
+        navigator.like_new_posts(max_posts=max_posts)
+        like_seconds = time.perf_counter() - start
+        like_spans = list(navigator.tracer.spans)
+        posts = _count_posts(db_conn)
+
+        navigator.load_subpage(accounts[0])
+        _timed(flows, "follow_account", navigator.follow_account)
+        navigator.open_first_post()
+        _timed(flows, "comment", lambda: navigator.comment("Lovely!"))
+        navigator.load(server.url)
+        _timed(flows, "search", lambda: navigator.search(accounts[-1]))
+    finally:
+        navigator.stop()
+    return navigator.tracer, like_spans, posts, like_seconds, flows
+
+
+async def _run_async(config, server, db_conn, accounts, max_posts) -> tuple:
+    navigator = AsyncInstagramNavigator(
+        **_navigator_kwargs(config, server, db_conn, tempfile.mkdtemp()),
+        concurrency=config.concurrency,
+    )
+    flows: Dict[str, float] = {}
+    await navigator.start()
+    try:
+        start = time.perf_counter()
+        await navigator.like_new_posts(max_posts=max_posts)
+        like_seconds = time.perf_counter() - start
+        like_spans = list(navigator.tracer.spans)
+        posts = _count_posts(db_conn)
+
+        page = navigator._pages[0]
+        await navigator.load_subpage(page, accounts[0])
+        await _atimed(flows, "follow_account", navigator.follow_account(page))
+        await navigator.open_first_post(page)
+        await _atimed(flows, "comment", navigator.comment(page, "Lovely!"))
+        await navigator.load(page, server.url)
+        await _atimed(flows, "search", navigator.search(page, accounts[-1]))
+    finally:
+        await navigator.stop()
+    return navigator.tracer, like_spans, posts, like_seconds, flows
+
+
+def run_config(
+    config: BenchConfig, server, db_conn, accounts, max_posts
+) -> BenchResult:
+    server.reset_counters()
+    _reset_crawl_states(db_conn)
+    if config.engine == "sync":
+        tracer, like_spans, posts, like_seconds, flows = run_sync(
+            config, server, db_conn, accounts, max_posts
+        )
+    else:
+        tracer, like_spans, posts, like_seconds, flows = asyncio.run(
+            _run_async(config, server, db_conn, accounts, max_posts)
+        )
+    return BenchResult(
+        config=config,
+        posts=posts,
+        page_loads=_count_loads(like_spans),
+        like_seconds=like_seconds,
+        flows=flows,
+        steps=tracer.summary(),
+        bytes_served=server.bytes_served,
+    )
+
+
+def _print_results(console: Console, results: List[BenchResult]):
+    table = Table(title="Navigator throughput (fake Instagram)")
+    table.add_column("Configuration", style="cyan")
+    table.add_column("Posts/s", justify="right", style="green")
+    table.add_column("Loads/s", justify="right")
+    table.add_column("like_new_posts", justify="right")
+    table.add_column("follow", justify="right")
+    table.add_column("comment", justify="right")
+    table.add_column("search", justify="right")
+    table.add_column("click p50/p95", justify="right")
+    table.add_column("Served", justify="right")
+    for result in results:
+        click_step = next(
+            (row for row in result.steps if row["name"] == "wait_check_click"), None
+        )
+        table.add_row(
+            result.config.label,
+            f"{result.posts_per_second:.2f}",
+            f"{result.loads_per_second:.2f}",
+            f"{result.like_seconds:.1f} s",
+            *(
+                f"{result.flows.get(flow, 0) * 1000:.0f} ms"
+                for flow in ("follow_account", "comment", "search")
+            ),
+            f"{click_step['p50'] * 1000:.0f}/{click_step['p95'] * 1000:.0f} ms"
+            if click_step
+            else "-",
+            f"{result.bytes_served / 1_000_000:.1f} MB",
+        )
+    console.print(table)
+
+
+def build_configs(
+    headed: bool, concurrency: int, unbatched: bool, prefetch: bool
+) -> List[BenchConfig]:
+    configs = []
+    for headless in [True, False] if headed else [True]:
+        for block_resources in [False, True]:
+            for batch_actions in [True, False] if unbatched else [True]:
+                for prefetch_next in [False, True] if prefetch else [False]:
+                    configs.append(
+                        BenchConfig(
+                            "sync",
+                            headless,
+                            block_resources,
+                            1,
+                            batch_actions,
+                            prefetch_next,
+                        )
+                    )
+                    configs.append(
+                        BenchConfig(
+                            "async",
+                            headless,
+                            block_resources,
+                            concurrency,
+                            batch_actions,
+                            prefetch_next,
+                        )
+                    )
+    return configs
+
+
+@click.command()
+@click.option("--accounts", default=8, help="Number of fake accounts to crawl.")
+@click.option("--posts", default=12, help="Posts on each fake profile.")
+@click.option("--max-posts", default=10, help="max_posts passed to like_new_posts.")
+@click.option("--latency-ms", default=30, help="Simulated server latency.")
+@click.option("--concurrency", default=4, help="Tabs used by the async engine.")
+@click.option("--headed", is_flag=True, help="Also benchmark headed browsers.")
+@click.option(
+    "--unbatched",
+    is_flag=True,
+    help="Also benchmark one Playwright call per DOM action (batch_actions off).",
+)
+@click.option(
+    "--prefetch",
+    is_flag=True,
+    help="Also benchmark loading the next account in a spare tab.",
+)
+@click.option("--json-output", type=click.Path(), help="Write results as JSON.")
+@click.option(
+    "--min-posts-per-sec",
+    type=float,
+    default=None,
+    help="Fail if any configuration is slower than this.",
+)
+def main(
+    accounts: int,
+    posts: int,
+    max_posts: int,
+    latency_ms: int,
+    concurrency: int,
+    headed: bool,
+    unbatched: bool,
+    prefetch: bool,
+    json_output: Optional[str],
+    min_posts_per_sec: Optional[float],
+):
+    console = Console()
+    names = [f"bench_account_{index}" for index in range(accounts)]
+    server = FakeInstagramServer(
+        names, posts_per_account=posts, latency_ms=latency_ms
+    ).start()
+    db_conn = _prepare_db(names)
+    try:
+        results = [
+            run_config(config, server, db_conn, names, max_posts)
+            for config in build_configs(headed, concurrency, unbatched, prefetch)
+        ]
+    finally:
+        db_conn.close()
+        server.stop()
+
+    _print_results(console, results)
+    if json_output:
+        with open(json_output, "w") as f:
+            json.dump([result.as_dict() for result in results], f, indent=2)
+
+    if min_posts_per_sec is not None:
+        slow = [r for r in results if r.posts_per_second < min_posts_per_sec]
+        for result in slow:
+            console.print(
+                f"[red]{result.config.label}: {result.posts_per_second:.2f} posts/s "
+                f"is below {min_posts_per_sec}[/red]"
+            )
+        if slow:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import re
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+import click
+
+# Modules that must stay out of the CLI's import path until a command needs them
+HEAVY_MODULES = ["playwright", "questionary", "rich", "pydantic", "sqlite3", "numpy"]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return rows
+
+
+def loaded_heavy_modules(module: str) -> List[str]:
+    script = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return [name for name in result.stdout.strip().split(",") if name]
+
+
+def cli_wall_times(runs: int) -> List[float]:
+    script = (
+        "import time, sys; start = time.perf_counter(); "
+        "from algohealer.cli import cli; "
+        "sys.argv = ['algohealer', 'not-a-site']; "
+        "cli(standalone_mode=False); "
+        "print(time.perf_counter() - start, file=sys.stderr)"
+    )
+    times = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        )
+        times.append(float(result.stderr.strip().splitlines()[-1]) * 1000)
+    return times
+
+
+@click.command()
+@click.option("--runs", default=10, help="Number of CLI invocations to time.")
+@click.option(
+    "--max-ms",
+    type=float,
+    default=None,
+    help="Fail if the median import-and-reject time exceeds this.",
+)
+@click.option("--top", default=10, help="Slowest imports to list.")
+def main(runs: int, max_ms: float, top: int):
+    failed = False
+
+    heavy = loaded_heavy_modules("algohealer.cli")
+    if heavy:
+        click.secho(f"algohealer.cli eagerly imports: {', '.join(heavy)}", fg="red")
+        failed = True
+
+    rows = import_times("algohealer.cli")
+    total = next(cumulative for name, _, cumulative in rows if name == "algohealer.cli")
+    click.echo(f"import algohealer.cli: {total / 1000:.1f} ms cumulative")
+    for name, own, cumulative in sorted(rows, key=lambda row: row[1], reverse=True)[
+        :top
+    ]:
+        click.echo(f"  {own / 1000:7.1f} ms self {cumulative / 1000:7.1f} ms  {name}")
+
+    times = cli_wall_times(runs)
+    median = statistics.median(times)
+    click.echo(
+        f"'algohealer not-a-site': median {median:.1f} ms, max {max(times):.1f} ms "
+        f"over {runs} runs"
+    )
+    if max_ms is not None and median > max_ms:
+        click.secho(f"Median startup {median:.1f} ms exceeds {max_ms} ms", fg="red")
+        failed = True
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
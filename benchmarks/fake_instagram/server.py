@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+from urllib.parse import parse_qs, urlparse
+
+from algohealer.db.enums import CATEGORIES
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "index.html")
+
+CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".mp4": "video/mp4",
+    ".woff2": "font/woff2",
+    ".js": "application/javascript",
+}
+
+
+class FakeInstagramServer:
+    def __init__(
+        self,
+        accounts: List[str],
+        posts_per_account: int = 12,
+        feed_posts: int = 24,
+        latency_ms: int = 30,
+        asset_kb: int = 150,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.accounts = accounts
+        self.posts_per_account = posts_per_account
+        self.latency = latency_ms / 1000
+        self.asset_bytes = asset_kb * 1024
+        self.bytes_served = 0
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        with open(TEMPLATE_PATH, "r") as f:
+            config = {
+                "posts": posts_per_account,
+                "feed_posts": feed_posts,
+                "categories": CATEGORIES,
+            }
+            self._page = f.read().replace("__FAKE_CONFIG__", json.dumps(config))
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeInstagramServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def reset_counters(self):
+        with self._lock:
+            self.bytes_served = 0
+            self.requests_served = 0
+
+    def _post(self, account: str, index: int) -> dict:
+        category = CATEGORIES[index % len(CATEGORIES)]
+        return {
+            "shortcode": f"{account}-{index}",
+            "caption": f"{account} sharing some {category} #{category}",
+            "has_next": index + 1 < self.posts_per_account,
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body: bytes, content_type: str, delay: float = 0.0):
+                if delay:
+                    time.sleep(delay)
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server.bytes_served += len(body)
+                    server.requests_served += 1
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                if parsed.path == "/api/post":
+                    post = server._post(query["account"][0], int(query["index"][0]))
+                    self._send(
+                        json.dumps(post).encode(), "application/json", server.latency
+                    )
+                elif parsed.path == "/api/search":
+                    q = query.get("q", [""])[0].lower()
+                    matches = [name for name in server.accounts if q in name.lower()]
+                    self._send(
+                        json.dumps(matches[:10]).encode(),
+                        "application/json",
+                        server.latency,
+                    )
+                elif parsed.path.startswith("/static/"):
+                    extension = os.path.splitext(parsed.path)[1]
+                    if extension == ".js":
+                        body = b"window.__benchAnalytics = true;"
+                    else:
+                        body = b"\0" * server.asset_bytes
+                    self._send(
+                        body,
+                        CONTENT_TYPES.get(extension, "application/octet-stream"),
+                        server.latency,
+                    )
+                else:
+                    self._send(server._page.encode(), "text/html", server.latency)
+
+        return Handler
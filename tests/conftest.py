@@ -0,0 +1,12 @@
+import pytest
+
+from algohealer.db.conn import SQLiteManager
+from algohealer.db.enums import Settings
+
+
+@pytest.fixture
+def db(tmp_path):
+    db_conn = SQLiteManager(db_path=str(tmp_path / "algohealer.db"))
+    db_conn.upsert_settings(Settings(interests=["travel", "food"]))
+    yield db_conn
+    db_conn.close()
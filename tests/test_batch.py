@@ -0,0 +1,60 @@
+import pytest
+
+from algohealer.navigators.base.batch import BatchStep, can_batch, split_selector
+from algohealer.navigators.base.core import NavigatorCore
+
+
+@pytest.mark.parametrize(
+    "selector, parts",
+    [
+        ('svg[aria-label="Like"]', ('svg[aria-label="Like"]', None)),
+        ('button > div:has-text("Follow")', ("button > div", "Follow")),
+        ('div:has-text("")', ("div", "")),
+    ],
+)
+def test_split_selector(selector, parts):
+    assert split_selector(selector) == parts
+    assert can_batch(selector)
+
+
+@pytest.mark.parametrize(
+    "selector",
+    [
+        'text="Log in"',
+        "css=button",
+        'div >> text="Post"',
+        'div:has-text("a"):has-text("b")',
+        'div:has-text("Post") span',
+        "button:visible",
+        ':has-text("Follow")',
+    ],
+)
+def test_playwright_only_selectors_cannot_batch(selector):
+    assert split_selector(selector) is None
+    assert not can_batch(selector)
+    with pytest.raises(ValueError):
+        BatchStep.wait(selector)
+
+
+def test_batch_steps():
+    step = BatchStep.wait('a:has-text("More")', timeout=0, optional=True)
+    assert (step.action, step.css, step.has_text, step.optional) == (
+        "wait",
+        "a",
+        "More",
+        True,
+    )
+    assert NavigatorCore._scroll_step("up", 300) == BatchStep.scroll(-300)
+    with pytest.raises(ValueError):
+        NavigatorCore._scroll_step("left", 300)
+
+
+def test_probes_batch_only_when_every_selector_can(db):
+    nav = NavigatorCore("instagram", "https://www.instagram.com/", db)
+    steps = nav._probe_batch(["svg", 'div:has-text("Post")'])
+    assert [(step.css, step.timeout) for step in steps] == [("svg", 0), ("div", 0)]
+    assert nav._probe_batch(["svg", 'text="Post"']) is None
+    unbatched = NavigatorCore(
+        "instagram", "https://www.instagram.com/", db, batch_actions=False
+    )
+    assert unbatched._probe_batch(["svg"]) is None
@@ -0,0 +1,74 @@
+import pytest
+
+from algohealer.db.cache import CachedSQLiteManager
+from algohealer.db.conn import SQLiteManager
+from algohealer.db.enums import Settings
+
+
+@pytest.fixture
+def cached(tmp_path):
+    db_conn = CachedSQLiteManager(
+        db_path=str(tmp_path / "algohealer.db"), check_interval=0
+    )
+    db_conn.upsert_settings(Settings(interests=["travel", "food"]))
+    yield db_conn
+    db_conn.close()
+
+
+def names(db_conn) -> list:
+    return [
+        account["name"] for account in db_conn.get_all_accounts_for_site("instagram")
+    ]
+
+
+def test_reads_are_served_from_the_cache(cached):
+    cached.add_account("t0", "instagram", "travel")
+    assert names(cached) == ["t0"]
+    # A write on the same connection that bypasses the wrapper is not seen
+    cached.cursor.execute(
+        "INSERT INTO accounts (name, site, category) VALUES ('t1', 'instagram', 'travel')"
+    )
+    cached.connection.commit()
+    assert names(cached) == ["t0"]
+    cached.invalidate()
+    assert names(cached) == ["t0", "t1"]
+
+
+def test_own_writes_invalidate(cached):
+    assert names(cached) == []
+    cached.import_accounts([("t0", "instagram", "travel")])
+    assert names(cached) == ["t0"]
+    cached.add_accounts([{"name": "f0", "site": "instagram", "category": "food"}])
+    assert sorted(names(cached)) == ["f0", "t0"]
+
+
+def test_other_connections_invalidate_through_data_version(cached):
+    assert names(cached) == []
+    other = SQLiteManager(db_path=cached.db_path)
+    other.add_account("t0", "instagram", "travel")
+    other.close()
+    assert names(cached) == ["t0"]
+
+
+def test_data_version_is_checked_at_most_once_per_interval(tmp_path, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("algohealer.db.cache.time.monotonic", lambda: clock[0])
+    path = str(tmp_path / "algohealer.db")
+    cached = CachedSQLiteManager(db_path=path, check_interval=1.0)
+    cached.upsert_settings(Settings(interests=["travel"]))
+    clock[0] = 10.0
+    assert names(cached) == []
+    other = SQLiteManager(db_path=path)
+    other.add_account("t0", "instagram", "travel")
+    other.close()
+    clock[0] = 10.5
+    assert names(cached) == []
+    clock[0] = 11.0
+    assert names(cached) == ["t0"]
+    cached.close()
+
+
+def test_settings_are_copied_out_of_the_cache(cached):
+    settings = cached.get_settings()
+    settings.interests.append("health")
+    assert cached.get_settings().interests == ["travel", "food"]
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from algohealer.classifier import (
+    ContentClassifier,
+    FeedPost,
+    default_classifier,
+    feed_health,
+)
+from algohealer.db.enums import Category
+
+KEYWORDS = {
+    Category.travel: ["travel", "trip", "beach"],
+    Category.food: ["food", "recipe", "beach"],
+    Category.finance: ["money", "stocks"],
+}
+
+
+def post(caption: str, alt_text: str = "") -> FeedPost:
+    return FeedPost(None, "https://demo.test/p/1", caption, alt_text)
+
+
+@pytest.fixture
+def classifier() -> ContentClassifier:
+    return ContentClassifier(KEYWORDS)
+
+
+def test_posts_take_their_best_category(classifier):
+    results = classifier.classify(
+        [
+            post("Weekend trip, travel light"),
+            post("", alt_text="A recipe with lots of food"),
+            post("Just a cat"),
+        ],
+        interests=["travel"],
+    )
+    assert [result.category for result in results] == [
+        Category.travel,
+        Category.food,
+        None,
+    ]
+    assert [result.engage for result in results] == [True, False, False]
+    assert results[2].score == 0.0
+
+
+def test_shared_keywords_count_for_less(classifier):
+    shared, own = classifier.score(["beach", "trip"])
+    assert shared[0] == pytest.approx(shared[1])
+    assert shared.max() < own.max()
+
+
+def test_hashtag_compounds_are_split(classifier):
+    assert classifier.vectorize(["#tripmoney"]).sum() == 2
+    # Plain words are not split, and unknown hashtags add nothing
+    assert classifier.vectorize(["tripmoney #nothing"]).sum() == 0
+
+
+def test_scores_are_cosine_similarities(classifier):
+    scores = classifier.score(["travel trip beach money", "", "food food food"])
+    assert scores.shape == (3, len(KEYWORDS))
+    assert np.all((scores >= 0) & (scores <= 1 + 1e-6))
+    assert not scores[1].any()
+
+
+def test_feed_health_counts_aligned_posts(classifier):
+    results = classifier.classify(
+        [post("travel"), post("stocks"), post("nothing"), post("trip")],
+        interests=[Category.travel],
+    )
+    health = feed_health("home", results)
+    assert (health.posts, health.aligned, health.health) == (4, 2, 0.5)
+    assert health.categories == {"travel": 2, "finance": 1, "other": 1}
+    assert feed_health("explore", []).health == 0.0
+    assert classifier.classify([], interests=["travel"]) == []
+
+
+def test_default_keywords_cover_every_category():
+    assert set(default_classifier().categories) == set(Category)
@@ -0,0 +1,62 @@
+from algohealer.navigators.base.core import NavigatorCore, SpecNavigatorCore
+from algohealer.navigators.base.pipeline import AccountTask
+from algohealer.navigators.spec import apply_spec
+
+NOW = 1_000_000.0
+HOUR = 3600
+
+
+@apply_spec(
+    {
+        "name": "demo",
+        "url_base": "https://demo.test/",
+        "pinned_posts": 2,
+        "selectors": {},
+    }
+)
+class DemoSite(SpecNavigatorCore, NavigatorCore):
+    pass
+
+
+def seen(db, account: str = "t0") -> list:
+    return db.get_crawl_states("demo")[account]["seen_posts"]
+
+
+def test_new_posts_go_first_without_duplicates(db):
+    db.record_crawl("demo", "t0", ["p2", "p1"], visited_at=NOW)
+    db.record_crawl("demo", "t0", ["p4", "p3", "p2"], visited_at=NOW + HOUR)
+    assert seen(db) == ["p4", "p3", "p2", "p1"]
+    assert db.get_crawl_states("demo")["t0"]["last_visited_at"] == NOW + HOUR
+
+
+def test_only_the_newest_posts_are_kept(db):
+    db.record_crawl("demo", "t0", [f"p{i}" for i in range(5)], keep=3)
+    db.record_crawl("demo", "t0", ["new"], keep=3)
+    assert seen(db) == ["new", "p0", "p1"]
+
+
+def test_states_are_per_site(db):
+    db.record_crawl("demo", "t0", ["p1"])
+    db.record_crawl("other", "t0", ["q1"])
+    assert seen(db) == ["p1"]
+
+
+def test_revisit_ttl(db, monkeypatch):
+    monkeypatch.setattr("algohealer.navigators.base.core.time.time", lambda: NOW)
+    site = DemoSite(db_conn=db, revisit_ttl_hours=2)
+    assert site.is_due(None)
+    assert not site.is_due({"last_visited_at": NOW - HOUR})
+    assert site.is_due({"last_visited_at": NOW - 2 * HOUR})
+    assert DemoSite(db_conn=db).is_due({"last_visited_at": NOW})
+
+
+def test_seen_posts_stop_the_walk_after_the_pinned_ones(db):
+    db.record_crawl("demo", "t0", ["p1", "p2"])
+    site = DemoSite(db_conn=db)
+    known = site._seen_posts(AccountTask("t0", site.get_crawl_states()["t0"]))
+    assert known == {"p1", "p2"}
+    assert not site._walk_over("p1", 0, known)
+    assert not site._walk_over("p2", 1, known)
+    assert not site._walk_over("p3", 2, known)
+    assert site._walk_over("p1", 2, known)
+    assert site._seen_posts(AccountTask("t1", None)) == set()
@@ -0,0 +1,72 @@
+import pytest
+
+
+def accounts(db, site: str = "instagram") -> list:
+    return list(db.iter_accounts(site))
+
+
+def test_import_adds_accounts(db):
+    result = db.import_accounts(
+        [("t0", "instagram", "travel"), ("f0", "instagram", "food")]
+    )
+    assert result == {"rows": 2, "added": 2, "updated": 0}
+    assert accounts(db) == [
+        ("t0", "instagram", "travel"),
+        ("f0", "instagram", "food"),
+    ]
+
+
+def test_duplicates_within_one_import(db):
+    result = db.import_accounts(
+        [
+            ("t0", "instagram", "travel"),
+            ("t0", "instagram", "travel"),
+            ("t1", "instagram", "travel"),
+            ("t1", "instagram", "food"),
+        ]
+    )
+    assert result == {"rows": 4, "added": 2, "updated": 0}
+    # The last category given wins
+    assert accounts(db) == [
+        ("t0", "instagram", "travel"),
+        ("t1", "instagram", "food"),
+    ]
+
+
+def test_reimporting_the_same_catalog(db):
+    catalog = [(f"t{i}", "instagram", "travel") for i in range(5)]
+    db.import_accounts(catalog)
+    assert db.import_accounts(catalog) == {"rows": 5, "added": 0, "updated": 0}
+    assert accounts(db) == catalog
+
+
+def test_reimport_moves_changed_categories(db):
+    db.import_accounts([("t0", "instagram", "travel"), ("t1", "instagram", "travel")])
+    result = db.import_accounts(
+        [("t1", "instagram", "food"), ("t2", "instagram", "travel")]
+    )
+    assert result == {"rows": 2, "added": 1, "updated": 1}
+    assert accounts(db) == [
+        ("t0", "instagram", "travel"),
+        ("t1", "instagram", "food"),
+        ("t2", "instagram", "travel"),
+    ]
+
+
+def test_invalid_category_rejects_the_whole_import(db):
+    db.import_accounts([("t0", "instagram", "travel")])
+    with pytest.raises(ValueError, match="cars"):
+        db.import_accounts([("t1", "instagram", "travel"), ("c0", "instagram", "cars")])
+    assert accounts(db) == [("t0", "instagram", "travel")]
+
+
+def test_same_name_on_another_site_is_another_account(db):
+    db.import_accounts([("t0", "instagram", "travel"), ("t0", "tiktok", "food")])
+    assert accounts(db, "tiktok") == [("t0", "tiktok", "food")]
+
+
+def test_account_names_come_in_import_order(db):
+    names = ["zeta", "alpha", "mid", "beta"]
+    db.import_accounts((name, "instagram", "travel") for name in names)
+    db.import_accounts([("alpha", "instagram", "food")])
+    assert list(db.iter_account_names("instagram")) == names
@@ -0,0 +1,25 @@
+import pytest
+
+from algohealer.intervals import parse_interval
+
+
+@pytest.mark.parametrize(
+    "value, seconds",
+    [
+        ("90", 90),
+        ("90s", 90),
+        ("30m", 1800),
+        (" 1.5h ", 5400),
+        ("1D", 86400),
+        ("@hourly", 3600),
+        ("@weekly", 604800),
+    ],
+)
+def test_parse_interval(value, seconds):
+    assert parse_interval(value) == seconds
+
+
+@pytest.mark.parametrize("value", ["", "soon", "5w", "-1h", "@monthly"])
+def test_parse_interval_rejects_garbage(value):
+    with pytest.raises(ValueError):
+        parse_interval(value)
@@ -0,0 +1,62 @@
+import sqlite3
+import time
+
+from algohealer.db.conn import SQLiteManager
+from algohealer.db.ledger import ActionLedger
+
+
+def count_actions(db) -> int:
+    return db.cursor.execute("SELECT COUNT(*) FROM actions").fetchone()[0]
+
+
+def test_ledger_writes_to_the_callers_database(db, tmp_path, monkeypatch):
+    monkeypatch.setenv("ALGOHEALER_DB_PATH", str(tmp_path / "elsewhere.db"))
+    with ActionLedger(db.db_path) as ledger:
+        ledger.record("instagram", "s1", "like_content", True, 12.0, "t0", "p1")
+    assert ledger.written == 1
+    assert count_actions(db) == 1
+    assert not (tmp_path / "elsewhere.db").exists()
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_a_full_buffer_is_written_without_waiting(db):
+    with ActionLedger(db.db_path, flush_interval=60, max_pending=3) as ledger:
+        for i in range(2):
+            ledger.record("instagram", "s1", "like_content", True, 1.0, "t0", f"p{i}")
+        time.sleep(0.05)
+        assert ledger.written == 0
+        ledger.record("instagram", "s1", "like_content", True, 1.0, "t0", "p2")
+        assert wait_for(lambda: ledger.written == 3)
+    assert count_actions(db) == 3
+
+
+def test_flush_writes_pending_records(db):
+    with ActionLedger(db.db_path, flush_interval=60) as ledger:
+        ledger.record("instagram", "s1", "next_content", False, 5.0)
+        ledger.flush()
+        assert wait_for(lambda: ledger.written == 1)
+        ledger.record("instagram", "s1", "next_content", True, 5.0)
+    # Closing writes what is left
+    assert ledger.written == 2
+    outcomes = db.cursor.execute("SELECT outcome FROM actions ORDER BY id").fetchall()
+    assert outcomes == [(0,), (1,)]
+
+
+class FailingManager(SQLiteManager):
+    def record_actions(self, rows):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_failed_batches_are_dropped(db):
+    with ActionLedger(db.db_path, connect=FailingManager) as ledger:
+        ledger.record("instagram", "s1", "like_content", True, 1.0)
+    assert (ledger.written, ledger.dropped) == (0, 1)
+    assert count_actions(db) == 0
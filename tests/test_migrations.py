@@ -0,0 +1,86 @@
+import sqlite3
+
+import pytest
+
+from algohealer.db.conn import MIGRATIONS, SQLiteManager
+
+
+def tables(db) -> set:
+    return {
+        row[0]
+        for row in db.cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+    }
+
+
+def test_new_database_is_at_the_latest_version(db):
+    assert db.schema_version() == len(MIGRATIONS)
+    expected = {"accounts", "settings", "crawl_state", "jobs", "feed_health", "actions"}
+    assert expected <= tables(db)
+
+
+def test_old_database_is_upgraded_in_place(tmp_path):
+    path = str(tmp_path / "old.db")
+    # The schema before migrations existed, with a duplicated import
+    legacy = sqlite3.connect(path)
+    legacy.execute(
+        """CREATE TABLE accounts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            site TEXT NOT NULL,
+            category TEXT NOT NULL
+        )"""
+    )
+    legacy.executemany(
+        "INSERT INTO accounts (name, site, category) VALUES (?, ?, ?)",
+        [
+            ("t0", "instagram", "travel"),
+            ("f0", "instagram", "food"),
+            ("t0", "instagram", "food"),
+        ],
+    )
+    legacy.commit()
+    legacy.close()
+
+    db = SQLiteManager(db_path=path)
+    try:
+        assert db.schema_version() == len(MIGRATIONS)
+        assert list(db.iter_accounts()) == [
+            ("t0", "instagram", "travel"),
+            ("f0", "instagram", "food"),
+        ]
+        with pytest.raises(sqlite3.IntegrityError):
+            db.cursor.execute(
+                "INSERT INTO accounts (name, site, category) VALUES ('t0', 'instagram', 'food')"
+            )
+    finally:
+        db.close()
+
+
+def test_reopening_does_not_migrate_again(db, monkeypatch):
+    db.import_accounts([("t0", "instagram", "travel")])
+    db.close()
+    monkeypatch.setattr(
+        "algohealer.db.conn.MIGRATIONS", MIGRATIONS + [["DELETE FROM accounts"]]
+    )
+    reopened = SQLiteManager(db_path=db.db_path)
+    assert reopened.schema_version() == len(MIGRATIONS) + 1
+    assert list(reopened.iter_accounts()) == []
+    reopened.close()
+    again = SQLiteManager(db_path=db.db_path)
+    again.import_accounts([("t1", "instagram", "travel")])
+    again.close()
+    again = SQLiteManager(db_path=db.db_path)
+    assert list(again.iter_accounts()) == [("t1", "instagram", "travel")]
+    again.close()
+
+
+def test_nested_transactions_roll_back_together(db):
+    with pytest.raises(ValueError):
+        with db.transaction():
+            db.add_account("t0", "instagram", "travel")
+            with db.transaction():
+                db.add_account("f0", "instagram", "food")
+            raise ValueError("abort")
+    assert list(db.iter_accounts()) == []
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from algohealer.navigators.base.pacing import PacingScheduler
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(
+        "algohealer.navigators.base.pacing.time.monotonic", lambda: now[0]
+    )
+    return now
+
+
+def test_slots_are_spaced_by_the_rate(clock):
+    pacing = PacingScheduler(actions_per_minute=60, jitter=0)
+    assert [pacing.reserve() for _ in range(3)] == [0.0, 1.0, 2.0]
+
+
+def test_time_spent_on_the_page_counts_towards_the_slot(clock):
+    pacing = PacingScheduler(actions_per_minute=60, jitter=0)
+    pacing.reserve()
+    clock[0] += 0.75
+    assert pacing.reserve() == pytest.approx(0.25)
+    clock[0] += 5
+    assert pacing.reserve() == 0.0
+
+
+def test_jitter_is_added_on_top(clock):
+    pacing = PacingScheduler(actions_per_minute=60, jitter=0.5)
+    pacing.reserve()
+    for _ in range(20):
+        clock[0] += 1
+        assert 0.0 <= pacing.reserve() <= 0.5
+
+
+def test_disabled_scheduler_never_waits(monkeypatch):
+    pacing = PacingScheduler(actions_per_minute=0, jitter=0)
+    assert not pacing.enabled
+    monkeypatch.setattr(
+        "algohealer.navigators.base.pacing.time.sleep",
+        lambda _: pytest.fail("slept"),
+    )
+    pacing.throttle()
+    asyncio.run(pacing.athrottle())
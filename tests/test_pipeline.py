@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from algohealer.navigators.base.pipeline import (
+    AccountDone,
+    CrawlSink,
+    Pipeline,
+    PostResult,
+)
+
+
+async def numbers(count: int, produced: list):
+    for i in range(count):
+        produced.append(i)
+        yield i
+
+
+async def double(item):
+    yield item * 2
+
+
+async def explode(item):
+    for i in range(item):
+        yield i
+
+
+def test_items_flow_through_every_stage():
+    async def main():
+        seen = []
+
+        async def sink(item):
+            seen.append(item)
+
+        await Pipeline(numbers(4, [])).pipe(explode).pipe(double).run(sink)
+        return seen
+
+    assert asyncio.run(main()) == [0, 0, 2, 0, 2, 4]
+
+
+def test_a_slow_sink_holds_back_the_source():
+    async def main():
+        produced = []
+        release = asyncio.Event()
+
+        async def sink(item):
+            await release.wait()
+
+        run = asyncio.ensure_future(
+            Pipeline(numbers(100, produced), maxsize=1).pipe(double).run(sink)
+        )
+        for _ in range(20):
+            await asyncio.sleep(0)
+        held = len(produced)
+        release.set()
+        await run
+        return held, len(produced)
+
+    held, total = asyncio.run(main())
+    # One item per queue plus one in each stage, source and sink
+    assert held <= 5
+    assert total == 100
+
+
+def test_workers_run_concurrently():
+    async def main():
+        running = []
+        peak = []
+
+        async def slow(item):
+            running.append(item)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(item)
+            yield item
+
+        async def sink(item):
+            pass
+
+        await Pipeline(numbers(6, []), maxsize=6).pipe(slow, workers=3).run(sink)
+        return max(peak)
+
+    assert asyncio.run(main()) == 3
+
+
+def test_cancelling_the_run_cancels_every_stage():
+    async def main():
+        cancelled = []
+        started = asyncio.Event()
+
+        async def stuck(item):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(item)
+                raise
+            yield item
+
+        async def sink(item):
+            pass
+
+        run = asyncio.ensure_future(Pipeline(numbers(10, [])).pipe(stuck).run(sink))
+        await started.wait()
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        return cancelled
+
+    assert asyncio.run(main()) == [0]
+
+
+def test_a_failing_stage_stops_the_pipeline():
+    async def main():
+        produced = []
+
+        async def fail(item):
+            if item == 2:
+                raise RuntimeError("boom")
+            yield item
+
+        async def sink(item):
+            pass
+
+        with pytest.raises(RuntimeError):
+            await Pipeline(numbers(1000, produced)).pipe(fail).run(sink)
+        return len(produced)
+
+    assert asyncio.run(main()) < 10
+
+
+def test_crawl_sink_records_finished_accounts():
+    recorded = []
+    sink = CrawlSink(lambda account, post_ids: recorded.append((account, post_ids)))
+    sink.add(PostResult("t0", "p1"))
+    sink.add(PostResult("t1", "q1"))
+    sink.add(PostResult("t0", "p2"))
+    sink.add(AccountDone("t0", 2, 0.0))
+    assert recorded == [("t0", ["p1", "p2"])]
+    assert (sink.posts, sink.accounts) == (3, 1)
+    sink.flush()
+    assert recorded[-1] == ("t1", ["q1"])
+    sink.flush()
+    assert len(recorded) == 2
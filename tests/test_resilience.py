@@ -0,0 +1,101 @@
+import pytest
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from algohealer.navigators.base.core import NavigatorCore
+from algohealer.navigators.base.resilience import (
+    SelectorBreaker,
+    backoff_delay,
+    is_page_gone,
+    is_transient,
+)
+from algohealer.navigators.spec import PlanStep
+
+KEY = ("like_content#0", "svg")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(
+        "algohealer.navigators.base.resilience.time.monotonic", lambda: now[0]
+    )
+    return now
+
+
+def test_breaker_opens_after_consecutive_misses(clock):
+    breaker = SelectorBreaker(threshold=3, cooldown=60)
+    for _ in range(2):
+        breaker.failure(KEY)
+    breaker.success(KEY)
+    for _ in range(2):
+        breaker.failure(KEY)
+    assert breaker.allow(KEY)
+    breaker.failure(KEY)
+    assert breaker.is_open(KEY)
+    assert not breaker.allow(KEY)
+    assert breaker.skipped == 1
+    assert breaker.open_keys() == [KEY]
+
+
+def test_breaker_half_opens_after_the_cooldown(clock):
+    breaker = SelectorBreaker(threshold=1, cooldown=60)
+    breaker.failure(KEY)
+    clock[0] = 59
+    assert not breaker.allow(KEY)
+    clock[0] = 60
+    # One trial, then closed again until it reports back
+    assert breaker.allow(KEY)
+    assert not breaker.allow(KEY)
+    breaker.failure(KEY)
+    clock[0] = 119
+    assert not breaker.allow(KEY)
+    clock[0] = 180
+    assert breaker.allow(KEY)
+    breaker.success(KEY)
+    assert breaker.allow(KEY)
+    assert breaker.open_keys() == []
+
+
+def test_breaker_can_be_turned_off(clock):
+    breaker = SelectorBreaker(threshold=0)
+    for _ in range(100):
+        breaker.failure(KEY)
+    assert breaker.allow(KEY)
+
+
+def test_error_classification():
+    assert is_transient(PlaywrightTimeoutError("Timeout 30000ms exceeded"))
+    assert is_transient(PlaywrightError("net::ERR_CONNECTION_RESET at https://x"))
+    assert not is_transient(PlaywrightError("net::ERR_BLOCKED_BY_CLIENT"))
+    assert not is_transient(PlaywrightError("net::ERR_ABORTED"))
+    assert is_page_gone(PlaywrightError("Page crashed"))
+    assert not is_page_gone(PlaywrightError("net::ERR_ABORTED"))
+
+
+def test_backoff_delay_is_capped():
+    assert all(0 <= backoff_delay(attempt) <= 8.0 for attempt in range(10))
+    assert all(backoff_delay(0) <= 0.5 for _ in range(50))
+
+
+def test_steps_skip_broken_selectors_and_look_at_visible_fallbacks(db):
+    nav = NavigatorCore(
+        "instagram", "https://www.instagram.com/", db, selector_miss_limit=1
+    )
+    primary = PlanStep("click", "svg", None, (), 1000, False, key="like#0")
+    step = primary._replace(
+        fallbacks=(primary._replace(selector="a"), primary._replace(selector="b"))
+    )
+    candidates = nav._allowed_candidates(step)
+    # The probe saw the second fallback: the ones ahead of it are misses and
+    # only the first one tried gets the full timeout
+    attempts = list(nav._step_attempts(step, candidates, [False, False, True]))
+    assert [(a.selector, a.timeout) for a in attempts] == [("b", 1000)]
+    assert [candidate.selector for candidate in nav._allowed_candidates(step)] == ["b"]
+    assert nav.broken_selectors() == ["like#0 svg", "like#0 a"]
+    attempts = list(nav._step_attempts(step, candidates, []))
+    assert [(a.selector, a.timeout) for a in attempts] == [
+        ("svg", 1000),
+        ("a", 250),
+        ("b", 250),
+    ]
@@ -0,0 +1,157 @@
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from algohealer.navigators.base.core import NavigatorCore
+from algohealer.sampler import AccountCandidate, WeightedSampler, parse_weights
+
+NOW = 1_000_000.0
+DAY = 24 * 3600
+
+
+def candidates(category: str, count: int, **fields) -> list:
+    return [
+        AccountCandidate(f"{category}{i}", category, fields.get("last_visited_at"))
+        for i in range(count)
+    ]
+
+
+def navigator(db, **kwargs) -> NavigatorCore:
+    return NavigatorCore(
+        nav_name="instagram",
+        url_base="https://www.instagram.com/",
+        db_conn=db,
+        interests=["travel", "food"],
+        **kwargs,
+    )
+
+
+def test_parse_weights():
+    assert parse_weights("travel=2, Food=0.5,") == {"travel": 2.0, "food": 0.5}
+    with pytest.raises(ValueError):
+        parse_weights("cars=1")
+    with pytest.raises(ValueError):
+        parse_weights("travel=lots")
+    with pytest.raises(ValueError):
+        parse_weights("travel=-1")
+
+
+def test_weight_splits_category_over_its_accounts():
+    sampler = WeightedSampler({"travel": 4.0, "food": 1.0}, {"travel": 4, "food": 1})
+    travel, food = candidates("travel", 1)[0], candidates("food", 1)[0]
+    assert sampler.weight(travel, NOW) == pytest.approx(1.0)
+    assert sampler.weight(food, NOW) == pytest.approx(1.0)
+    assert sampler.weight(candidates("health", 1)[0], NOW) == 0.0
+
+
+def test_weight_staleness_and_yield():
+    sampler = WeightedSampler({"travel": 1.0})
+    never = AccountCandidate("a", "travel", None)
+    just_now = AccountCandidate("b", "travel", NOW)
+    a_day_ago = AccountCandidate("c", "travel", NOW - DAY)
+    assert sampler.weight(never, NOW) == pytest.approx(1.0)
+    assert sampler.weight(just_now, NOW) == pytest.approx(0.05)
+    assert sampler.weight(a_day_ago, NOW) == pytest.approx(1 - math.exp(-1))
+    productive = AccountCandidate("d", "travel", None, visits=1, posts=20)
+    barren = AccountCandidate("e", "travel", None, visits=20, posts=0)
+    assert sampler.weight(productive, NOW) == pytest.approx(4.0)
+    assert sampler.weight(barren, NOW) == pytest.approx(0.25)
+
+
+def test_sample_is_deterministic_with_a_seed():
+    pool = candidates("travel", 50) + candidates("food", 50)
+    weights = {"travel": 3.0, "food": 1.0}
+    first = WeightedSampler(weights, rng=random.Random(7)).sample(pool, k=10, now=NOW)
+    second = WeightedSampler(weights, rng=random.Random(7)).sample(pool, k=10, now=NOW)
+    assert first == second
+    assert len(first) == len(set(first)) == 10
+
+
+def test_sample_follows_the_weights():
+    pool = candidates("travel", 100) + candidates("food", 100)
+    sampler = WeightedSampler({"travel": 3.0, "food": 1.0}, rng=random.Random(1))
+    drawn = Counter()
+    for _ in range(300):
+        drawn.update(candidate.category for candidate in sampler.sample(pool, k=10))
+    assert drawn["travel"] / drawn["food"] == pytest.approx(3.0, rel=0.15)
+
+
+def test_sample_without_k_ranks_every_weighted_candidate():
+    pool = candidates("travel", 5) + candidates("food", 5) + candidates("health", 5)
+    ranked = WeightedSampler({"travel": 1.0, "food": 1.0}, rng=random.Random(3)).sample(
+        pool, now=NOW
+    )
+    assert sorted(ranked) == sorted(pool[:10])
+
+
+def test_candidates_are_accounts_of_interest(db):
+    db.import_accounts(
+        [("t0", "instagram", "travel"), ("h0", "instagram", "health")]
+        + [("t0", "tiktok", "travel")]
+    )
+    db.record_crawl("instagram", "t0", ["p1"], visited_at=NOW)
+    assert list(db.iter_account_candidates("instagram")) == [
+        AccountCandidate("t0", "travel", NOW)
+    ]
+
+
+def test_candidate_yield_counts_engagement_only(db):
+    db.import_accounts([("t0", "instagram", "travel"), ("t1", "instagram", "travel")])
+    db.record_actions(
+        [
+            ("instagram", "s1", "t0", f"p{i}", "next_content", 1, 10.0, NOW)
+            for i in range(5)
+        ]
+        + [("instagram", "s1", "t1", "p1", "like_content", 1, 10.0, NOW)]
+        + [("instagram", "s2", "t1", "p2", "like_content", 1, 10.0, NOW)]
+        + [("instagram", "s2", "t1", "p3", "like_content", 0, 10.0, NOW)]
+    )
+    candidates = {
+        candidate.name: candidate
+        for candidate in db.iter_account_candidates("instagram", ["like_content"])
+    }
+    assert (candidates["t0"].visits, candidates["t0"].posts) == (0, 0)
+    assert (candidates["t1"].visits, candidates["t1"].posts) == (2, 2)
+
+
+def test_accounts_budget_caps_the_sample(db):
+    db.import_accounts((f"t{i}", "instagram", "travel") for i in range(30))
+    nav = navigator(db, session_accounts=5)
+    assert nav.planned_accounts() == 5
+    assert len(list(nav.budgeted_accounts())) == 5
+
+
+def test_actions_budget_stops_the_session(db):
+    db.import_accounts((f"t{i}", "instagram", "travel") for i in range(30))
+    nav = navigator(db, session_actions=3)
+    taken = []
+    for task in nav.budgeted_accounts():
+        taken.append(task.account)
+        nav.log_action("like_content", True, 0.1, "post")
+    assert len(taken) == 3
+
+
+def test_minutes_budget_stops_the_session(db, monkeypatch):
+    db.import_accounts((f"t{i}", "instagram", "travel") for i in range(30))
+    clock = [0.0]
+    monkeypatch.setattr(
+        "algohealer.navigators.base.core.time.monotonic", lambda: clock[0]
+    )
+    nav = navigator(db, session_minutes=1)
+    taken = []
+    for task in nav.budgeted_accounts():
+        taken.append(task.account)
+        clock[0] += 25
+    assert len(taken) == 3
+
+
+def test_no_budget_walks_every_account_in_catalog_order(db):
+    db.import_accounts((f"t{i}", "instagram", "travel") for i in range(5))
+    db.import_accounts([("h0", "instagram", "health")])
+    nav = navigator(db)
+    assert not nav.sampling
+    assert [task.account for task in nav.budgeted_accounts()] == [
+        f"t{i}" for i in range(5)
+    ]
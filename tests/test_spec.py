@@ -0,0 +1,101 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from algohealer.navigators.instagram.selectors import SPEC_PATH
+from algohealer.navigators.registry import NavigatorRegistry
+from algohealer.navigators.spec import (
+    DEFAULT_TIMEOUTS,
+    SiteSpec,
+    compile_spec,
+    load_spec,
+)
+
+SPEC = {
+    "name": "demo",
+    "url_base": "https://demo.test",
+    "selectors": {
+        "comment_box": "textarea",
+        "result": 'span:has-text("{}")',
+        "submit": "button[type=submit]",
+    },
+    "fallbacks": {"submit": ["form button", "input[type=submit]"]},
+    "flows": {
+        "comment": [
+            {"action": "fill", "selector": "comment_box", "text": "{text}"},
+            {"action": "click", "selector": "submit", "optional": True},
+        ],
+        "open": [
+            {
+                "action": "click",
+                "selector": "result",
+                "args": ["{query}"],
+                "timeout": 50,
+            }
+        ],
+    },
+    "post_actions": ["comment"],
+}
+
+
+def test_flows_compile_to_plans():
+    plans = compile_spec(SiteSpec.model_validate(SPEC))
+    fill, click = plans["comment"].steps
+    assert (fill.action, fill.selector, fill.timeout) == (
+        "fill",
+        "textarea",
+        DEFAULT_TIMEOUTS["fill"],
+    )
+    assert fill.resolve({"text": "nice"}) == ("textarea", "nice")
+    assert (click.key, click.optional, click.timeout) == ("comment#1", True, 1000)
+    assert [step.selector for step in click.candidates] == [
+        "button[type=submit]",
+        "form button",
+        "input[type=submit]",
+    ]
+    # Fallbacks share the step's key, so the breaker counts them per step
+    assert {step.key for step in click.fallbacks} == {"comment#1"}
+    (open_step,) = plans["open"].steps
+    assert open_step.timeout == 50
+    assert open_step.resolve({"query": "tea"}) == ('span:has-text("tea")', None)
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"post_actions": ["like"]},
+        {"fallbacks": {"missing": ["a"]}},
+        {"flows": {"like": [{"action": "click", "selector": "missing"}]}},
+        {"flows": {"like": [{"action": "hover", "selector": "submit"}]}},
+    ],
+)
+def test_invalid_specs_are_rejected(change):
+    with pytest.raises(ValidationError):
+        SiteSpec.model_validate({**SPEC, **change})
+
+
+def test_instagram_spec_loads():
+    spec = load_spec(SPEC_PATH)
+    plans = compile_spec(spec)
+    assert set(spec.post_actions) <= set(plans)
+    assert plans["like_content"].steps[0].fallbacks
+
+
+def test_registry_builds_navigators_from_spec_files(tmp_path, monkeypatch):
+    path = tmp_path / "demo.json"
+    path.write_text(json.dumps(SPEC))
+    monkeypatch.setenv("ALGOHEALER_SITE_SPECS", str(path))
+    registry = NavigatorRegistry(
+        {},
+        entry_point_group="algohealer.tests",
+        spec_factory="algohealer.navigators.base.spec_navigator:navigator_for_spec",
+    )
+    assert "demo" in registry
+    navigator = registry["demo"]
+    assert navigator.__name__ == "DemoNavigator"
+    assert navigator.url_base == "https://demo.test"
+    assert navigator.post_actions == ("comment",)
+    assert registry["demo"] is navigator
+    with pytest.raises(KeyError):
+        registry["unknown"]